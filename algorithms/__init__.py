@@ -1,38 +1,66 @@
 # Paquete de algoritmos anytime y meta-razonamiento para CARINA
+#
+# Los submódulos se importan recién al usar uno de sus nombres (PEP 562):
+# importar el paquete no carga NumPy, asyncio, multiprocessing ni sockets
+# hasta que hagan falta.
 
-from .anytime_algorithm import AnytimeAlgorithm, Solution
-from .performance_predictor import (
-    PerformancePredictor,
-    LinearRegressionPredictor,
-    DiminishingReturnsPredictor,
-    MovingAveragePredictor
-)
-from .stopping_condition import (
-    StoppingCondition,
-    UtilityBasedStoppingCondition,
-    DiminishingReturnsStoppingCondition,
-    TimeoutStoppingCondition,
-    QualityThresholdStoppingCondition,
-    CompositeStoppingCondition
-)
-from .matrix_optimization import (
-    MatrixOptimizationAnytime,
-    IterativeRefinementAnytime
-)
+import importlib
 
-__all__ = [
-    'AnytimeAlgorithm',
-    'Solution',
-    'PerformancePredictor',
-    'LinearRegressionPredictor',
-    'DiminishingReturnsPredictor',
-    'MovingAveragePredictor',
-    'StoppingCondition',
-    'UtilityBasedStoppingCondition',
-    'DiminishingReturnsStoppingCondition',
-    'TimeoutStoppingCondition',
-    'QualityThresholdStoppingCondition',
-    'CompositeStoppingCondition',
-    'MatrixOptimizationAnytime',
-    'IterativeRefinementAnytime'
-]
\ No newline at end of file
+# Nombre exportado -> submódulo que lo define
+_EXPORTS = {
+    'AnytimeAlgorithm': '.anytime_algorithm',
+    'Solution': '.anytime_algorithm',
+    'Clock': '.clock',
+    'RealClock': '.clock',
+    'VirtualClock': '.clock',
+    'real_clock': '.clock',
+    'ProcessAnytimeAlgorithm': '.process_anytime',
+    'AsyncAnytimeAlgorithm': '.async_anytime',
+    'ExecutorAnytimeAlgorithm': '.async_anytime',
+    'RemoteAnytimeAlgorithm': '.remote',
+    'RemoteNode': '.remote',
+    'WorkerNode': '.remote',
+    'Transport': '.remote',
+    'SocketTransport': '.remote',
+    'LoopbackTransport': '.remote',
+    'PerformancePredictor': '.performance_predictor',
+    'StreamingPerformancePredictor': '.performance_predictor',
+    'LinearRegressionPredictor': '.performance_predictor',
+    'DiminishingReturnsPredictor': '.performance_predictor',
+    'MovingAveragePredictor': '.performance_predictor',
+    'ProfilePredictor': '.performance_predictor',
+    'CurveFitPredictor': '.performance_predictor',
+    'pad_histories': '.performance_predictor',
+    'PerformanceProfile': '.performance_profile',
+    'record_runs': '.performance_profile',
+    'StoppingPolicy': '.stopping_policy',
+    'QualityHistory': '.quality_history',
+    'StoppingCondition': '.stopping_condition',
+    'UtilityBasedStoppingCondition': '.stopping_condition',
+    'DiminishingReturnsStoppingCondition': '.stopping_condition',
+    'TimeoutStoppingCondition': '.stopping_condition',
+    'QualityThresholdStoppingCondition': '.stopping_condition',
+    'CompositeStoppingCondition': '.stopping_condition',
+    'PolicyTableStoppingCondition': '.stopping_condition',
+    'MatrixOptimizationAnytime': '.matrix_optimization',
+    'IterativeRefinementAnytime': '.matrix_optimization',
+    'ParallelMatrixOptimizationAnytime': '.parallel_matrix_optimization',
+    'SeriesEstimatorAnytime': '.series_estimation',
+    'TraceReplayAnytime': '.trace_replay'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # Las próximas búsquedas no pasan por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,20 +1,60 @@
 import time
+import zlib
+import pickle
+import struct
 import threading
 from abc import ABC, abstractmethod
+from algorithms.tracing import tracer
+from algorithms.clock import real_clock
+
+# Checkpoints: encabezado fijo (marca, formato, versión y calidad de la
+# solución, largo del cuerpo) seguido del estado serializado y comprimido
+_CHECKPOINT_MAGIC = b'CKPT'
+_CHECKPOINT_FORMAT = 1
+_CHECKPOINT_HEADER = struct.Struct('<4sHQdI')
+
+# Atributos de ejecución que no forman parte del estado de búsqueda
+_RUNTIME_ATTRIBUTES = ('_lock', '_updated', '_thread', '_resume_event', '_step_lock',
+                       '_running', '_current_solution', '_resume_from', 'clock',
+                       '_step_scheduled')
 
 class AnytimeAlgorithm(ABC):
     """
     Clase base abstracta para algoritmos anytime.
     Un algoritmo anytime puede ser interrumpido en cualquier momento
     y devolver una solución con calidad que mejora con el tiempo.
+    
+    El tiempo (estampas de publicación, pausas entre pasos) sale de
+    self.clock. Con el reloj real los pasos corren en un thread; con un
+    VirtualClock no hay thread: cada paso es un evento del reloj y una
+    ejecución completa avanza al ritmo en que el meta-nivel duerme.
     """
     
+    # False en los algoritmos que corren fuera de este proceso (o usan
+    # procesos de trabajo) y por lo tanto solo pueden ir en tiempo real
+    supports_virtual_clock = True
+    
     def __init__(self):
         self._running = False
         self._current_solution = None
         self._thread = None
         self._lock = threading.Lock()
-        
+        # Condición asociada al lock: se notifica en cada publicación de
+        # solución para que el meta-nivel despierte sin esperar Δt
+        self._updated = threading.Condition(self._lock)
+        self._version = 0
+        # Puerta de pausa: el loop de pasos solo avanza mientras esté abierta
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        # Tomado durante cada compute_step(): snapshot() lo usa para leer el
+        # estado entre pasos
+        self._step_lock = threading.RLock()
+        # Solución de un checkpoint restaurado, con la que reanuda start()
+        self._resume_from = None
+        self.clock = real_clock
+        # Con un reloj virtual: hay un paso agendado en el reloj
+        self._step_scheduled = False
+    
     @abstractmethod
     def compute_step(self):
         """
@@ -31,57 +71,336 @@ class AnytimeAlgorithm(ABC):
         """
         pass
     
+    def set_clock(self, clock):
+        """
+        Cambia el reloj del algoritmo (no durante una ejecución).
+        
+        Returns:
+            AnytimeAlgorithm: self
+        """
+        if self._running:
+            raise RuntimeError("No se puede cambiar el reloj de un algoritmo en ejecución")
+        if clock.virtual and not self.supports_virtual_clock:
+            raise ValueError(f"{type(self).__name__} solo puede ejecutarse en tiempo real")
+        if clock is not self.clock:
+            # Un paso agendado en el reloj anterior no continúa en este
+            self._step_scheduled = False
+        self.clock = clock
+        return self
+    
     def start(self):
-        """Inicia la ejecución del algoritmo anytime en un thread separado."""
+        """
+        Inicia la ejecución del algoritmo anytime en un thread separado
+        (con un reloj virtual, agenda su primer paso en el reloj).
+        """
         if self._running:
             return
+        if self._thread is not None and self._thread.is_alive():
+            # El thread de una ejecución detenida aún termina su último paso
+            self._thread.join()
         
         self._running = True
-        self._current_solution = self.initial_solution()
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._publish_first_solution()
+        if self.clock.virtual:
+            # Un paso de una ejecución detenida que sigue agendado la continúa
+            if not self._step_scheduled:
+                self._schedule_step(0.0)
+        else:
+            self._thread = threading.Thread(target=self._run_loop, daemon=True)
+            self._thread.start()
         print(f"[Anytime] Algorithm started")
     
+    def _publish_first_solution(self):
+        """
+        Publica la solución inicial o, si se restauró un checkpoint, vuelve
+        a exponer la solución guardada sin contarla como publicación nueva.
+        """
+        solution, self._resume_from = self._resume_from, None
+        if solution is None:
+            self.update_solution(self.initial_solution())
+            return
+        with self._updated:
+            self._current_solution = solution
+            self._updated.notify_all()
+    
     def _run_loop(self):
         """Loop interno que ejecuta pasos del algoritmo."""
         while self._running:
-            can_continue = self.compute_step()
-            if not can_continue:
-                self._running = False
-                print(f"[Anytime] Algorithm completed naturally")
+            if not self._resume_event.is_set():
+                self._resume_event.wait()
+                continue
+            if not self._step():
                 break
     
+    def _step(self):
+        """Ejecuta un paso; retorna False si el algoritmo terminó."""
+        start = tracer.now() if tracer.enabled else 0
+        with self._step_lock:
+            can_continue = self.compute_step()
+        if start:
+            tracer.complete('step', 'object', start)
+        if not can_continue:
+            self._running = False
+            self._notify_waiters()
+            print(f"[Anytime] Algorithm completed naturally")
+        return can_continue
+    
+    def _schedule_step(self, delay):
+        self._step_scheduled = True
+        self.clock.call_later(delay, self._virtual_step)
+    
+    def _virtual_step(self):
+        """Un paso como evento del reloj virtual; agenda el siguiente al terminar."""
+        self._step_scheduled = False
+        if self._running and not self.paused() and self._step():
+            self._schedule_step(self.clock.busy_time())
+    
     def stop(self):
         """Detiene la ejecución del algoritmo."""
         if self._running:
             self._running = False
+            self._resume_event.set()
+            self._notify_waiters()
             if self._thread:
                 self._thread.join(timeout=1.0)
             print(f"[Anytime] Algorithm stopped by meta-level")
     
+    def pause(self):
+        """
+        Suspende el algoritmo al terminar el paso en curso, conservando su
+        estado. Puede llamarse antes de start() para iniciarlo en pausa.
+        """
+        self._resume_event.clear()
+    
+    def resume(self):
+        """Reanuda un algoritmo pausado."""
+        self._resume_event.set()
+        if self.clock.virtual and self._running and not self._step_scheduled:
+            self._schedule_step(0.0)
+    
+    def paused(self):
+        """Retorna True si el algoritmo está pausado."""
+        return not self._resume_event.is_set()
+    
+    def snapshot(self):
+        """
+        Checkpoint del estado de búsqueda y de la solución actual, en un
+        formato binario compacto (pickle comprimido con zlib detrás de un
+        encabezado fijo). Si el algoritmo está ejecutándose, el estado se
+        lee entre dos pasos.
+        
+        Returns:
+            bytes: El checkpoint, para restore() o from_snapshot()
+        """
+        with self._step_lock:
+            solution = self.current_solution()
+            body = zlib.compress(pickle.dumps((type(self), self._checkpoint_state(), solution),
+                                              protocol=pickle.HIGHEST_PROTOCOL))
+        quality = solution.quality() if solution is not None else float('nan')
+        return _CHECKPOINT_HEADER.pack(_CHECKPOINT_MAGIC, _CHECKPOINT_FORMAT, self._version,
+                                       quality, len(body)) + body
+    
+    def restore(self, checkpoint):
+        """
+        Carga un checkpoint de snapshot(). El algoritmo no debe estar
+        ejecutándose; el siguiente start() continúa desde el estado guardado
+        en lugar de llamar a initial_solution().
+        
+        Returns:
+            AnytimeAlgorithm: self
+        """
+        if self._running:
+            raise RuntimeError("No se puede restaurar un algoritmo en ejecución")
+        cls, state, solution = _decode_checkpoint(checkpoint)
+        if cls is not type(self):
+            raise ValueError(f"El checkpoint es de {cls.__name__}, no de {type(self).__name__}")
+        self._restore_state(state)
+        self._current_solution = solution
+        self._resume_from = solution
+        return self
+    
+    @staticmethod
+    def from_snapshot(checkpoint):
+        """
+        Crea el algoritmo guardado en un checkpoint, listo para reanudar
+        con start(), sin conocer los argumentos de su constructor.
+        """
+        cls, _, _ = _decode_checkpoint(checkpoint)
+        algorithm = cls.__new__(cls)
+        AnytimeAlgorithm.__init__(algorithm)
+        return algorithm.restore(checkpoint)
+    
+    @staticmethod
+    def checkpoint_info(checkpoint):
+        """
+        Lee solo el encabezado de un checkpoint, sin deserializar el estado.
+        
+        Returns:
+            tuple: (versión, calidad) de la solución guardada
+        """
+        _, version, quality, _ = _checkpoint_header(checkpoint)
+        return version, quality
+    
+    def suspend(self):
+        """
+        Detiene el algoritmo liberando su thread, pero conservando el
+        estado: el siguiente start() reanuda desde donde quedó.
+        
+        Returns:
+            bytes: El checkpoint tomado al detenerse
+        """
+        self.stop()
+        checkpoint = self.snapshot()
+        self.restore(checkpoint)
+        print(f"[Anytime] Algorithm suspended ({len(checkpoint)} bytes checkpoint)")
+        return checkpoint
+    
+    def _checkpoint_state(self):
+        """
+        Estado de búsqueda a guardar: por defecto todos los atributos salvo
+        los de ejecución. Las subclases pueden omitir lo que se reconstruye
+        barato y hacerlo en _restore_state().
+        """
+        return {key: value for key, value in self.__dict__.items()
+                if key not in _RUNTIME_ATTRIBUTES}
+    
+    def _restore_state(self, state):
+        self.__dict__.update(state)
+    
     def running(self):
         """Retorna True si el algoritmo está ejecutándose."""
         return self._running
     
     def current_solution(self):
-        """Retorna la solución actual."""
-        with self._lock:
-            return self._current_solution
+        """
+        Retorna la solución actual, sin tomar locks: cada publicación
+        reemplaza la referencia por una Solution completa (ya estampada con
+        su versión), y leer una referencia es atómico, así que el lector
+        nunca bloquea al algoritmo ni ve una solución a medio publicar.
+        """
+        return self._current_solution
     
     def update_solution(self, new_solution):
-        """Actualiza la solución actual de forma thread-safe."""
-        with self._lock:
+        """
+        Publica una solución nueva con un intercambio atómico de referencia.
+        La solución no debe modificarse después de publicada; los
+        algoritmos solo publican cuando hay una mejora.
+        """
+        with self._updated:
+            self._version += 1
+            _stamp(new_solution, self._version, self.clock.now())
             self._current_solution = new_solution
+            self._updated.notify_all()
+        if tracer.enabled:
+            tracer.instant('publish', 'object', _publish_args(self._version, new_solution))
+    
+    def solution_version(self):
+        """Retorna el número de publicaciones de solución realizadas."""
+        return self._version
+    
+    def wait_for_update(self, last_version, timeout=None):
+        """
+        Bloquea hasta que se publique una solución más nueva que last_version,
+        el algoritmo deje de ejecutarse o venza el timeout.
+        
+        Args:
+            last_version: Última versión observada por quien espera
+            timeout: Espera máxima en segundos (None = sin límite)
+            
+        Returns:
+            int: La versión actual de la solución
+        """
+        if self.clock.virtual:
+            # Sin threads: ejecutar los pasos agendados hasta que se cumpla
+            if self._version == last_version and self._running:
+                deadline = None if timeout is None else self.clock.now() + timeout
+                self.clock.run_until(
+                    deadline, lambda: self._version != last_version or not self._running)
+            return self._version
+        with self._updated:
+            self._updated.wait_for(
+                lambda: self._version != last_version or not self._running,
+                timeout
+            )
+            return self._version
+    
+    def __getstate__(self):
+        # Los primitivos de sincronización y el thread no se serializan
+        # (necesario para enviar el algoritmo a un proceso de trabajo)
+        state = self.__dict__.copy()
+        for key in ('_lock', '_updated', '_thread', '_resume_event', '_step_lock'):
+            state.pop(key, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._thread = None
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._step_lock = threading.RLock()
+    
+    def _notify_waiters(self):
+        """Despierta a quienes esperan en wait_for_update()."""
+        with self._updated:
+            self._updated.notify_all()
+
+
+def _checkpoint_header(checkpoint):
+    if len(checkpoint) < _CHECKPOINT_HEADER.size:
+        raise ValueError("Checkpoint truncado")
+    magic, fmt, version, quality, length = _CHECKPOINT_HEADER.unpack_from(checkpoint)
+    if magic != _CHECKPOINT_MAGIC:
+        raise ValueError("Los datos no son un checkpoint de un algoritmo anytime")
+    if fmt != _CHECKPOINT_FORMAT:
+        raise ValueError(f"Formato de checkpoint no soportado: {fmt}")
+    if len(checkpoint) != _CHECKPOINT_HEADER.size + length:
+        raise ValueError("Checkpoint truncado")
+    return fmt, version, quality, length
+
+
+def _decode_checkpoint(checkpoint):
+    # (clase, estado, solución) de un checkpoint de snapshot()
+    _checkpoint_header(checkpoint)
+    return pickle.loads(zlib.decompress(memoryview(checkpoint)[_CHECKPOINT_HEADER.size:]))
+
+
+def _stamp(solution, version, now=None):
+    # Versión y timestamp monotónico (del reloj del algoritmo) de cada publicación
+    if solution is not None:
+        solution.version = version
+        solution.timestamp = time.monotonic() if now is None else now
+
+
+def _publish_args(version, solution):
+    # Argumentos del evento 'publish' del tracer
+    return {'version': version, 'quality': solution.quality() if solution is not None else None}
 
 
 class Solution:
     """
     Representa una solución con su calidad asociada.
+    
+    Al publicarse con update_solution() recibe una versión creciente y el
+    instante de publicación (según el reloj del algoritmo); el meta-nivel los usa para
+    distinguir soluciones nuevas de relecturas de la misma.
+    
+    Usa __slots__ (sin __dict__ por instancia). payload es un array
+    opcional para resultados numéricos grandes; como la solución no cambia
+    después de publicarse, para no asignar memoria en cada publicación el
+    algoritmo puede alternar entre dos arrays preasignados y escribir
+    siempre en el que no está publicado.
     """
     
-    def __init__(self, data, quality_value):
+    __slots__ = ('data', '_quality', 'version', 'timestamp', 'payload')
+    
+    def __init__(self, data, quality_value, payload=None):
         self.data = data
         self._quality = quality_value
+        self.version = None
+        self.timestamp = None
+        self.payload = payload
     
     def quality(self):
         """Retorna la calidad de la solución."""
@@ -0,0 +1,192 @@
+import asyncio
+from abc import ABC, abstractmethod
+from algorithms.tracing import tracer
+from algorithms.anytime_algorithm import _publish_args, _stamp
+
+class AsyncAnytimeAlgorithm(ABC):
+    """
+    Clase base para algoritmos anytime sobre asyncio.
+    
+    Equivalente a AnytimeAlgorithm, pero cada paso es una corrutina y el
+    loop de pasos es una tarea del event loop en lugar de un thread propio.
+    start() debe llamarse desde una corrutina (con un event loop activo).
+    """
+    
+    def __init__(self):
+        self._running = False
+        self._current_solution = None
+        self._task = None
+        self._version = 0
+        self._updated = None
+        self._resume_event = None
+    
+    @abstractmethod
+    async def compute_step(self):
+        """
+        Ejecuta un paso de computación del algoritmo (corrutina).
+        Debe actualizar la solución con update_solution().
+        Retorna True si puede continuar, False si terminó.
+        """
+        pass
+    
+    @abstractmethod
+    def initial_solution(self):
+        """
+        Genera una solución inicial (puede ser de baja calidad).
+        """
+        pass
+    
+    def start(self):
+        """Inicia el loop de pasos como una tarea del event loop actual."""
+        if self._running:
+            return
+        
+        self._updated = asyncio.Event()
+        if self._resume_event is None:
+            self._resume_event = asyncio.Event()
+            self._resume_event.set()
+        self._running = True
+        self.update_solution(self.initial_solution())
+        self._task = asyncio.get_running_loop().create_task(self._run_loop())
+        print(f"[Anytime] Algorithm started")
+    
+    async def _run_loop(self):
+        """Loop interno que ejecuta pasos del algoritmo."""
+        try:
+            while self._running:
+                if not self._resume_event.is_set():
+                    await self._resume_event.wait()
+                    continue
+                start = tracer.now() if tracer.enabled else 0
+                can_continue = await self.compute_step()
+                if start:
+                    tracer.complete('step', 'object', start)
+                if not can_continue:
+                    self._running = False
+                    print(f"[Anytime] Algorithm completed naturally")
+                    break
+        finally:
+            # También al cancelar la tarea: nadie debe quedar esperando
+            self._running = False
+            self._notify_waiters()
+    
+    async def stop(self):
+        """
+        Detiene la ejecución del algoritmo. Como AnytimeAlgorithm.stop(),
+        espera hasta 1s a que termine el paso en curso; si no termina, la
+        tarea se cancela.
+        """
+        if self._running:
+            self._running = False
+            self._resume_event.set()
+            self._notify_waiters()
+            if self._task:
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._task), timeout=1.0)
+                except asyncio.TimeoutError:
+                    self._task.cancel()
+                    try:
+                        await self._task
+                    except asyncio.CancelledError:
+                        pass
+            print(f"[Anytime] Algorithm stopped by meta-level")
+    
+    def pause(self):
+        """Suspende el algoritmo al terminar el paso en curso."""
+        if self._resume_event is None:
+            self._resume_event = asyncio.Event()
+        self._resume_event.clear()
+    
+    def resume(self):
+        """Reanuda un algoritmo pausado."""
+        if self._resume_event is not None:
+            self._resume_event.set()
+    
+    def paused(self):
+        """Retorna True si el algoritmo está pausado."""
+        return self._resume_event is not None and not self._resume_event.is_set()
+    
+    def running(self):
+        """Retorna True si el algoritmo está ejecutándose."""
+        return self._running
+    
+    def current_solution(self):
+        """Retorna la solución actual."""
+        return self._current_solution
+    
+    def update_solution(self, new_solution):
+        """Publica una nueva solución y despierta a quienes esperan."""
+        self._version += 1
+        _stamp(new_solution, self._version)
+        self._current_solution = new_solution
+        self._notify_waiters()
+        if tracer.enabled:
+            tracer.instant('publish', 'object', _publish_args(self._version, new_solution))
+    
+    def solution_version(self):
+        """Retorna el número de publicaciones de solución realizadas."""
+        return self._version
+    
+    async def wait_for_update(self, last_version, timeout=None):
+        """
+        Espera hasta que se publique una solución más nueva que last_version,
+        el algoritmo deje de ejecutarse o venza el timeout.
+        
+        Returns:
+            int: La versión actual de la solución
+        """
+        if self._version == last_version and self._running:
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._version
+    
+    def _notify_waiters(self):
+        # Cada publicación libera a los que esperan y arma un evento nuevo
+        if self._updated is not None:
+            self._updated.set()
+            self._updated = asyncio.Event()
+
+
+class ExecutorAnytimeAlgorithm(AsyncAnytimeAlgorithm):
+    """
+    Adapta un AnytimeAlgorithm síncrono al event loop: sus pasos se ejecutan
+    en un executor, en bloques de steps_per_chunk pasos, sin bloquear el loop.
+    """
+    
+    def __init__(self, algorithm, executor=None, steps_per_chunk=1):
+        """
+        Args:
+            algorithm: Instancia de AnytimeAlgorithm (síncrona)
+            executor: concurrent.futures.Executor (None = el del event loop)
+            steps_per_chunk: Pasos ejecutados por cada envío al executor
+        """
+        super().__init__()
+        self.algorithm = algorithm
+        self.executor = executor
+        self.steps_per_chunk = steps_per_chunk
+        self._mirrored_version = None
+    
+    def initial_solution(self):
+        solution = self.algorithm.initial_solution()
+        self.algorithm.update_solution(solution)
+        self._mirrored_version = self.algorithm.solution_version()
+        return solution
+    
+    def _run_chunk(self):
+        for _ in range(self.steps_per_chunk):
+            if not self._running:
+                return True
+            if not self.algorithm.compute_step():
+                return False
+        return True
+    
+    async def compute_step(self):
+        loop = asyncio.get_running_loop()
+        can_continue = await loop.run_in_executor(self.executor, self._run_chunk)
+        version = self.algorithm.solution_version()
+        if version != self._mirrored_version:
+            self._mirrored_version = version
+            self.update_solution(self.algorithm.current_solution())
+        return can_continue
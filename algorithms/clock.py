@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+
+class Clock(ABC):
+    """
+    Fuente de tiempo del meta-nivel y de los algoritmos anytime.
+
+    now() es un instante monotónico en segundos y sleep() espera. El
+    meta-nivel (svegliato_algorithm) y AnytimeAlgorithm solo miden y
+    esperan a través de su reloj, así que reemplazarlo no cambia ninguna
+    decisión: cambia de dónde sale el tiempo.
+    """
+
+    # True si el reloj no avanza solo: los algoritmos no usan threads y
+    # sus pasos se ejecutan como eventos del reloj
+    virtual = False
+
+    @abstractmethod
+    def now(self):
+        """Instante actual en segundos."""
+        pass
+
+    @abstractmethod
+    def sleep(self, seconds):
+        """Espera `seconds` segundos del reloj."""
+        pass
+
+
+class RealClock(Clock):
+    """Tiempo real: time.monotonic() y time.sleep()."""
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def __reduce__(self):
+        # Sin estado: al serializarse (p. ej. hacia un proceso de trabajo)
+        # vuelve como el reloj compartido del módulo
+        return (_real_clock, ())
+
+    def __repr__(self):
+        return "RealClock()"
+
+
+real_clock = RealClock()
+
+
+def _real_clock():
+    return real_clock
+
+
+class VirtualClock(Clock):
+    """
+    Reloj de eventos discretos: el tiempo solo avanza cuando alguien
+    duerme, y avanza al instante.
+
+    Los algoritmos anytime con este reloj no corren en un thread: cada
+    compute_step() es un evento agendado en el reloj. Un paso ocurre en el
+    instante de su evento (lo que publica queda estampado con ese
+    instante); lo que el paso "duerme" (p. ej. step_delay) no bloquea, se
+    suma a su duración, y el paso siguiente se agenda al terminar esa
+    duración. Un paso que no duerme dura step_time.
+
+    sleep(dt) desde fuera de un evento (el meta-nivel) ejecuta en orden
+    todos los eventos hasta now() + dt y deja el reloj en ese instante.
+    Todo ocurre en el thread que llama: una ejecución es determinística y
+    tan rápida como el cómputo de los pasos y del monitoreo.
+    """
+
+    virtual = True
+
+    def __init__(self, start=0.0, step_time=1e-3):
+        """
+        Args:
+            start: Instante inicial en segundos
+            step_time: Duración virtual de un paso que no duerme
+        """
+        if step_time <= 0:
+            raise ValueError("step_time debe ser positivo")
+        self.step_time = step_time
+        self._now = float(start)
+        self._events = []
+        self._sequence = itertools.count()
+        self._dispatching = False
+        self._busy = 0.0
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        if self._dispatching:
+            # Dentro de un evento: el tiempo dormido es parte de su duración
+            self._busy += seconds
+            return
+        self.run_until(self._now + seconds)
+
+    def call_at(self, when, callback):
+        """Agenda callback() para el instante `when` (no antes de now())."""
+        heapq.heappush(self._events, (max(when, self._now), next(self._sequence), callback))
+
+    def call_later(self, delay, callback):
+        """Agenda callback() para dentro de `delay` segundos."""
+        self.call_at(self._now + delay, callback)
+
+    def busy_time(self):
+        """Segundos dormidos por el evento en curso (o step_time si no durmió)."""
+        return self._busy or self.step_time
+
+    def pending(self):
+        """Cantidad de eventos agendados."""
+        return len(self._events)
+
+    def run_until(self, when, until=None):
+        """
+        Ejecuta en orden los eventos agendados hasta el instante `when`
+        (None = hasta agotarlos) y avanza el reloj hasta allí.
+
+        Args:
+            when: Instante final en segundos (None = sin límite)
+            until: Función sin argumentos; si retorna True después de un
+                   evento, el reloj se detiene en ese evento
+
+        Returns:
+            bool: True si se detuvo porque until() se cumplió
+        """
+        if self._dispatching:
+            raise RuntimeError("run_until() no puede llamarse desde un evento del reloj")
+        events = self._events
+        while events and (when is None or events[0][0] <= when):
+            self._now, _, callback = heapq.heappop(events)
+            self._dispatching = True
+            self._busy = 0.0
+            try:
+                callback()
+            finally:
+                self._dispatching = False
+            if until is not None and until():
+                return True
+        if when is not None and when > self._now:
+            self._now = when
+        return False
+
+    def __repr__(self):
+        return f"VirtualClock(now={self._now:.3f}, pending={len(self._events)})"
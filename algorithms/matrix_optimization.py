@@ -1,156 +1,469 @@
 import random
+import logging
 import numpy as np
-import time
 from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+from algorithms.series_estimation import SeriesEstimatorAnytime
+
+logger = logging.getLogger(__name__)
 
 class MatrixOptimizationAnytime(AnytimeAlgorithm):
     """
-    Algoritmo anytime de ejemplo: optimización de multiplicación de matrices.
+    Algoritmo anytime: parentización óptima de una cadena de matrices.
+    
+    Dada la cadena A0·A1·...·A(n-1), donde Ai tiene dimensiones
+    p[i] x p[i+1], busca el orden de multiplicación con menos operaciones
+    escalares:
     
-    Simula un algoritmo que intenta encontrar el mejor orden de multiplicación
-    de matrices para minimizar operaciones. La calidad mejora con el tiempo
-    a medida que explora más posibilidades.
+    1. Solución inicial greedy (multiplicar primero el par adyacente más barato).
+    2. Búsqueda local por rotaciones del árbol de multiplicación; cada
+       rotación cambia solo dos productos, así que se evalúa en O(1).
+    3. Programación dinámica O(n³) incremental con costos de subcadenas
+       memoizados. Cada vez que completa una longitud de subcadena, injerta
+       los subárboles óptimos en la solución actual; al terminar, la
+       solución es el óptimo exacto.
+       
+    La calidad es cota_inferior / costo, con una cota inferior probada que
+    se ajusta a medida que avanza la PD, de modo que 1 - calidad acota la
+    mejora relativa que aún es posible.
     """
     
-    def __init__(self, num_matrices=5, size=10):
+    def __init__(self, num_matrices=5, size=10, dimensions=None, moves_per_step=None,
+                 cells_per_step=None, step_delay=0.05, seed=None):
+        """
+        Args:
+            num_matrices: Largo de la cadena si no se dan dimensiones
+            size: Dimensión típica de las matrices aleatorias (entre size/2 y 2*size)
+            dimensions: Dimensiones p[0..n] de la cadena (None = aleatorias)
+            moves_per_step: Rotaciones de búsqueda local por paso (None = max(10, n))
+            cells_per_step: Celdas de la tabla de PD por paso (None = n)
+            step_delay: Pausa entre pasos en segundos
+            seed: Semilla del generador aleatorio
+        """
         super().__init__()
-        self.num_matrices = num_matrices
+        self.rng = random.Random(seed)
+        if dimensions is None:
+            low = max(1, size // 2)
+            dimensions = [self.rng.randint(low, 2 * size) for _ in range(num_matrices + 1)]
+        if len(dimensions) < 2:
+            raise ValueError("La cadena debe tener al menos una matriz (dos dimensiones)")
+        
+        self.dimensions = [int(d) for d in dimensions]
+        self.num_matrices = len(self.dimensions) - 1
         self.size = size
-        self.matrices = []
+        self.moves_per_step = (max(10, self.num_matrices) if moves_per_step is None
+                               else moves_per_step)
+        self.cells_per_step = cells_per_step or max(1, self.num_matrices)
+        self.step_delay = step_delay
+        self._elimination_bounds = self._dimension_elimination_bounds(self.dimensions)
+        self.lower_bound = int(sum(self._elimination_bounds))
+        
+        # Árbol de multiplicación actual: splits[(i, j)] = k significa
+        # (Ai..Ak)·(Ak+1..Aj)
+        self.splits = {}
         self.best_order = None
         self.best_cost = float('inf')
         self.iterations = 0
-        self.max_iterations = 100
+        self.max_iterations = None
         
-    def initial_solution(self):
-        """
-        Genera matrices aleatorias y una solución inicial simple.
+        self._nodes = []
+        self._node_pos = {}
+        self._dp_cost = None
+        self._dp_split = None
+        self._dp_length = 2
+        self._dp_start = 0
+    
+    @staticmethod
+    def _dimension_elimination_bounds(p):
         """
-        # Generar matrices aleatorias
-        self.matrices = [np.random.rand(self.size, self.size) 
-                        for _ in range(self.num_matrices)]
+        Cota inferior del costo de eliminar cada dimensión interior.
         
-        # Orden inicial simple (secuencial)
-        self.best_order = list(range(self.num_matrices))
-        self.best_cost = self._evaluate_order(self.best_order)
+        Cada una de las n-1 multiplicaciones elimina exactamente una
+        dimensión interior p[k] con costo p[a]·p[k]·p[b], a < k < b, así que
+        cuesta al menos p[k]·min(p[0..k-1])·min(p[k+1..n]). La suma sobre k
+        es una cota inferior del costo de cualquier parentización.
         
-        # Calidad inicial baja (normalizada entre 0 y 1)
-        initial_quality = 1.0 / (1.0 + self.best_cost / 1000.0)
-        
-        return Solution(
-            data={'order': self.best_order.copy(), 'cost': self.best_cost},
-            quality_value=initial_quality
-        )
-    
-    def _evaluate_order(self, order):
-        """
-        Evalúa el costo de un orden de multiplicación dado.
-        Simula operaciones de punto flotante necesarias.
+        Returns:
+            np.ndarray: bounds[k] para k = 0..n (cero en los extremos)
         """
-        # Simulación simple: el costo depende de cuán "desordenado" está
-        cost = 0
-        for i in range(len(order) - 1):
-            cost += abs(order[i] - order[i+1]) * self.size * self.size
-        return cost + random.uniform(0, 100)  # Añade ruido
+        p = np.asarray(p, dtype=np.float64)
+        bounds = np.zeros(len(p))
+        if len(p) > 2:
+            prefix_min = np.minimum.accumulate(p)[:-2]
+            suffix_min = np.minimum.accumulate(p[::-1])[::-1][2:]
+            bounds[1:-1] = p[1:-1] * prefix_min * suffix_min
+        return bounds
     
-    def compute_step(self):
+    def initial_solution(self):
         """
-        Realiza un paso de optimización: prueba un nuevo orden aleatorio.
+        Parentización greedy: multiplica repetidamente el par adyacente
+        cuyo producto es más barato.
         """
-        if self.iterations >= self.max_iterations:
-            return False  # Terminado
+        n = self.num_matrices
+        p = self.dimensions
         
-        self.iterations += 1
+        self.splits = {}
+        segments = [(i, i) for i in range(n)]
+        while len(segments) > 1:
+            best = min(range(len(segments) - 1),
+                       key=lambda t: p[segments[t][0]] * p[segments[t][1] + 1] * p[segments[t + 1][1] + 1])
+            (i, k), (_, j) = segments[best], segments[best + 1]
+            self.splits[(i, j)] = k
+            segments[best:best + 2] = [(i, j)]
         
-        # Genera un nuevo orden candidato (perturbación del mejor)
-        candidate_order = self.best_order.copy()
+        self._rebuild_nodes()
+        self.best_cost = self._tree_cost()
+        self.best_order = self._order_string()
         
-        # Estrategia: swap aleatorio con probabilidad decreciente de cambios grandes
-        swap_magnitude = max(1, int((self.max_iterations - self.iterations) / 20))
-        i = random.randint(0, len(candidate_order) - 1)
-        j = random.randint(max(0, i - swap_magnitude), 
-                          min(len(candidate_order) - 1, i + swap_magnitude))
-        candidate_order[i], candidate_order[j] = candidate_order[j], candidate_order[i]
+        # Tabla de PD: costos memoizados de subcadenas y su mejor división
+        self._dp_cost = np.zeros((n, n))
+        self._dp_split = np.zeros((n, n), dtype=np.int64)
+        self._dp_length = 2
+        self._dp_start = 0
+        self.iterations = 0
         
-        # Evalúa el candidato
-        candidate_cost = self._evaluate_order(candidate_order)
+        return self._make_solution()
+    
+    def compute_step(self):
+        """
+        Un paso: búsqueda local por rotaciones y avance de la tabla de PD.
+        Publica una nueva solución solo si el costo o la cota mejoraron.
+        """
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            return False
+        if self.optimal():
+            return False
         
-        # Si es mejor, actualiza
-        if candidate_cost < self.best_cost:
-            self.best_order = candidate_order
-            self.best_cost = candidate_cost
-            print(f"    [Object-level] Improved! Cost: {self.best_cost:.2f}")
+        self.iterations += 1
+        improved = self._search_step()
         
-        # Calcula calidad mejorada (se acerca a 1 a medida que el costo disminuye)
-        quality = 1.0 / (1.0 + self.best_cost / 1000.0)
+        if self._advance_dp(self.cells_per_step):
+            improved = self._graft_dp_subtrees() or improved
+            bound = self._dp_lower_bound()
+            if bound > self.lower_bound:
+                self.lower_bound = bound
+                improved = True
+        if self.optimal():
+            # La PD terminó: su costo es a la vez cota y óptimo
+            self.lower_bound = int(round(self._dp_cost[0, self.num_matrices - 1]))
+            improved = True
         
-        # Actualiza la solución
-        new_solution = Solution(
-            data={'order': self.best_order.copy(), 'cost': self.best_cost},
-            quality_value=quality
-        )
-        self.update_solution(new_solution)
+        if improved:
+            self.best_order = self._order_string()
+            logger.info("    [Object-level] Improved! Cost: %.2f", self.best_cost)
+            self.update_solution(self._make_solution())
         
-        # Simula trabajo computacional
-        time.sleep(0.05)
+        # Pausa entre pasos (ritmo de la demostración)
+        self.clock.sleep(self.step_delay)
         
-        return True  # Puede continuar
-
-
-class IterativeRefinementAnytime(AnytimeAlgorithm):
-    """
-    Algoritmo anytime más simple: refinamiento iterativo de una aproximación.
-    Ejemplo: cálculo iterativo de π o una integral.
-    """
+        return not self.optimal()
     
-    def __init__(self, target_value=np.pi, max_iterations=50):
-        super().__init__()
-        self.target_value = target_value
-        self.max_iterations = max_iterations
-        self.current_estimate = 3.0  # Aproximación inicial tosca
-        self.iterations = 0
+    def optimal(self):
+        """True cuando la PD terminó y la solución actual es el óptimo."""
+        return self.num_matrices < 2 or self._dp_length > self.num_matrices
     
-    def initial_solution(self):
+    def parenthesization(self):
         """
-        Solución inicial: aproximación tosca.
+        Retorna la parentización actual como tuplas anidadas de índices,
+        por ejemplo ((0, 1), 2) para (A0·A1)·A2.
         """
-        error = abs(self.current_estimate - self.target_value)
-        quality = 1.0 / (1.0 + error)
-        
+        def build(i, j):
+            if i == j:
+                return i
+            k = self.splits[(i, j)]
+            return (build(i, k), build(k + 1, j))
+        return build(0, self.num_matrices - 1)
+    
+    def _checkpoint_state(self):
+        """
+        Estado para snapshot(): los índices de nodos y las cotas por
+        dimensión se reconstruyen al restaurar, así que no se guardan.
+        """
+        state = super()._checkpoint_state()
+        for key in ('_nodes', '_node_pos', '_elimination_bounds'):
+            state.pop(key, None)
+        return state
+    
+    def _restore_state(self, state):
+        super()._restore_state(state)
+        self._elimination_bounds = self._dimension_elimination_bounds(self.dimensions)
+        self._rebuild_nodes()
+    
+    def _make_solution(self):
+        quality = self.lower_bound / self.best_cost if self.best_cost > 0 else 1.0
         return Solution(
-            data={'estimate': self.current_estimate, 'error': error},
+            data={
+                'order': self.best_order,
+                'cost': self.best_cost,
+                'lower_bound': self.lower_bound,
+                'gap': self.best_cost - self.lower_bound
+            },
             quality_value=quality
         )
     
-    def compute_step(self):
+    def _search_step(self):
+        """Parte heurística de un paso; retorna True si bajó el costo."""
+        return self._local_search(self.moves_per_step)
+    
+    def _local_search(self, moves, accept_worse=False):
         """
-        Refina la estimación usando más términos de una serie.
+        Rotaciones aleatorias del árbol, aceptando las que no empeoran (o
+        todas, con accept_worse=True, para perturbar la solución).
+        
+        Rotación a derecha: (A·B)·C -> A·(B·C); a izquierda: A·(B·C) -> (A·B)·C.
+        Solo cambian los productos de los dos nodos rotados.
         """
-        if self.iterations >= self.max_iterations:
+        if not self._nodes:
             return False
+        p = self.dimensions
+        splits = self.splits
+        rng = self.rng
+        improved = False
         
-        self.iterations += 1
+        for _ in range(moves):
+            i, j = self._nodes[rng.randrange(len(self._nodes))]
+            k = splits[(i, j)]
+            if rng.random() < 0.5:
+                if k == i:
+                    continue
+                k2 = splits[(i, k)]
+                old = p[i] * p[k + 1] * p[j + 1] + p[i] * p[k2 + 1] * p[k + 1]
+                new = p[i] * p[k2 + 1] * p[j + 1] + p[k2 + 1] * p[k + 1] * p[j + 1]
+                if new <= old or accept_worse:
+                    splits[(i, j)] = k2
+                    self._replace_node((i, k), (k2 + 1, j), k)
+                else:
+                    continue
+            else:
+                if k + 1 == j:
+                    continue
+                k3 = splits[(k + 1, j)]
+                old = p[i] * p[k + 1] * p[j + 1] + p[k + 1] * p[k3 + 1] * p[j + 1]
+                new = p[i] * p[k3 + 1] * p[j + 1] + p[i] * p[k + 1] * p[k3 + 1]
+                if new <= old or accept_worse:
+                    splits[(i, j)] = k3
+                    self._replace_node((k + 1, j), (i, k3), k)
+                else:
+                    continue
+            if new != old:
+                self.best_cost += new - old
+                improved = improved or new < old
+        
+        return improved
+    
+    def _replace_node(self, old_key, new_key, split):
+        del self.splits[old_key]
+        self.splits[new_key] = split
+        pos = self._node_pos.pop(old_key)
+        self._nodes[pos] = new_key
+        self._node_pos[new_key] = pos
+    
+    def _advance_dp(self, budget):
+        """
+        Calcula hasta `budget` celdas de la tabla de PD, por longitud de
+        subcadena creciente. Retorna True si completó alguna longitud.
+        """
+        n = self.num_matrices
+        m = self._dp_cost
+        p = np.asarray(self.dimensions, dtype=np.float64)
+        completed = False
+        
+        while budget > 0 and self._dp_length <= n:
+            i = self._dp_start
+            j = i + self._dp_length - 1
+            # m[i][j] = min_k m[i][k] + m[k+1][j] + p[i]·p[k+1]·p[j+1]
+            costs = m[i, i:j] + m[i + 1:j + 1, j] + p[i] * p[i + 1:j + 1] * p[j + 1]
+            best = int(np.argmin(costs))
+            m[i, j] = costs[best]
+            self._dp_split[i, j] = i + best
+            
+            budget -= 1
+            self._dp_start += 1
+            if self._dp_start + self._dp_length > n:
+                self._dp_length += 1
+                self._dp_start = 0
+                completed = True
         
-        # Simula refinamiento: aproximación de π usando serie de Leibniz
-        # π/4 = 1 - 1/3 + 1/5 - 1/7 + ...
-        n_terms = (self.iterations + 1) * 10
-        pi_approx = sum((-1)**n / (2*n + 1) for n in range(n_terms)) * 4
+        return completed
+    
+    def _dp_lower_bound(self):
+        """
+        Cota inferior que usa las subcadenas ya resueltas por la PD.
         
-        self.current_estimate = pi_approx
-        error = abs(self.current_estimate - self.target_value)
-        quality = 1.0 / (1.0 + error * 10)  # Escala el error
+        En cualquier árbol, los subárboles maximales de largo <= L (las
+        longitudes resueltas) parten la cadena en segmentos; cada uno cuesta
+        al menos su óptimo memoizado y cada multiplicación que los une
+        elimina una dimensión de frontera. Se minimiza sobre todas las
+        particiones con una PD unidimensional en O(n·L).
+        """
+        n = self.num_matrices
+        solved = self._dp_length - 1
+        m = self._dp_cost
+        f = np.full(n + 1, np.inf)
+        f[0] = 0.0
+        for t in range(1, n + 1):
+            s = np.arange(max(0, t - solved), t)
+            f[t] = np.min(f[s] + m[s, t - 1] + self._elimination_bounds[s])
+        return int(f[n])
+    
+    def _graft_dp_subtrees(self):
+        """
+        Reemplaza cada subárbol cuya subcadena ya está resuelta por la PD y
+        cuesta más que el óptimo memoizado. Retorna True si hubo cambios.
+        """
+        solved = self._dp_length - 1
+        p = self.dimensions
+        splits = self.splits
         
-        if self.iterations % 5 == 0:
-            print(f"    [Object-level] Iteration {self.iterations}: estimate={pi_approx:.6f}, error={error:.6f}")
+        subtree_cost = {}
+        for i, j in reversed(self._preorder()):
+            k = splits[(i, j)]
+            subtree_cost[(i, j)] = (subtree_cost.get((i, k), 0) + subtree_cost.get((k + 1, j), 0)
+                                    + p[i] * p[k + 1] * p[j + 1])
         
-        # Actualiza solución
-        new_solution = Solution(
-            data={'estimate': self.current_estimate, 'error': error},
-            quality_value=quality
-        )
-        self.update_solution(new_solution)
+        improved = False
+        stack = [(0, self.num_matrices - 1)]
+        while stack:
+            i, j = stack.pop()
+            if i == j:
+                continue
+            if j - i + 1 <= solved and subtree_cost[(i, j)] > self._dp_cost[i, j] + 0.5:
+                self._replace_subtree(i, j)
+                improved = True
+                continue
+            k = splits[(i, j)]
+            stack.append((i, k))
+            stack.append((k + 1, j))
         
-        # Simula computación
-        time.sleep(0.1)
+        if improved:
+            self._rebuild_nodes()
+            self.best_cost = self._tree_cost()
+        return improved
+    
+    def _replace_subtree(self, i, j):
+        """Sustituye el subárbol (i, j) por el de la tabla de PD."""
+        stack = [(i, j)]
+        while stack:
+            a, b = stack.pop()
+            if a == b:
+                continue
+            k = self.splits.pop((a, b))
+            stack.append((a, k))
+            stack.append((k + 1, b))
         
-        return True
\ No newline at end of file
+        stack = [(i, j)]
+        while stack:
+            a, b = stack.pop()
+            if a == b:
+                continue
+            k = int(self._dp_split[a, b])
+            self.splits[(a, b)] = k
+            stack.append((a, k))
+            stack.append((k + 1, b))
+    
+    def encode_tree(self):
+        """
+        Árbol actual como array int32 compacto: el split k de cada nodo
+        interno en preorden (n-1 valores), que alcanza para reconstruirlo.
+        """
+        return np.array([self.splits[node] for node in self._preorder()], dtype=np.int32)
+    
+    def decode_tree(self, encoded):
+        """Reemplaza el árbol actual por uno codificado con encode_tree()."""
+        splits = {}
+        encoded = iter(encoded.tolist())
+        if self.num_matrices >= 2:
+            stack = [(0, self.num_matrices - 1)]
+            while stack:
+                i, j = stack.pop()
+                k = next(encoded)
+                splits[(i, j)] = k
+                if k + 1 < j:
+                    stack.append((k + 1, j))
+                if i < k:
+                    stack.append((i, k))
+        self.splits = splits
+        self._rebuild_nodes()
+        self.best_cost = self._tree_cost()
+    
+    def _preorder(self):
+        """Nodos internos del árbol en preorden (padres antes que hijos)."""
+        order = []
+        if self.num_matrices < 2:
+            return order
+        stack = [(0, self.num_matrices - 1)]
+        while stack:
+            i, j = stack.pop()
+            order.append((i, j))
+            k = self.splits[(i, j)]
+            if k + 1 < j:
+                stack.append((k + 1, j))
+            if i < k:
+                stack.append((i, k))
+        return order
+    
+    def _rebuild_nodes(self):
+        self._nodes = list(self.splits)
+        self._node_pos = {key: pos for pos, key in enumerate(self._nodes)}
+    
+    def _tree_cost(self):
+        p = self.dimensions
+        return sum(p[i] * p[k + 1] * p[j + 1] for (i, j), k in self.splits.items())
+    
+    def _order_string(self):
+        """Parentización en texto, por ejemplo '((A0 A1) A2)'."""
+        parts = []
+        stack = [(0, self.num_matrices - 1)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            i, j = item
+            if i == j:
+                parts.append(f"A{i}")
+                continue
+            k = self.splits[(i, j)]
+            stack.extend([")", (k + 1, j), " ", (i, k)])
+            parts.append("(")
+        return "".join(parts)
+
+
+class IterativeRefinementAnytime(SeriesEstimatorAnytime):
+    """
+    Algoritmo anytime más simple: refinamiento iterativo de una aproximación.
+    Ejemplo: cálculo iterativo de π con la serie de Leibniz,
+    π/4 = 1 - 1/3 + 1/5 - 1/7 + ...
+    
+    Cada paso agrega terms_per_step términos a la suma parcial acumulada;
+    con acceleration='euler' la estimación gana muchos más dígitos por paso.
+    """
+    
+    def __init__(self, target_value=np.pi, max_iterations=50, terms_per_step=10,
+                 acceleration=None, step_delay=0.1):
+        super().__init__(
+            term=self._leibniz_term,
+            target_value=target_value,
+            terms_per_step=terms_per_step,
+            max_iterations=max_iterations,
+            scale=4.0,
+            acceleration=acceleration,
+            initial_estimate=3.0,  # Aproximación inicial tosca
+            error_scale=10.0,  # Escala el error
+            step_delay=step_delay
+        )
+    
+    @staticmethod
+    def _leibniz_term(n):
+        # (-1)^n / (2n + 1) sin potencias
+        return np.where(n % 2 == 0, 1.0, -1.0) / (2 * n + 1)
+    
+    def compute_step(self):
+        """
+        Refina la estimación usando más términos de la serie.
+        """
+        can_continue = super().compute_step()
+        if can_continue and self.iterations % 5 == 0:
+            error = abs(self.current_estimate - self.target_value)
+            logger.info("    [Object-level] Iteration %d: estimate=%.6f, error=%.6f",
+                        self.iterations, self.current_estimate, error)
+        return can_continue
\ No newline at end of file
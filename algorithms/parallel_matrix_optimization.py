@@ -0,0 +1,213 @@
+import time
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from algorithms.matrix_optimization import MatrixOptimizationAnytime
+from algorithms.process_anytime import SharedSolutionSlot
+
+logger = logging.getLogger(__name__)
+
+# Palabra de control compartida con los procesos de búsqueda
+CONTROL_RUN = 0
+CONTROL_STOP = 1
+CONTROL_PAUSE = 2
+
+
+def _search_worker(problem_name, num_matrices, slot_name, seed, kick, moves, patience):
+    """
+    Proceso de búsqueda: búsqueda local iterada (rotaciones que no empeoran,
+    y al estancarse una perturbación de `kick` rotaciones al azar desde el
+    mejor árbol). Publica el mejor árbol en su slot cada vez que mejora.
+
+    Las dimensiones y la palabra de control se leen de la memoria
+    compartida problem_name: [control | p[0..n]] como int64.
+
+    Returns:
+        int: Rotaciones evaluadas
+    """
+    problem = shared_memory.SharedMemory(name=problem_name)
+    slot = SharedSolutionSlot(4 * max(1, num_matrices - 1), name=slot_name)
+    # La vista sobre la memoria compartida debe liberarse antes de close()
+    control = np.ndarray((num_matrices + 2,), dtype=np.int64, buffer=problem.buf)
+    try:
+        search = MatrixOptimizationAnytime(dimensions=control[1:].tolist(), seed=seed, step_delay=0)
+        search.initial_solution()
+        if seed:
+            # Arranques distintos: cada proceso parte del greedy perturbado
+            search._local_search(kick * 4, accept_worse=True)
+        best_cost = float('inf')
+        best = None
+        improvements = 0
+        evaluated = 0
+        stalled = 0
+        while control[0] != CONTROL_STOP:
+            if control[0] == CONTROL_PAUSE:
+                time.sleep(0.01)
+                continue
+            improved = search._local_search(moves)
+            evaluated += moves
+            if search.best_cost < best_cost:
+                best_cost = search.best_cost
+                best = search.encode_tree()
+                improvements += 1
+                slot.publish(float(best_cost), improvements, best.tobytes())
+            stalled = 0 if improved else stalled + 1
+            if stalled >= patience and best is not None:
+                # Estancado: perturbar el mejor árbol conocido
+                search.decode_tree(best)
+                search._local_search(kick, accept_worse=True)
+                stalled = 0
+        return evaluated
+    finally:
+        del control
+        problem.close()
+        slot.close()
+
+
+class ParallelMatrixOptimizationAnytime(MatrixOptimizationAnytime):
+    """
+    MatrixOptimizationAnytime con búsqueda multi-arranque en paralelo.
+
+    K procesos de un pool ejecutan búsquedas locales iteradas
+    independientes, cada uno con su semilla y su intensidad de perturbación.
+    Las dimensiones se comparten una sola vez en memoria compartida y cada
+    proceso publica su mejor árbol (codificado con encode_tree()) en un
+    SharedSolutionSlot propio.
+
+    El thread del algoritmo sigue avanzando la programación dinámica (cota
+    inferior y óptimo exacto); en cada paso, en lugar de su propia búsqueda
+    local, adopta el mejor árbol publicado por los procesos si es más
+    barato que el actual. current_solution() expone esa solución combinada.
+    """
+
+    # Los procesos de búsqueda avanzan en tiempo real
+    supports_virtual_clock = False
+
+    def __init__(self, workers=4, kick=None, patience=3, start_method=None, **kwargs):
+        """
+        Args:
+            workers: Procesos de búsqueda (K)
+            kick: Rotaciones de la perturbación del proceso 0 (None = n/10);
+                  el proceso w usa kick · 2^(w mod 4)
+            patience: Rondas sin mejora antes de perturbar
+            start_method: Método de inicio de multiprocessing (None = por defecto)
+            **kwargs: Parámetros de MatrixOptimizationAnytime
+        """
+        super().__init__(**kwargs)
+        if workers < 1:
+            raise ValueError("Se necesita al menos un proceso de búsqueda")
+        self.workers = workers
+        self.kick = kick or max(2, self.num_matrices // 10)
+        self.patience = patience
+        self.start_method = start_method
+        self.base_seed = self.rng.randrange(1 << 30)
+        self._pool = None
+        self._futures = []
+        self._problem = None
+        self._control = None
+        self._slots = []
+
+    def start(self):
+        """Inicia los procesos de búsqueda y luego el thread del algoritmo."""
+        if self._running:
+            return
+        if self.num_matrices >= 2:
+            self._start_workers()
+        super().start()
+
+    def _start_workers(self):
+        n = self.num_matrices
+        self._problem = shared_memory.SharedMemory(create=True, size=8 * (n + 2))
+        shared = np.ndarray((n + 2,), dtype=np.int64, buffer=self._problem.buf)
+        shared[0] = CONTROL_PAUSE if self.paused() else CONTROL_RUN
+        shared[1:] = self.dimensions
+        self._control = shared[:1]
+        self._slots = [SharedSolutionSlot(4 * (n - 1)) for _ in range(self.workers)]
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=mp.get_context(self.start_method))
+        self._futures = [
+            self._pool.submit(_search_worker, self._problem.name, n, slot.name,
+                              self.base_seed + w, self.kick * 2 ** (w % 4),
+                              self.moves_per_step, self.patience)
+            for w, slot in enumerate(self._slots)
+        ]
+
+    def _search_step(self):
+        """
+        Combina los resultados de los procesos: adopta el árbol más barato
+        publicado, si mejora el actual. Solo se lee el encabezado de cada
+        slot; el árbol se copia únicamente del ganador.
+        """
+        best_slot = None
+        best_cost = self.best_cost
+        for w, slot in enumerate(self._slots):
+            _, cost, version = slot.read_header()
+            if version and cost < best_cost:
+                best_slot, best_cost = w, cost
+        if best_slot is None:
+            return False
+        _, cost, _, _, payload = self._slots[best_slot].read()
+        if cost >= self.best_cost:
+            return False
+        self.decode_tree(np.frombuffer(payload, dtype=np.int32))
+        logger.debug("[Parallel] Adopted tree from worker %d (cost %.0f)", best_slot, cost)
+        return True
+
+    def compute_step(self):
+        can_continue = super().compute_step()
+        if not can_continue:
+            # La PD terminó: la búsqueda paralela ya no puede mejorar nada
+            self._stop_workers()
+        return can_continue
+
+    def stop(self):
+        super().stop()
+        self._stop_workers()
+
+    def pause(self):
+        super().pause()
+        if self._control is not None:
+            self._control[0] = CONTROL_PAUSE
+
+    def resume(self):
+        super().resume()
+        if self._control is not None:
+            self._control[0] = CONTROL_RUN
+
+    def evaluated_moves(self):
+        """Rotaciones evaluadas por los procesos (disponible al detenerse)."""
+        return sum(f.result() for f in self._futures if f.done() and not f.exception())
+
+    def _stop_workers(self):
+        # Puede llamarse desde el thread del algoritmo (al terminar la PD) y
+        # desde stop(): el lock de pasos los serializa
+        with self._step_lock:
+            if self._pool is None:
+                return
+            self._control[0] = CONTROL_STOP
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._control = None
+            self._problem.close()
+            self._problem.unlink()
+            self._problem = None
+            for slot in self._slots:
+                slot.close()
+                slot.unlink()
+            self._slots = []
+
+    def _checkpoint_state(self):
+        state = super()._checkpoint_state()
+        for key in ('_pool', '_futures', '_problem', '_control', '_slots'):
+            state.pop(key, None)
+        return state
+
+    def _restore_state(self, state):
+        super()._restore_state(state)
+        self._pool = None
+        self._futures = []
+        self._problem = None
+        self._control = None
+        self._slots = []
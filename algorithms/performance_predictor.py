@@ -1,5 +1,54 @@
+import copy
+import math
 import numpy as np
 from abc import ABC, abstractmethod
+from collections import deque
+from algorithms.performance_profile import PerformanceProfile
+from algorithms.quality_history import QualityHistory
+
+
+def pad_histories(histories, lengths=None):
+    """
+    Normaliza un lote de historiales a un array 2-D con relleno más largos.
+    
+    Args:
+        histories: Array 2-D (lote, máx. largo) ya rellenado, o una lista de
+                   historiales de distinto largo
+        lengths: Largo real de cada fila (None = filas completas, o el largo
+                 de cada historial si es una lista)
+    
+    Returns:
+        tuple: (array float64 de forma (lote, máx. largo), array de largos)
+    """
+    if isinstance(histories, np.ndarray) and histories.ndim == 2:
+        padded = np.asarray(histories, dtype=np.float64)
+        if lengths is None:
+            lengths = np.full(len(padded), padded.shape[1])
+    else:
+        rows = [np.asarray(history, dtype=np.float64) for history in histories]
+        if lengths is None:
+            lengths = [len(row) for row in rows]
+        width = max([len(row) for row in rows] + [1])
+        padded = np.zeros((len(rows), width))
+        for i, row in enumerate(rows):
+            padded[i, :len(row)] = row
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if lengths.shape != (len(padded),) or np.any(lengths < 0) or np.any(lengths > padded.shape[1]):
+        raise ValueError("lengths debe tener un largo válido por cada historial")
+    return padded, lengths
+
+
+def _last_values(padded, lengths):
+    """Última calidad de cada fila (0.0 para historiales vacíos)."""
+    index = np.maximum(lengths - 1, 0)
+    last = padded[np.arange(len(padded)), index]
+    return np.where(lengths > 0, last, 0.0)
+
+
+def _clip_quality(q):
+    """Recorta una predicción escalar a [0, 1] (comparaciones, sin NumPy)."""
+    return 0.0 if q < 0.0 else 1.0 if q > 1.0 else q
+
 
 class PerformancePredictor(ABC):
     """
@@ -13,79 +62,265 @@ class PerformancePredictor(ABC):
         Predice la calidad futura basándose en el historial.
         
         Args:
-            history: Lista de valores de calidad observados [q1, q2, ..., qn]
+            history: Calidades observadas [q1, q2, ..., qn] (lista o QualityHistory)
             
         Returns:
             Lista de calidades predichas para tiempos futuros
         """
         pass
+    
+    def predict_batch(self, histories, lengths=None):
+        """
+        Predice para un lote de historiales (por ejemplo, uno por trabajo
+        monitoreado). Esta versión llama a predict() por fila; los
+        predictores del paquete la reemplazan por un único cálculo vectorizado.
+        
+        Args:
+            histories: Array 2-D rellenado o lista de historiales (ver pad_histories)
+            lengths: Largo real de cada historial
+            
+        Returns:
+            np.ndarray: Predicciones de forma (lote, pasos futuros)
+        """
+        padded, lengths = pad_histories(histories, lengths)
+        return np.array([self.predict(row[:n].tolist()) for row, n in zip(padded, lengths)])
+
+
+class StreamingPerformancePredictor(PerformancePredictor):
+    """
+    Predictor incremental: se alimenta con cada calidad observada mediante
+    update(q, t) y predice con predict() usando acumuladores, en O(1) por
+    muestra.
+    
+    El eje de tiempo de todos los predictores es el tick de Δt: si se
+    conoce delta_t (el meta-nivel lo asigna) y la muestra trae su instante
+    t, su posición es t/Δt, así que muestras espaciadas (el meta-nivel solo
+    registra soluciones nuevas) quedan donde ocurrieron y las predicciones
+    son para los próximos 1..future_steps ticks. Sin instante, la posición
+    es el índice de la muestra (una muestra por tick).
+    
+    predict(history) también acepta un QualityHistory, cuyas estadísticas
+    corrientes alcanzan para cargar el estado en O(1) (ver _load), o una
+    lista, que se recorre completa por compatibilidad. En ambos casos el
+    estado incremental no se altera.
+    """
+    
+    def __init__(self, future_steps=5):
+        self.future_steps = future_steps
+        # Duración de un tick en segundos (None = una muestra por tick)
+        self.delta_t = None
+        self.reset()
+    
+    @abstractmethod
+    def reset(self):
+        """Descarta el estado acumulado para comenzar una nueva ejecución."""
+        pass
+    
+    @abstractmethod
+    def update(self, q, t=None):
+        """Incorpora una nueva calidad observada en el instante t (segundos)."""
+        pass
+    
+    @abstractmethod
+    def _forecast(self):
+        """Predice a partir del estado acumulado."""
+        pass
+    
+    def _load(self, history):
+        """
+        Carga el estado desde un QualityHistory. Por defecto reproduce la
+        ventana reciente; las subclases lo cargan de las estadísticas.
+        """
+        self.reset()
+        for q, t in self._samples_of(history):
+            self.update(q, t)
+    
+    def _tick(self, t, index):
+        """Posición de una muestra en ticks: t/Δt, o su índice si falta alguno."""
+        if t is None or self.delta_t is None:
+            return index
+        return t / self.delta_t
+    
+    def _timed(self, history):
+        """True si las posiciones salen de los instantes de history."""
+        return self.delta_t is not None and history.count > 0 and history.timed == history.count
+    
+    @staticmethod
+    def _samples_of(history, k=None):
+        """Pares (q, t) de las últimas k muestras de history (t None si no se registró)."""
+        window = history.window(k).tolist()
+        if history.timed < history.count:
+            return [(q, None) for q in window]
+        return list(zip(window, history.times(k).tolist()))
+    
+    def predict(self, history=None):
+        """
+        Predice a partir del estado incremental o, si se pasa history,
+        a partir de un QualityHistory (O(1)) o de una lista (O(n)).
+        """
+        if history is None:
+            return self._forecast()
+        
+        predictor = copy.copy(self)
+        if isinstance(history, QualityHistory):
+            predictor._load(history)
+        else:
+            predictor.reset()
+            for q in history:
+                predictor.update(q)
+        return predictor._forecast()
+    
+    def _constant(self, q):
+        """Predicción constante (también para historial vacío)."""
+        return [q if q is not None else 0.0] * self.future_steps
 
 
-class LinearRegressionPredictor(PerformancePredictor):
+class LinearRegressionPredictor(StreamingPerformancePredictor):
     """
     Predictor simple usando regresión lineal.
     Asume que la calidad mejora linealmente con el tiempo.
     """
     
     def __init__(self, future_steps=5):
-        self.future_steps = future_steps
+        super().__init__(future_steps)
     
-    def predict(self, history):
+    def reset(self):
+        self.n = 0
+        self.sum_x = 0.0
+        self.sum_xx = 0.0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.last = None
+        self.last_x = None
+    
+    def update(self, q, t=None):
+        x = self._tick(t, self.n)
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_xy += x * q
+        self.sum_y += q
+        self.n += 1
+        self.last = q
+        self.last_x = x
+    
+    def _load(self, history):
+        n = self.n = history.count
+        self.sum_y = history.sum
+        self.last = history.last
+        if self._timed(history):
+            d = self.delta_t
+            self.sum_x = history.sum_t / d
+            self.sum_xx = history.sum_tt / (d * d)
+            self.sum_xy = history.sum_tq / d
+            self.last_x = history.last_t / d
+        else:
+            # x = 0..n-1: Σx y Σx² tienen forma cerrada
+            self.sum_x = n * (n - 1) / 2
+            self.sum_xx = (n - 1) * n * (2 * n - 1) / 6
+            self.sum_xy = history.sum_xy
+            self.last_x = n - 1
+    
+    def _forecast(self):
         """
         Predice valores futuros usando regresión lineal simple.
         """
-        if len(history) < 2:
-            # No hay suficiente historial, retorna el último valor
-            return [history[-1]] * self.future_steps if history else [0.0] * self.future_steps
-        
-        # Crear datos para regresión
-        n = len(history)
-        x = np.arange(n)
-        y = np.array(history)
+        n = self.n
+        denominator = n * self.sum_xx - self.sum_x * self.sum_x
+        if n < 2 or denominator <= 0:
+            # No hay suficiente historial (o todo en el mismo tick), retorna el último valor
+            return self._constant(self.last)
         
         # Regresión lineal simple: y = mx + b
-        m = (n * np.sum(x * y) - np.sum(x) * np.sum(y)) / (n * np.sum(x**2) - np.sum(x)**2)
-        b = (np.sum(y) - m * np.sum(x)) / n
+        m = (n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+        b = (self.sum_y - m * self.sum_x) / n
         
-        # Predecir valores futuros
-        future_x = np.arange(n, n + self.future_steps)
-        predictions = m * future_x + b
+        # Predecir los próximos ticks, recortados a [0, 1]; en Python puro:
+        # para cinco valores NumPy cuesta más de lo que calcula
+        x = self.last_x
+        return [_clip_quality(m * (x + k) + b) for k in range(1, self.future_steps + 1)]
+    
+    def predict_batch(self, histories, lengths=None):
+        """
+        Regresión lineal de todo el lote a la vez: las sumas de cada fila
+        se calculan con una máscara sobre el array rellenado.
+        """
+        padded, lengths = pad_histories(histories, lengths)
+        x = np.arange(padded.shape[1])
+        values = np.where(x < lengths[:, np.newaxis], padded, 0.0)
+        n = lengths.astype(np.float64)
+        sum_y = values.sum(axis=1)
+        sum_xy = values @ x
         
-        # Asegurar que las predicciones no excedan 1.0 (calidad máxima)
-        predictions = np.clip(predictions, 0.0, 1.0)
+        sum_x = n * (n - 1) / 2
+        denominator = n * n * (n * n - 1) / 12
+        fitted = n >= 2
+        safe = np.where(fitted, denominator, 1.0)
+        m = np.where(fitted, (n * sum_xy - sum_x * sum_y) / safe, 0.0)
+        b = np.where(fitted, (sum_y - m * sum_x) / np.maximum(n, 1), _last_values(padded, lengths))
         
-        return predictions.tolist()
+        future_x = n[:, np.newaxis] + np.arange(self.future_steps)
+        predictions = np.clip(m[:, np.newaxis] * future_x + b[:, np.newaxis], 0.0, 1.0)
+        # Con menos de dos muestras la predicción es constante y sin recortar
+        return np.where(fitted[:, np.newaxis], predictions, b[:, np.newaxis])
 
 
-class DiminishingReturnsPredictor(PerformancePredictor):
+class DiminishingReturnsPredictor(StreamingPerformancePredictor):
     """
     Predictor que modela retornos decrecientes usando una función logarítmica.
     Más realista para muchos algoritmos anytime.
     """
     
     def __init__(self, future_steps=5, saturation_point=0.95):
-        self.future_steps = future_steps
         self.saturation_point = saturation_point
+        super().__init__(future_steps)
     
-    def predict(self, history):
+    def reset(self):
+        self.n = 0
+        self.first = None
+        self.last = None
+        self.first_x = None
+        self.last_x = None
+    
+    def update(self, q, t=None):
+        x = self._tick(t, self.n)
+        if self.n == 0:
+            self.first = q
+            self.first_x = x
+        self.last = q
+        self.last_x = x
+        self.n += 1
+    
+    def _load(self, history):
+        self.n = history.count
+        self.first = history.first
+        self.last = history.last
+        if self._timed(history):
+            self.first_x = history.first_t / self.delta_t
+            self.last_x = history.last_t / self.delta_t
+        else:
+            self.first_x = 0
+            self.last_x = history.count - 1
+    
+    def _forecast(self):
         """
         Predice usando un modelo de retornos decrecientes.
         """
-        if len(history) < 2:
-            return [history[-1]] * self.future_steps if history else [0.0] * self.future_steps
+        if self.n < 2:
+            return self._constant(self.last)
         
         # Calcular la tasa de mejora reciente
-        recent_improvement = history[-1] - history[0]
+        recent_improvement = self.last - self.first
         
         if recent_improvement <= 0:
             # No hay mejora, predecir valores constantes
-            return [history[-1]] * self.future_steps
+            return [self.last] * self.future_steps
         
         # Modelo: q(t) = saturation - (saturation - q0) * exp(-k*t)
         # Estimar k basándose en el historial
-        q0 = history[0]
-        qn = history[-1]
-        n = len(history)
+        q0 = self.first
+        qn = self.last
+        # Ticks transcurridos (n con una muestra por tick)
+        n = self.last_x - self.first_x + 1
         
         # Evitar división por cero
         if abs(self.saturation_point - qn) < 1e-6:
@@ -97,40 +332,291 @@ class DiminishingReturnsPredictor(PerformancePredictor):
         predictions = []
         for i in range(1, self.future_steps + 1):
             t = n + i
-            q_pred = self.saturation_point - (self.saturation_point - q0) * np.exp(-k * t)
-            predictions.append(float(np.clip(q_pred, 0.0, 1.0)))
+            q_pred = self.saturation_point - (self.saturation_point - q0) * math.exp(-k * t)
+            predictions.append(_clip_quality(q_pred))
         
         return predictions
+    
+    def predict_batch(self, histories, lengths=None):
+        """
+        Modelo de retornos decrecientes para todo el lote: solo usa la
+        primera y la última calidad de cada fila.
+        """
+        padded, lengths = pad_histories(histories, lengths)
+        n = lengths.astype(np.float64)
+        q0 = np.where(lengths > 0, padded[:, 0], 0.0)
+        qn = _last_values(padded, lengths)
+        saturation = self.saturation_point
+        
+        # Mismos casos que _forecast(): sin historial suficiente, sin mejora
+        # o ya saturado, la predicción es constante
+        fitted = (lengths >= 2) & (qn - q0 > 0) & (np.abs(saturation - qn) >= 1e-6)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = -np.log((saturation - qn) / (saturation - q0)) / np.maximum(n, 1)
+            t = n[:, np.newaxis] + np.arange(1, self.future_steps + 1)
+            curve = saturation - (saturation - q0)[:, np.newaxis] * np.exp(-k[:, np.newaxis] * t)
+        predictions = np.clip(curve, 0.0, 1.0)
+        return np.where(fitted[:, np.newaxis], predictions, qn[:, np.newaxis])
 
 
-class MovingAveragePredictor(PerformancePredictor):
+class MovingAveragePredictor(StreamingPerformancePredictor):
     """
     Predictor simple basado en promedio móvil.
     """
     
     def __init__(self, window_size=3, future_steps=5):
         self.window_size = window_size
-        self.future_steps = future_steps
+        super().__init__(future_steps)
     
-    def predict(self, history):
+    def reset(self):
+        # Las últimas window_size + 1 muestras (tick, calidad) bastan: el
+        # promedio de las mejoras de la ventana es (q_n - q_{n-w}) / (x_n - x_{n-w})
+        self.recent = deque(maxlen=self.window_size + 1)
+        self.n = 0
+    
+    def update(self, q, t=None):
+        self.recent.append((self._tick(t, self.n), q))
+        self.n += 1
+    
+    def _load(self, history):
+        self.reset()
+        samples = self._samples_of(history, self.window_size + 1)
+        self.n = history.count - len(samples)
+        for q, t in samples:
+            self.update(q, t)
+    
+    def _forecast(self):
         """
-        Predice usando el promedio de las últimas mejoras.
+        Predice usando el promedio de las últimas mejoras por tick.
         """
-        if len(history) < 2:
-            return [history[-1]] * self.future_steps if history else [0.0] * self.future_steps
-        
-        # Calcular mejoras recientes
-        improvements = [history[i] - history[i-1] for i in range(1, len(history))]
+        if len(self.recent) < 2:
+            return self._constant(self.recent[-1][1] if self.recent else None)
         
         # Promedio de las últimas mejoras
-        window = improvements[-self.window_size:] if len(improvements) >= self.window_size else improvements
-        avg_improvement = np.mean(window) if window else 0.0
+        (first_x, first_q), (last_x, last_q) = self.recent[0], self.recent[-1]
+        elapsed = last_x - first_x
+        avg_improvement = (last_q - first_q) / elapsed if elapsed > 0 else 0.0
         
         # Predecir valores futuros
         predictions = []
-        current = history[-1]
+        current = last_q
         for _ in range(self.future_steps):
             current = current + avg_improvement
-            predictions.append(float(np.clip(current, 0.0, 1.0)))
+            predictions.append(_clip_quality(current))
+        
+        return predictions
+    
+    def predict_batch(self, histories, lengths=None):
+        """
+        Promedio móvil de las mejoras para todo el lote: en cada fila basta
+        la última calidad y la de window_size pasos antes.
+        """
+        padded, lengths = pad_histories(histories, lengths)
+        rows = np.arange(len(padded))
+        last = _last_values(padded, lengths)
+        span = np.minimum(lengths, self.window_size + 1)
+        oldest = padded[rows, np.maximum(lengths - span, 0)]
+        fitted = span >= 2
+        avg_improvement = np.where(fitted, (last - oldest) / np.maximum(span - 1, 1), 0.0)
+        
+        steps = np.arange(1, self.future_steps + 1)
+        predictions = np.clip(last[:, np.newaxis] + avg_improvement[:, np.newaxis] * steps, 0.0, 1.0)
+        return np.where(fitted[:, np.newaxis], predictions, last[:, np.newaxis])
+
+
+class ProfilePredictor(StreamingPerformancePredictor):
+    """
+    Predictor basado en un perfil de performance aprendido offline
+    (PerformanceProfile) a partir de muchas ejecuciones del mismo algoritmo.
+    
+    En lugar de ajustar una curva con el historial de esta ejecución, busca
+    en la tabla la mejora esperada dada la calidad actual y el tick actual:
+    predict() es una consulta O(1) con interpolación, y no depende de que
+    haya pocas muestras al comienzo.
+    """
+    
+    def __init__(self, profile, future_steps=None, mmap=True):
+        """
+        Args:
+            profile: PerformanceProfile o ruta de un perfil guardado con save()
+            future_steps: Horizonte (None = el del perfil; no puede superarlo)
+            mmap: Al cargar desde una ruta, mapear la tabla en memoria
+        """
+        if isinstance(profile, str):
+            profile = PerformanceProfile.load(profile, mmap=mmap)
+        if future_steps is None:
+            future_steps = profile.future_steps
+        if future_steps > profile.future_steps:
+            raise ValueError(f"El perfil solo predice {profile.future_steps} pasos hacia adelante")
+        self.profile = profile
+        super().__init__(future_steps)
+    
+    def reset(self):
+        self.n = 0
+        self.last = None
+        self.last_x = None
+    
+    def update(self, q, t=None):
+        self.last_x = self._tick(t, self.n)
+        self.n += 1
+        self.last = q
+    
+    def _load(self, history):
+        self.n = history.count
+        self.last = history.last
+        if self._timed(history):
+            self.last_x = history.last_t / self.delta_t
+        else:
+            self.last_x = history.count - 1
+    
+    def _forecast(self):
+        """
+        Consulta la tabla en (calidad actual, tick actual).
+        """
+        if self.last is None:
+            return self._constant(None)
+        return self.profile.lookup(self.last, self.last_x)[:self.future_steps]
+    
+    def predict_batch(self, histories, lengths=None):
+        """Consulta la tabla para todo el lote en una sola indexación."""
+        padded, lengths = pad_histories(histories, lengths)
+        last = _last_values(padded, lengths)
+        predictions = self.profile.lookup_batch(last, lengths - 1)[:, :self.future_steps]
+        return np.where((lengths > 0)[:, np.newaxis], predictions, 0.0)
+
+
+class CurveFitPredictor(StreamingPerformancePredictor):
+    """
+    Predictor por ajuste de una curva de performance paramétrica a todo el
+    historial, por mínimos cuadrados no lineales (Levenberg-Marquardt),
+    como en el trabajo de Svegliato.
+    
+    Modelos (x = tick de la muestra):
+    - 'exponential': q(x) = a - b·exp(-c·x)
+    - 'power':       q(x) = a - b·(x + 1)^(-c)
+    
+    Para no frenar el loop de monitoreo, cada ajuste parte de los
+    parámetros del tick anterior y hace como máximo max_iterations
+    iteraciones; si no llegaron datos nuevos desde el último ajuste, se
+    reutiliza la predicción anterior. Se ajustan las últimas max_samples
+    muestras.
+    """
+    
+    MODELS = ('exponential', 'power')
+    
+    def __init__(self, future_steps=5, model='exponential', max_iterations=5,
+                 max_samples=256, tolerance=1e-10):
+        """
+        Args:
+            future_steps: Pasos futuros a predecir
+            model: 'exponential' o 'power'
+            max_iterations: Iteraciones del solver por tick
+            max_samples: Muestras recientes usadas en el ajuste
+            tolerance: Mejora relativa del error bajo la cual el ajuste se da por convergido
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Modelo desconocido: {model!r} (opciones: {self.MODELS})")
+        self.model = model
+        self.max_iterations = max_iterations
+        self.max_samples = max_samples
+        self.tolerance = tolerance
+        super().__init__(future_steps)
+    
+    def reset(self):
+        self.history = QualityHistory(max(2, self.max_samples))
+        self.params = None
+        self.damping = 1e-2
+        self.iterations = 0
+        self._offset = 0
+        self._fitted_count = 0
+        self._predictions = None
+    
+    def update(self, q, t=None):
+        # El historial interno guarda el tick de cada muestra como su instante
+        self.history.append(q, self._tick(t, self._offset + self.history.count))
+    
+    def _load(self, history):
+        # Se conservan los parámetros actuales como punto de partida
+        samples = self._samples_of(history, self.max_samples)
+        params, damping = self.params, self.damping
+        self.reset()
+        self.params, self.damping = params, damping
+        self._offset = history.count - len(samples)
+        for q, t in samples:
+            self.update(q, t)
+    
+    def _forecast(self):
+        """
+        Ajusta la curva si llegaron datos nuevos y la extrapola.
+        """
+        if self.history.count < 3:
+            return self._constant(self.history.last)
+        if self._fitted_count == self.history.count and self._predictions is not None:
+            return self._predictions
         
-        return predictions
\ No newline at end of file
+        x, y = self._samples()
+        if self.params is None:
+            self.params = self._initial_params(y)
+        self._fit(x, y)
+        self._fitted_count = self.history.count
+        
+        future_x = self.history.last_t + np.arange(1, self.future_steps + 1, dtype=np.float64)
+        predictions = np.clip(self._curve(future_x, self.params), 0.0, 1.0)
+        self._predictions = predictions.tolist()
+        return self._predictions
+    
+    def _samples(self):
+        return self.history.times(), self.history.window()
+    
+    def _initial_params(self, y):
+        a = min(1.0, float(y.max()) + 0.05)
+        b = max(a - float(y[0]), 1e-3)
+        c = 0.1 if self.model == 'exponential' else 0.5
+        return np.array([a, b, c])
+    
+    def _curve(self, x, params):
+        a, b, c = params
+        if self.model == 'exponential':
+            return a - b * np.exp(-c * x)
+        return a - b * (x + 1) ** -c
+    
+    def _jacobian(self, x, params):
+        a, b, c = params
+        if self.model == 'exponential':
+            decay = np.exp(-c * x)
+            return np.column_stack((np.ones_like(x), -decay, b * x * decay))
+        decay = (x + 1) ** -c
+        return np.column_stack((np.ones_like(x), -decay, b * np.log(x + 1) * decay))
+    
+    def _fit(self, x, y):
+        """
+        Hasta max_iterations iteraciones de Levenberg-Marquardt desde los
+        parámetros actuales. El sistema es de 3x3, así que cada iteración
+        es lineal en la cantidad de muestras.
+        """
+        params = self.params
+        residual = self._curve(x, params) - y
+        error = residual @ residual
+        for _ in range(self.max_iterations):
+            self.iterations += 1
+            J = self._jacobian(x, params)
+            JtJ = J.T @ J
+            gradient = J.T @ residual
+            try:
+                step = np.linalg.solve(JtJ + self.damping * np.diag(np.diag(JtJ) + 1e-12), -gradient)
+            except np.linalg.LinAlgError:
+                break
+            candidate = params + step
+            candidate[2] = max(candidate[2], 1e-6)  # la curva debe saturar
+            candidate_residual = self._curve(x, candidate) - y
+            candidate_error = candidate_residual @ candidate_residual
+            
+            if candidate_error < error:
+                converged = error - candidate_error <= self.tolerance * max(error, 1e-300)
+                params, residual, error = candidate, candidate_residual, candidate_error
+                self.damping = max(self.damping / 3, 1e-12)
+                if converged:
+                    break
+            else:
+                self.damping = min(self.damping * 2, 1e12)
+        self.params = params
@@ -0,0 +1,232 @@
+import os
+import numpy as np
+
+class PerformanceProfile:
+    """
+    Perfil de performance aprendido offline a partir de ejecuciones
+    grabadas de un algoritmo anytime.
+
+    Es una tabla precalculada sobre una grilla (calidad actual × tick):
+    para cada celda guarda la mejora esperada de calidad 1..future_steps
+    ticks más adelante. lookup() interpola bilinealmente entre las cuatro
+    celdas vecinas, así que su costo no depende del largo del historial.
+    """
+
+    # Arrays persistidos por save()/load()
+    _ARRAYS = ('deltas', 'counts', 'max_tick', 'name')
+
+    def __init__(self, deltas, counts=None, max_tick=100, name=''):
+        """
+        Args:
+            deltas: Array (quality_bins, time_bins, future_steps) de mejoras esperadas
+            counts: Peso de las muestras de cada celda (quality_bins, time_bins)
+            max_tick: Tick correspondiente a la última columna de la grilla
+            name: Nombre del algoritmo perfilado
+        """
+        deltas = np.asarray(deltas)
+        if deltas.ndim != 3 or deltas.shape[0] < 2 or deltas.shape[1] < 2:
+            raise ValueError("La tabla debe tener forma (quality_bins >= 2, time_bins >= 2, future_steps)")
+        self.deltas = deltas
+        self.counts = counts if counts is not None else np.ones(deltas.shape[:2])
+        self.max_tick = int(max_tick)
+        self.name = str(name)
+        self.quality_bins, self.time_bins, self.future_steps = deltas.shape
+        # Tabla como listas anidadas para lookup(), convertida en la primera consulta
+        self._rows = None
+
+    @classmethod
+    def fit(cls, runs, quality_bins=21, time_bins=21, future_steps=5, max_tick=None, name=''):
+        """
+        Aprende el perfil a partir de ejecuciones grabadas.
+
+        Args:
+            runs: Lista de historiales de calidad, uno por ejecución (una
+                  calidad por tick, como el history del meta-nivel)
+            quality_bins, time_bins: Puntos de la grilla en cada eje
+            future_steps: Horizonte de la predicción en ticks
+            max_tick: Tick de la última columna (None = la ejecución más larga)
+            name: Nombre del algoritmo perfilado
+        """
+        runs = [np.asarray(run, dtype=np.float64) for run in runs if len(run) > 0]
+        if not runs:
+            raise ValueError("Se necesita al menos una ejecución grabada")
+        if max_tick is None:
+            max_tick = max(len(run) for run in runs) - 1
+        max_tick = max(int(max_tick), 1)
+
+        # Muestras (q_t, t, q_{t+k} - q_t); al terminar la ejecución la
+        # calidad se mantiene en su último valor
+        qualities, ticks, futures = [], [], []
+        for run in runs:
+            padded = np.concatenate((run, np.full(future_steps, run[-1])))
+            offsets = np.arange(1, future_steps + 1)
+            index = np.arange(len(run))[:, np.newaxis] + offsets
+            qualities.append(run)
+            ticks.append(np.arange(len(run)))
+            futures.append(padded[index] - run[:, np.newaxis])
+        q = np.clip(np.concatenate(qualities), 0.0, 1.0)
+        t = np.concatenate(ticks)
+        future = np.concatenate(futures)
+
+        # Cada muestra se reparte entre sus cuatro celdas vecinas con los
+        # mismos pesos que usa la interpolación de lookup()
+        i0, wq = cls._axis(q * (quality_bins - 1), quality_bins)
+        j0, wt = cls._axis(np.minimum(t, max_tick) / max_tick * (time_bins - 1), time_bins)
+        sums = np.zeros((quality_bins, time_bins, future_steps))
+        counts = np.zeros((quality_bins, time_bins))
+        for di, w_i in ((0, 1 - wq), (1, wq)):
+            for dj, w_j in ((0, 1 - wt), (1, wt)):
+                w = w_i * w_j
+                np.add.at(counts, (i0 + di, j0 + dj), w)
+                np.add.at(sums, (i0 + di, j0 + dj), w[:, np.newaxis] * future)
+
+        observed = counts > 1e-9
+        deltas = np.zeros_like(sums)
+        deltas[observed] = sums[observed] / counts[observed][:, np.newaxis]
+        cls._fill_missing(deltas, observed)
+        return cls(deltas, counts, max_tick, name)
+
+    @staticmethod
+    def _axis(position, bins):
+        """Celda inferior y peso de la superior para posiciones en [0, bins-1]."""
+        position = np.clip(position, 0.0, bins - 1)
+        lower = np.minimum(np.floor(position).astype(np.int64), bins - 2)
+        return lower, position - lower
+
+    @staticmethod
+    def _fill_missing(deltas, observed):
+        """
+        Completa celdas sin muestras interpolando linealmente a lo largo del
+        tiempo y, para calidades sin ninguna muestra, a lo largo de la calidad.
+        """
+        quality_bins, time_bins, future_steps = deltas.shape
+        columns = np.arange(time_bins)
+        rows_observed = observed.any(axis=1)
+        for i in np.flatnonzero(rows_observed):
+            known = np.flatnonzero(observed[i])
+            for k in range(future_steps):
+                deltas[i, :, k] = np.interp(columns, known, deltas[i, known, k])
+
+        known_rows = np.flatnonzero(rows_observed)
+        if len(known_rows) == 0:
+            return
+        rows = np.arange(quality_bins)
+        for j in range(time_bins):
+            for k in range(future_steps):
+                deltas[:, j, k] = np.interp(rows, known_rows, deltas[known_rows, j, k])
+
+    def lookup(self, quality, tick):
+        """
+        Calidades esperadas 1..future_steps ticks después de observar
+        quality en el tick dado, como lista. O(future_steps), independiente
+        del historial y en Python puro: para una consulta escalar, indexar
+        arrays de NumPy cuesta más que la interpolación misma.
+        """
+        rows = self._rows
+        if rows is None:
+            rows = self._rows = self.deltas.tolist()
+        fq = min(max(quality, 0.0), 1.0) * (self.quality_bins - 1)
+        ft = min(max(tick, 0), self.max_tick) / self.max_tick * (self.time_bins - 1)
+        i = min(int(fq), self.quality_bins - 2)
+        j = min(int(ft), self.time_bins - 2)
+        wq = fq - i
+        wt = ft - j
+
+        w00 = (1 - wq) * (1 - wt)
+        w01 = (1 - wq) * wt
+        w10 = wq * (1 - wt)
+        w11 = wq * wt
+        lower, upper = rows[i], rows[i + 1]
+        expected = []
+        for d00, d01, d10, d11 in zip(lower[j], lower[j + 1], upper[j], upper[j + 1]):
+            q = quality + w00 * d00 + w01 * d01 + w10 * d10 + w11 * d11
+            expected.append(0.0 if q < 0.0 else 1.0 if q > 1.0 else q)
+        return expected
+
+    def lookup_batch(self, qualities, ticks):
+        """
+        lookup() vectorizado: calidades esperadas para arrays de calidades
+        y ticks, con forma (lote, future_steps).
+        """
+        qualities = np.clip(np.asarray(qualities, dtype=np.float64), 0.0, 1.0)
+        ticks = np.clip(np.asarray(ticks, dtype=np.float64), 0, self.max_tick)
+        i, wq = self._axis(qualities * (self.quality_bins - 1), self.quality_bins)
+        j, wt = self._axis(ticks / self.max_tick * (self.time_bins - 1), self.time_bins)
+        wq = wq[:, np.newaxis]
+        wt = wt[:, np.newaxis]
+
+        d = self.deltas
+        delta = ((1 - wq) * ((1 - wt) * d[i, j] + wt * d[i, j + 1])
+                 + wq * ((1 - wt) * d[i + 1, j] + wt * d[i + 1, j + 1]))
+        return np.clip(qualities[:, np.newaxis] + delta, 0.0, 1.0)
+
+    def save(self, path):
+        """
+        Guarda el perfil. Si path termina en '.npz' se escribe un único
+        archivo; si no, un directorio con un .npy por array, que load()
+        puede mapear en memoria.
+        """
+        arrays = {
+            'deltas': self.deltas,
+            'counts': self.counts,
+            'max_tick': np.array(self.max_tick),
+            'name': np.array(self.name),
+        }
+        if path.endswith('.npz'):
+            np.savez(path, **arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for key, array in arrays.items():
+            np.save(os.path.join(path, f"{key}.npy"), array)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Carga un perfil guardado con save(). Desde un directorio, con
+        mmap=True la tabla se mapea en memoria en lugar de leerse.
+        """
+        if path.endswith('.npz'):
+            with np.load(path) as archive:
+                arrays = {key: archive[key] for key in cls._ARRAYS}
+        else:
+            arrays = {}
+            for key in cls._ARRAYS:
+                mode = 'r' if mmap and key in ('deltas', 'counts') else None
+                arrays[key] = np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mode)
+        return cls(arrays['deltas'], arrays['counts'], int(arrays['max_tick']), str(arrays['name']))
+
+    def __repr__(self):
+        return (f"PerformanceProfile({self.name or 'anonymous'}, "
+                f"{self.quality_bins}x{self.time_bins}, horizon={self.future_steps})")
+
+
+def record_runs(make_algorithm, runs=10, delta_t=0.1, max_ticks=100):
+    """
+    Graba historiales de calidad ejecutando un algoritmo varias veces,
+    muestreando como el meta-nivel: una calidad cada delta_t segundos.
+
+    Args:
+        make_algorithm: Función sin argumentos que crea un AnytimeAlgorithm nuevo
+        runs: Cantidad de ejecuciones
+        delta_t: Intervalo de muestreo en segundos
+        max_ticks: Muestras máximas por ejecución
+
+    Returns:
+        list: Un historial de calidades por ejecución
+    """
+    histories = []
+    for run in range(runs):
+        algorithm = make_algorithm()
+        algorithm.start()
+        history = []
+        try:
+            while len(history) < max_ticks:
+                history.append(algorithm.current_solution().quality())
+                if not algorithm.running():
+                    break
+                algorithm.clock.sleep(delta_t)
+        finally:
+            algorithm.stop()
+        histories.append(history)
+        print(f"[Profile] Recorded run {run + 1}/{runs}: {len(history)} samples")
+    return histories
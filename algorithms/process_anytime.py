@@ -0,0 +1,346 @@
+import time
+import pickle
+import struct
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+
+# Estados del proceso de trabajo publicados en el slot compartido
+WORKER_RUNNING = 0
+WORKER_FINISHED = 1
+WORKER_FAILED = 2
+
+
+class SharedSolutionSlot:
+    """
+    Slot de memoria compartida con la solución actual de un proceso de trabajo.
+    
+    Distribución: [seq | estado | calidad | versión | timestamp | largo del payload | payload].
+    El escritor (único) sigue un protocolo seqlock: seq es impar mientras
+    escribe. Los lectores reintentan si seq cambió o era impar, de modo que
+    nunca bloquean al escritor y nunca ven una solución a medio escribir.
+    """
+    
+    _SEQ = struct.Struct('<Q')
+    _FIELDS = struct.Struct('<QdQdQ')
+    HEADER_SIZE = _SEQ.size + _FIELDS.size
+    
+    def __init__(self, capacity, name=None):
+        """
+        Args:
+            capacity: Bytes reservados para el payload serializado
+            name: Nombre de un slot existente (None = crear uno nuevo)
+        """
+        self.capacity = capacity
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.HEADER_SIZE + capacity)
+            self._shm.buf[:self.HEADER_SIZE] = bytes(self.HEADER_SIZE)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+    
+    def publish(self, quality, version, payload, state=WORKER_RUNNING, timestamp=None):
+        """
+        Publica una solución (solo desde el proceso escritor). timestamp es
+        el instante de publicación (None = time.monotonic() ahora).
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if len(payload) > self.capacity:
+            raise ValueError(
+                f"El payload de la solución ({len(payload)} bytes) excede "
+                f"la capacidad del slot ({self.capacity} bytes)"
+            )
+        buf = self._shm.buf
+        seq = self._SEQ.unpack_from(buf, 0)[0]
+        self._SEQ.pack_into(buf, 0, seq + 1)
+        end = self.HEADER_SIZE + len(payload)
+        buf[self.HEADER_SIZE:end] = payload
+        self._FIELDS.pack_into(buf, self._SEQ.size, state, quality, version, timestamp, len(payload))
+        self._SEQ.pack_into(buf, 0, seq + 2)
+    
+    def set_state(self, state):
+        """Actualiza solo el estado del proceso de trabajo."""
+        buf = self._shm.buf
+        seq = self._SEQ.unpack_from(buf, 0)[0]
+        self._SEQ.pack_into(buf, 0, seq + 1)
+        struct.pack_into('<Q', buf, self._SEQ.size, state)
+        self._SEQ.pack_into(buf, 0, seq + 2)
+    
+    def read_header(self):
+        """
+        Lee (estado, calidad, versión) sin tocar el payload.
+        
+        Returns:
+            tuple: (state, quality, version)
+        """
+        buf = self._shm.buf
+        while True:
+            seq = self._SEQ.unpack_from(buf, 0)[0]
+            if seq & 1:
+                continue
+            state, quality, version, _, _ = self._FIELDS.unpack_from(buf, self._SEQ.size)
+            if self._SEQ.unpack_from(buf, 0)[0] == seq:
+                return state, quality, version
+    
+    def read(self):
+        """
+        Lee una copia consistente de la solución publicada.
+        
+        Returns:
+            tuple: (state, quality, version, timestamp, payload)
+        """
+        buf = self._shm.buf
+        while True:
+            seq = self._SEQ.unpack_from(buf, 0)[0]
+            if seq & 1:
+                continue
+            state, quality, version, timestamp, length = self._FIELDS.unpack_from(buf, self._SEQ.size)
+            payload = bytes(buf[self.HEADER_SIZE:self.HEADER_SIZE + length])
+            if self._SEQ.unpack_from(buf, 0)[0] == seq:
+                return state, quality, version, timestamp, payload
+    
+    def close(self):
+        self._shm.close()
+    
+    def unlink(self):
+        self._shm.unlink()
+
+
+def _worker_main(algorithm, slot_name, capacity, stop_event, update_event, resume_event,
+                 checkpoint_conn):
+    """
+    Punto de entrada del proceso de trabajo: ejecuta el loop de pasos del
+    algoritmo y publica cada nueva solución en el slot compartido. Al
+    terminar envía un checkpoint del algoritmo por checkpoint_conn (vacío
+    si falló), antes de marcar el estado final en el slot.
+    """
+    slot = SharedSolutionSlot(capacity, name=slot_name)
+    state = WORKER_FAILED
+    
+    def publish():
+        solution = algorithm.current_solution()
+        payload = pickle.dumps((solution.data, solution.payload), protocol=pickle.HIGHEST_PROTOCOL)
+        slot.publish(solution.quality(), algorithm.solution_version(), payload,
+                     timestamp=solution.timestamp)
+        update_event.set()
+        return algorithm.solution_version()
+    
+    try:
+        algorithm._running = True
+        algorithm._publish_first_solution()
+        published = publish()
+        state = WORKER_RUNNING
+        while not stop_event.is_set():
+            if not resume_event.is_set():
+                resume_event.wait()
+                continue
+            can_continue = algorithm.compute_step()
+            if algorithm.solution_version() != published:
+                published = publish()
+            if not can_continue:
+                state = WORKER_FINISHED
+                break
+        else:
+            state = WORKER_FINISHED
+    except BaseException:
+        state = WORKER_FAILED
+        raise
+    finally:
+        algorithm._running = False
+        checkpoint_conn.send_bytes(algorithm.snapshot() if state != WORKER_FAILED else b'')
+        checkpoint_conn.close()
+        slot.set_state(state)
+        update_event.set()
+        slot.close()
+
+
+class ProcessAnytimeAlgorithm(AnytimeAlgorithm):
+    """
+    Ejecuta un AnytimeAlgorithm en un proceso de trabajo separado, fuera del
+    GIL del meta-nivel.
+    
+    El proceso publica la calidad y el payload serializado de cada nueva
+    solución en memoria compartida. El monitor lee la calidad y la versión
+    directamente del slot y solo deserializa el payload cuando la versión
+    cambia.
+    """
+    
+    supports_virtual_clock = False
+    
+    def __init__(self, algorithm, payload_capacity=1 << 16, start_method=None):
+        """
+        Args:
+            algorithm: Instancia de AnytimeAlgorithm a ejecutar en el proceso
+            payload_capacity: Bytes reservados para el payload serializado
+            start_method: Método de inicio de multiprocessing (None = por defecto)
+        """
+        super().__init__()
+        self.algorithm = algorithm
+        self.payload_capacity = payload_capacity
+        self._context = mp.get_context(start_method)
+        self._process = None
+        self._slot = None
+        self._stop_event = None
+        self._update_event = None
+        self._cached_version = 0
+        self._checkpoint_conn = None
+        self._checkpoint = None
+        self._resume_event = self._context.Event()
+        self._resume_event.set()
+        # True si la última ejecución terminó por un error o porque el
+        # proceso de trabajo murió, no por completarse
+        self.failed = False
+    
+    def compute_step(self):
+        return self.algorithm.compute_step()
+    
+    def initial_solution(self):
+        return self.algorithm.initial_solution()
+    
+    def start(self):
+        """Inicia el algoritmo en un proceso de trabajo."""
+        if self._running:
+            return
+        
+        self._slot = SharedSolutionSlot(self.payload_capacity)
+        self._stop_event = self._context.Event()
+        self._update_event = self._context.Event()
+        self._current_solution = None
+        self._cached_version = 0
+        self._checkpoint = None
+        self.failed = False
+        self._checkpoint_conn, sender = self._context.Pipe(duplex=False)
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self.algorithm, self._slot.name, self.payload_capacity,
+                  self._stop_event, self._update_event, self._resume_event, sender),
+            daemon=True
+        )
+        self._running = True
+        self._process.start()
+        sender.close()
+        print(f"[Anytime] Algorithm started in worker process (pid={self._process.pid})")
+    
+    def stop(self):
+        """Detiene el proceso de trabajo y conserva la última solución."""
+        if self._running:
+            self._running = False
+            self._stop_event.set()
+            self._resume_event.set()
+            self._join_worker(timeout=1.0)
+            if self._process.is_alive():
+                # El paso en curso no terminó a tiempo: se fuerza la salida
+                self._process.terminate()
+                self._process.join()
+            self._release()
+            print(f"[Anytime] Algorithm stopped by meta-level")
+    
+    def running(self):
+        """Retorna True mientras el proceso de trabajo siga ejecutando pasos."""
+        if not self._running:
+            return False
+        state, _, _ = self._slot.read_header()
+        if state == WORKER_RUNNING and self._process.is_alive():
+            return True
+        self._running = False
+        self._join_worker(timeout=1.0)
+        # El proceso escribe el estado final antes de salir: si sigue en
+        # WORKER_RUNNING, murió sin terminar (por ejemplo, forzado)
+        state, _, _ = self._slot.read_header()
+        self.failed = state != WORKER_FINISHED
+        self._release()
+        if self.failed:
+            print(f"[Anytime] Algorithm failed in worker process (exit code {self._process.exitcode})")
+        else:
+            print(f"[Anytime] Algorithm completed naturally")
+        return False
+    
+    def current_solution(self):
+        """
+        Retorna la solución actual; el payload solo se deserializa cuando
+        el proceso publicó una versión nueva.
+        """
+        if self._slot is None:
+            return self._current_solution
+        _, _, version = self._slot.read_header()
+        if version != self._cached_version:
+            _, quality, version, timestamp, payload = self._slot.read()
+            data, array = pickle.loads(payload)
+            solution = Solution(data, quality, array)
+            solution.version = version
+            solution.timestamp = timestamp
+            self._current_solution = solution
+            self._cached_version = version
+        return self._current_solution
+    
+    def solution_version(self):
+        if self._slot is None:
+            return self._cached_version
+        return self._slot.read_header()[2]
+    
+    def wait_for_update(self, last_version, timeout=None):
+        """Espera una publicación del proceso de trabajo (ver AnytimeAlgorithm)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._update_event.clear()
+            version = self.solution_version()
+            if version != last_version or not self.running():
+                return version
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return version
+            self._update_event.wait(remaining)
+    
+    def snapshot(self):
+        """
+        Checkpoint del algoritmo. Su estado vive en el proceso de trabajo,
+        que lo envía al terminar: solo está disponible sin ejecución en curso.
+        """
+        if self._running:
+            raise RuntimeError("El estado está en el proceso de trabajo: usar suspend() o stop() antes de snapshot()")
+        if self._checkpoint:
+            return self._checkpoint
+        return self.algorithm.snapshot()
+    
+    def restore(self, checkpoint):
+        """Carga un checkpoint; el siguiente start() reanuda desde él en un proceso nuevo."""
+        if self._running:
+            raise RuntimeError("No se puede restaurar un algoritmo en ejecución")
+        self.algorithm.restore(checkpoint)
+        self._checkpoint = None
+        return self
+    
+    def _join_worker(self, timeout):
+        """
+        Recibe el checkpoint y espera al proceso de trabajo, ambos dentro
+        del mismo plazo de timeout segundos.
+        """
+        deadline = time.monotonic() + timeout
+        # El checkpoint se recibe antes del join: un envío grande bloquea
+        # al proceso hasta que alguien lo lea
+        self._receive_checkpoint(timeout)
+        self._process.join(timeout=max(deadline - time.monotonic(), 0.0))
+    
+    def _receive_checkpoint(self, timeout):
+        if self._checkpoint_conn is None:
+            return
+        try:
+            # Si el proceso ya terminó, su extremo está cerrado y poll()
+            # retorna enseguida (con el checkpoint o con EOF)
+            if self._checkpoint_conn.poll(timeout):
+                self._checkpoint = self._checkpoint_conn.recv_bytes() or None
+        except EOFError:
+            # El proceso terminó sin enviarlo (por ejemplo, forzado)
+            pass
+        self._checkpoint_conn.close()
+        self._checkpoint_conn = None
+    
+    def _release(self):
+        """Toma la solución final del slot y libera la memoria compartida."""
+        if self._slot is None:
+            return
+        self.current_solution()
+        self._slot.close()
+        self._slot.unlink()
+        self._slot = None
@@ -0,0 +1,207 @@
+import numpy as np
+
+class QualityHistory:
+    """
+    Historial de calidades ~h acotado en memoria.
+
+    Las últimas `capacity` calidades se guardan en un buffer circular de
+    float64 preasignado y espejado (cada muestra se escribe dos veces), de
+    modo que la ventana reciente es siempre un tramo contiguo y window()
+    retorna una vista de NumPy sin copiar.
+
+    Sobre todas las muestras observadas se mantienen estadísticas corrientes
+    (cantidad, Σq, Σx·q con x = índice de la muestra, primera y última
+    calidad, mínimo y máximo). Las muestras que salen del buffer se
+    resumen en promedios por bloques; cuando el resumen se llena, los
+    bloques vecinos se fusionan de a pares, así que su tamaño también es
+    acotado y cubre la ejecución completa con resolución decreciente.
+
+    Opcionalmente cada calidad lleva el instante t en que se observó (o
+    publicó), en un segundo buffer espejado: times() retorna la ventana de
+    tiempos alineada con window(). Las muestras con instante suman además
+    sus propias estadísticas (cantidad, Σt, Σt², Σt·q, primer y último t),
+    para que un predictor pueda usar el tiempo transcurrido como eje.
+
+    Como secuencia (len, índices, iteración) expone la ventana reciente,
+    para predictores que esperan una lista.
+    """
+
+    def __init__(self, capacity=1024, summary_capacity=256):
+        """
+        Args:
+            capacity: Muestras recientes guardadas completas
+            summary_capacity: Bloques máximos del resumen de muestras viejas (par)
+        """
+        if capacity < 2:
+            raise ValueError("La capacidad del historial debe ser al menos 2")
+        if summary_capacity < 2 or summary_capacity % 2:
+            raise ValueError("La capacidad del resumen debe ser un número par >= 2")
+        self.capacity = capacity
+        self.summary_capacity = summary_capacity
+        self._data = np.zeros(2 * capacity)
+        self._times = np.empty(2 * capacity)
+        self._summary_ticks = np.zeros(summary_capacity)
+        self._summary_values = np.zeros(summary_capacity)
+        self.clear()
+
+    def clear(self):
+        """Descarta todas las muestras."""
+        self._pos = 0
+        self._stored = 0
+        self.count = 0
+        self.sum = 0.0
+        self.sum_xy = 0.0
+        self.first = None
+        self.last = None
+        self.min = None
+        self.max = None
+        self.last_delta = 0.0
+        self._has_times = False
+        self._times.fill(np.nan)
+        # Estadísticas de las muestras con instante
+        self.timed = 0
+        self.sum_t = 0.0
+        self.sum_tt = 0.0
+        self.sum_tq = 0.0
+        self.first_t = None
+        self.last_t = None
+        # Resumen: bloques completos y el bloque en formación
+        self._summary_size = 0
+        self._bucket_size = 1
+        self._bucket_sum = 0.0
+        self._bucket_ticks = 0.0
+        self._bucket_count = 0
+
+    def append(self, q, t=None):
+        """
+        Agrega una calidad observada, opcionalmente con su instante t. O(1).
+        """
+        q = float(q)
+        if self._stored == self.capacity:
+            # La muestra más vieja sale del buffer hacia el resumen
+            self._summarize(self._data[self._pos], self.count - self.capacity)
+        else:
+            self._stored += 1
+        self._data[self._pos] = q
+        self._data[self._pos + self.capacity] = q
+        if t is not None:
+            t = float(t)
+            if self.timed == 0:
+                self.first_t = t
+            self.timed += 1
+            self.sum_t += t
+            self.sum_tt += t * t
+            self.sum_tq += t * q
+            self.last_t = t
+        if t is not None or self._has_times:
+            self._has_times = True
+            t = np.nan if t is None else t
+            self._times[self._pos] = t
+            self._times[self._pos + self.capacity] = t
+        self._pos = (self._pos + 1) % self.capacity
+
+        if self.count == 0:
+            self.first = self.min = self.max = q
+        else:
+            self.last_delta = q - self.last
+            if q < self.min:
+                self.min = q
+            elif q > self.max:
+                self.max = q
+        self.sum_xy += self.count * q
+        self.sum += q
+        self.count += 1
+        self.last = q
+
+    def window(self, k=None):
+        """
+        Vista de solo lectura (sin copia) de las últimas k calidades, de la
+        más vieja a la más nueva (None = todo el buffer).
+        """
+        k = self._stored if k is None else min(k, self._stored)
+        end = self._pos + self.capacity
+        view = self._data[end - k:end]
+        view.flags.writeable = False
+        return view
+
+    def times(self, k=None):
+        """
+        Vista de solo lectura de los instantes de las últimas k calidades,
+        alineada con window(k) (NaN donde no se informó t).
+        """
+        k = self._stored if k is None else min(k, self._stored)
+        end = self._pos + self.capacity
+        view = self._times[end - k:end]
+        view.flags.writeable = False
+        return view
+
+    def delta(self, k=1):
+        """Mejora en los últimos k pasos: q_n - q_{n-k} (dentro del buffer)."""
+        if self.count < 2:
+            return 0.0
+        k = min(k, self._stored - 1)
+        end = self._pos + self.capacity
+        return float(self._data[end - 1] - self._data[end - 1 - k])
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self):
+        """
+        Resumen de las muestras que ya salieron del buffer.
+
+        Returns:
+            tuple: (ticks, calidades) como arrays: tick medio y calidad media
+                   de cada bloque, en orden cronológico (el último bloque
+                   puede estar incompleto)
+        """
+        size = self._summary_size
+        ticks = self._summary_ticks[:size]
+        values = self._summary_values[:size]
+        if self._bucket_count:
+            ticks = np.append(ticks, self._bucket_ticks / self._bucket_count)
+            values = np.append(values, self._bucket_sum / self._bucket_count)
+        return ticks.copy(), values.copy()
+
+    def _summarize(self, q, tick):
+        self._bucket_sum += q
+        self._bucket_ticks += tick
+        self._bucket_count += 1
+        if self._bucket_count < self._bucket_size:
+            return
+
+        if self._summary_size == self.summary_capacity:
+            # Fusionar bloques vecinos de a pares: la mitad de bloques, del doble de tamaño
+            half = self.summary_capacity // 2
+            for values in (self._summary_ticks, self._summary_values):
+                values[:half] = (values[0::2] + values[1::2]) / 2
+            self._summary_size = half
+            self._bucket_size *= 2
+            if self._bucket_count < self._bucket_size:
+                return
+
+        self._summary_ticks[self._summary_size] = self._bucket_ticks / self._bucket_count
+        self._summary_values[self._summary_size] = self._bucket_sum / self._bucket_count
+        self._summary_size += 1
+        self._bucket_sum = 0.0
+        self._bucket_ticks = 0.0
+        self._bucket_count = 0
+
+    # Interfaz de secuencia sobre la ventana reciente
+
+    def __len__(self):
+        return self._stored
+
+    def __getitem__(self, index):
+        window = self.window()
+        return window[index] if isinstance(index, slice) else float(window[index])
+
+    def __iter__(self):
+        return iter(self.window().tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.window(), dtype=dtype)
+
+    def __repr__(self):
+        return f"QualityHistory(count={self.count}, stored={self._stored}, last={self.last})"
@@ -0,0 +1,626 @@
+import time
+import queue
+import pickle
+import socket
+import struct
+import itertools
+import threading
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+import numpy as np
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+
+# Protocolo entre el meta-nivel (cliente) y un nodo que ejecuta algoritmos
+# anytime. Cada mensaje es [tipo: u8 | run: u32 | cuerpo].
+_FRAME = struct.Struct('<BI')
+
+# Cliente -> nodo
+MSG_START = 1            # cuerpo: [modo: u8 | algoritmo serializado o checkpoint]
+MSG_STOP = 2
+MSG_PAUSE = 3
+MSG_RESUME = 4
+MSG_CHECKPOINT = 5
+MSG_FETCH = 6            # cuerpo: FETCH_REQUEST
+
+# Nodo -> cliente
+MSG_UPDATES = 16         # cuerpo: registros UPDATE_DTYPE de varias ejecuciones
+MSG_FINISHED = 17        # cuerpo: versión final (u64)
+MSG_CHECKPOINT_DATA = 18
+MSG_SOLUTION = 19
+MSG_ERROR = 20
+
+START_FRESH = 0
+START_CHECKPOINT = 1
+
+# Pedido de una solución completa: versión (0 = la actual) y si el nodo
+# puede olvidar la ejecución después de responder (estado final ya leído)
+FETCH_REQUEST = struct.Struct('<IB')
+
+# Actualización de calidad: 20 bytes por registro, muchas por mensaje. La
+# calidad viaja en float64, igual que en la solución del nodo
+UPDATE_DTYPE = np.dtype([('run', '<u4'), ('version', '<u4'), ('t', '<f4'), ('quality', '<f8')])
+
+
+def encode_message(kind, run, body=b''):
+    return _FRAME.pack(kind, run) + body
+
+
+def decode_message(message):
+    """Returns: tuple (tipo, run, cuerpo como memoryview)."""
+    kind, run = _FRAME.unpack_from(message)
+    return kind, run, memoryview(message)[_FRAME.size:]
+
+
+class Transport(ABC):
+    """
+    Canal bidireccional de mensajes (bytes) entre un cliente y un nodo.
+    send() puede llamarse desde varios threads.
+    """
+
+    @abstractmethod
+    def send(self, message):
+        pass
+
+    @abstractmethod
+    def recv(self):
+        """Bloquea hasta el próximo mensaje; None si el canal se cerró."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class SocketTransport(Transport):
+    """
+    Transporte sobre un socket de flujo (Unix o TCP local): cada mensaje
+    va precedido de su largo (u32).
+    """
+
+    _LENGTH = struct.Struct('<I')
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._send_lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, address):
+        """
+        Args:
+            address: Ruta de un socket Unix o tupla (host, puerto)
+        """
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(address)
+        return cls(sock)
+
+    @staticmethod
+    def listen(address, backlog=16):
+        """Socket de escucha en una ruta Unix o en (host, puerto)."""
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(address)
+        server.listen(backlog)
+        return server
+
+    @classmethod
+    def pair(cls):
+        """Dos extremos conectados por socketpair(), en el mismo proceso."""
+        a, b = socket.socketpair()
+        return cls(a), cls(b)
+
+    def send(self, message):
+        with self._send_lock:
+            self.sock.sendall(self._LENGTH.pack(len(message)) + message)
+
+    def recv(self):
+        header = self._read(self._LENGTH.size)
+        if header is None:
+            return None
+        return self._read(self._LENGTH.unpack(header)[0])
+
+    def _read(self, size):
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            try:
+                count = self.sock.recv_into(view[received:])
+            except OSError:
+                return None
+            if count == 0:
+                return None
+            received += count
+        return bytes(buffer)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class LoopbackTransport(Transport):
+    """
+    Transporte en memoria para pruebas: dos colas, sin sockets ni
+    serialización de red. Cuenta los bytes enviados.
+    """
+
+    def __init__(self, incoming, outgoing):
+        self._incoming = incoming
+        self._outgoing = outgoing
+        self.bytes_sent = 0
+        self.messages_sent = 0
+
+    @classmethod
+    def pair(cls):
+        a, b = queue.Queue(), queue.Queue()
+        return cls(a, b), cls(b, a)
+
+    def send(self, message):
+        self.bytes_sent += len(message)
+        self.messages_sent += 1
+        self._outgoing.put(bytes(message))
+
+    def recv(self):
+        return self._incoming.get()
+
+    def close(self):
+        # Despierta a los dos extremos
+        self._outgoing.put(None)
+        self._incoming.put(None)
+
+
+class _HostedRun:
+    """Una ejecución alojada en un nodo y lo último enviado al cliente."""
+
+    def __init__(self, algorithm, keep_versions):
+        self.algorithm = algorithm
+        self.start_time = time.monotonic()
+        self.sent_version = None
+        # Últimas soluciones enviadas, para servir su data a pedido
+        self.reported = OrderedDict()
+        self.keep_versions = keep_versions
+        self.finished = False
+
+    def report(self, solution):
+        self.sent_version = solution.version
+        self.reported[solution.version] = solution
+        if len(self.reported) > self.keep_versions:
+            self.reported.popitem(last=False)
+
+    def solution(self, version):
+        """Solución de la versión pedida (0 = la actual), si todavía se conserva."""
+        current = self.algorithm.current_solution()
+        if version == 0 or (current is not None and current.version == version):
+            return current
+        solution = self.reported.get(version)
+        if solution is None:
+            raise ValueError(f"La versión {version} ya no está disponible en el nodo")
+        return solution
+
+
+class WorkerNode:
+    """
+    Nodo que ejecuta algoritmos anytime para meta-niveles remotos.
+
+    Atiende los comandos de un transporte (start, stop, pause, resume,
+    checkpoint, fetch) y empuja las actualizaciones de calidad: cada
+    flush_interval segundos recorre las ejecuciones y envía, en un único
+    mensaje, un registro (run, versión, t, calidad) por cada ejecución cuya
+    solución cambió. Las versiones intermedias entre dos recorridos se
+    combinan en la última. Los payloads de las soluciones solo viajan
+    cuando el cliente los pide, por versión: el nodo conserva las últimas
+    versiones enviadas hasta que el cliente lee el estado final, y
+    entonces olvida la ejecución.
+
+    Los algoritmos y checkpoints llegan serializados con pickle: el nodo
+    solo debe aceptar conexiones de meta-niveles de confianza.
+    """
+
+    def __init__(self, transport, flush_interval=0.05, batch_size=4096, keep_versions=64):
+        """
+        Args:
+            transport: Transport conectado al cliente
+            flush_interval: Segundos entre envíos de actualizaciones
+            batch_size: Registros máximos por mensaje de actualizaciones
+            keep_versions: Soluciones enviadas que se conservan por ejecución
+                           para que el cliente pueda pedir su data
+        """
+        self.transport = transport
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.keep_versions = keep_versions
+        self.runs = {}
+        self._runs_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    @classmethod
+    def serve(cls, address, **kwargs):
+        """
+        Escucha en address y atiende cada conexión con un WorkerNode en su
+        propio thread (bloquea).
+        """
+        server = SocketTransport.listen(address)
+        print(f"[Node] Serving anytime algorithms on {address}")
+        try:
+            while True:
+                connection, _ = server.accept()
+                node = cls(SocketTransport(connection), **kwargs)
+                threading.Thread(target=node.run, daemon=True).start()
+        finally:
+            server.close()
+
+    def run(self):
+        """Atiende comandos hasta que el cliente cierra el transporte."""
+        publisher = threading.Thread(target=self._publish_loop, daemon=True)
+        publisher.start()
+        try:
+            while True:
+                message = self.transport.recv()
+                if message is None:
+                    break
+                kind, run, body = decode_message(message)
+                try:
+                    self._handle(kind, run, body)
+                except Exception as error:
+                    self.transport.send(encode_message(MSG_ERROR, run, repr(error).encode()))
+        finally:
+            self._closed.set()
+            publisher.join()
+            with self._runs_lock:
+                hosted = list(self.runs.values())
+            for entry in hosted:
+                entry.algorithm.stop()
+            self.transport.close()
+
+    def _handle(self, kind, run, body):
+        if kind == MSG_START:
+            mode = body[0]
+            if mode == START_CHECKPOINT:
+                algorithm = AnytimeAlgorithm.from_snapshot(bytes(body[1:]))
+            else:
+                algorithm = pickle.loads(body[1:])
+            entry = _HostedRun(algorithm, self.keep_versions)
+            with self._runs_lock:
+                self.runs[run] = entry
+            algorithm.start()
+            return
+
+        entry = self.runs.get(run)
+        if entry is None:
+            raise ValueError(f"Ejecución desconocida: {run}")
+        algorithm = entry.algorithm
+        if kind == MSG_STOP:
+            algorithm.stop()
+        elif kind == MSG_PAUSE:
+            algorithm.pause()
+        elif kind == MSG_RESUME:
+            algorithm.resume()
+        elif kind == MSG_CHECKPOINT:
+            self.transport.send(encode_message(MSG_CHECKPOINT_DATA, run, algorithm.snapshot()))
+        elif kind == MSG_FETCH:
+            version, release = FETCH_REQUEST.unpack(body)
+            solution = entry.solution(version)
+            payload = pickle.dumps((solution.data, solution.quality(), solution.version,
+                                    solution.payload), protocol=pickle.HIGHEST_PROTOCOL)
+            self.transport.send(encode_message(MSG_SOLUTION, run, payload))
+            if release:
+                # El cliente ya tiene el estado final: la ejecución se descarta
+                algorithm.stop()
+                with self._runs_lock:
+                    del self.runs[run]
+        else:
+            raise ValueError(f"Tipo de mensaje desconocido: {kind}")
+
+    def _publish_loop(self):
+        records = np.zeros(self.batch_size, dtype=UPDATE_DTYPE)
+        while not self._closed.wait(self.flush_interval):
+            with self._runs_lock:
+                hosted = list(self.runs.items())
+            count = 0
+            finished = []
+            for run, entry in hosted:
+                if entry.finished:
+                    continue
+                algorithm = entry.algorithm
+                # running() antes de leer la solución: si ya terminó, la
+                # solución leída es la final
+                running = algorithm.running()
+                solution = algorithm.current_solution()
+                if solution is not None and solution.version != entry.sent_version:
+                    entry.report(solution)
+                    timestamp = solution.timestamp or time.monotonic()
+                    records[count] = (run, solution.version, timestamp - entry.start_time,
+                                      solution.quality())
+                    count += 1
+                    if count == self.batch_size:
+                        self.transport.send(encode_message(MSG_UPDATES, 0, records.tobytes()))
+                        count = 0
+                if not running:
+                    entry.finished = True
+                    finished.append((run, solution.version if solution is not None else 0))
+            if count:
+                self.transport.send(encode_message(MSG_UPDATES, 0, records[:count].tobytes()))
+            # Después de las actualizaciones, para que la última llegue antes
+            for run, version in finished:
+                self.transport.send(encode_message(MSG_FINISHED, run, struct.pack('<Q', version)))
+
+
+class RemoteNode:
+    """
+    Conexión del meta-nivel con un WorkerNode: reparte las actualizaciones
+    recibidas entre sus RemoteAnytimeAlgorithm.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self._runs = {}
+        self._ids = itertools.count(1)
+        self.updates_received = 0
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def connect(cls, address):
+        return cls(SocketTransport.connect(address))
+
+    def close(self):
+        self.transport.close()
+        self._reader.join(timeout=1.0)
+
+    def _register(self, remote):
+        run = next(self._ids)
+        self._runs[run] = remote
+        return run
+
+    def _send(self, kind, run, body=b''):
+        self.transport.send(encode_message(kind, run, body))
+
+    def _read_loop(self):
+        while True:
+            message = self.transport.recv()
+            if message is None:
+                break
+            kind, run, body = decode_message(message)
+            if kind == MSG_UPDATES:
+                records = np.frombuffer(body, dtype=UPDATE_DTYPE)
+                self.updates_received += len(records)
+                for run_id, version, t, quality in records.tolist():
+                    remote = self._runs.get(run_id)
+                    if remote is not None:
+                        remote._on_update(version, t, quality)
+            elif kind == MSG_FINISHED:
+                remote = self._runs.get(run)
+                if remote is not None:
+                    remote._on_finished(struct.unpack('<Q', body)[0])
+            else:
+                remote = self._runs.get(run)
+                if remote is not None:
+                    remote._replies.put((kind, bytes(body)))
+        # Conexión perdida: ninguna ejecución remota sigue activa
+        for remote in list(self._runs.values()):
+            remote._on_finished(None)
+            remote._replies.put((MSG_ERROR, b'connection closed'))
+
+
+class _LazySolution(Solution):
+    """
+    Solución recibida por el flujo de actualizaciones: trae versión,
+    instante y calidad; data (y payload) de esa misma versión se piden al
+    nodo la primera vez que se lee.
+    """
+
+    __slots__ = ('_remote',)
+
+    def __init__(self, quality_value, remote):
+        self._remote = remote
+        super().__init__(None, quality_value)
+
+    @property
+    def data(self):
+        value = Solution.data.__get__(self)
+        if value is None and self._remote is not None:
+            fetched = self._remote._fetch_version(self.version)
+            value = fetched.data
+            Solution.data.__set__(self, value)
+            self.payload = fetched.payload
+            self._remote = None
+        return value
+
+    @data.setter
+    def data(self, value):
+        Solution.data.__set__(self, value)
+
+
+class RemoteAnytimeAlgorithm(AnytimeAlgorithm):
+    """
+    Algoritmo anytime que se ejecuta en un WorkerNode, con la interfaz de
+    AnytimeAlgorithm: el meta-nivel lo controla igual que a uno local.
+
+    current_solution() retorna la última (versión, t, calidad) recibida por
+    el flujo de actualizaciones; el payload completo (data) de esa versión
+    se trae del nodo cuando se lee por primera vez. Al terminar (stop() o
+    fin natural) se trae la solución final, que pasa a ser la actual, y el
+    nodo olvida la ejecución.
+    """
+
+    supports_virtual_clock = False
+
+    def __init__(self, node, algorithm, reply_timeout=10.0):
+        """
+        Args:
+            node: RemoteNode conectado al nodo que lo ejecuta
+            algorithm: AnytimeAlgorithm a enviar al nodo en start()
+            reply_timeout: Espera máxima de las respuestas del nodo
+        """
+        super().__init__()
+        self.node = node
+        self.algorithm = algorithm
+        self.reply_timeout = reply_timeout
+        self.run_id = node._register(self)
+        self._replies = queue.Queue()
+        self._paused = False
+        self._checkpoint = None
+        self._start_time = None
+        self._final = None
+        self._observed = None
+        self._connected = True
+
+    def compute_step(self):
+        raise RuntimeError("Los pasos se ejecutan en el nodo remoto")
+
+    def initial_solution(self):
+        raise RuntimeError("Los pasos se ejecutan en el nodo remoto")
+
+    def start(self):
+        """Envía el algoritmo (o el checkpoint restaurado) al nodo y lo inicia."""
+        if self._running:
+            return
+        if self._checkpoint is not None:
+            body = bytes([START_CHECKPOINT]) + self._checkpoint
+        else:
+            body = bytes([START_FRESH]) + pickle.dumps(self.algorithm, protocol=pickle.HIGHEST_PROTOCOL)
+        self._checkpoint = None
+        self._final = None
+        self._observed = None
+        self._current_solution = None
+        self._start_time = time.monotonic()
+        self._running = True
+        self.node._send(MSG_START, self.run_id, body)
+        if self._paused:
+            self.node._send(MSG_PAUSE, self.run_id)
+        print(f"[Anytime] Algorithm started on remote node (run {self.run_id})")
+
+    def stop(self):
+        """Detiene la ejecución remota y trae la solución final."""
+        self._stop_remote()
+        self._fetch_final()
+
+    def suspend(self):
+        """Detiene la ejecución tomando el checkpoint antes de que el nodo la descarte."""
+        self._stop_remote()
+        checkpoint = self.snapshot()
+        self._fetch_final()
+        self.restore(checkpoint)
+        print(f"[Anytime] Algorithm suspended ({len(checkpoint)} bytes checkpoint)")
+        return checkpoint
+
+    def _stop_remote(self):
+        if self._running:
+            self.node._send(MSG_STOP, self.run_id)
+            with self._updated:
+                self._updated.wait_for(lambda: not self._running, self.reply_timeout)
+            print(f"[Anytime] Algorithm stopped by meta-level")
+
+    def running(self):
+        if self._running:
+            return True
+        # Terminó en el nodo: traer el estado final para que el nodo lo libere
+        self._fetch_final()
+        return False
+
+    def current_solution(self):
+        solution = self._current_solution
+        # La última solución entregada (la que el meta-nivel puede retornar)
+        # se resuelve antes de que el nodo olvide sus versiones
+        self._observed = solution
+        return solution
+
+    def pause(self):
+        self._paused = True
+        if self._running:
+            self.node._send(MSG_PAUSE, self.run_id)
+
+    def resume(self):
+        self._paused = False
+        if self._running:
+            self.node._send(MSG_RESUME, self.run_id)
+
+    def paused(self):
+        return self._paused
+
+    def snapshot(self):
+        """
+        Checkpoint tomado en el nodo (también mientras se ejecuta). Una vez
+        leída la solución final el nodo descarta la ejecución: para
+        conservar el estado de una ejecución detenida, usar suspend().
+        """
+        if self._final is not None:
+            raise RuntimeError("La ejecución terminó y el nodo la descartó: usar suspend() para conservar su estado")
+        return self._request(MSG_CHECKPOINT, MSG_CHECKPOINT_DATA)
+
+    def restore(self, checkpoint):
+        """El próximo start() reanuda el checkpoint en el nodo."""
+        if self._running:
+            raise RuntimeError("No se puede restaurar un algoritmo en ejecución")
+        self._checkpoint = bytes(checkpoint)
+        return self
+
+    def _fetch(self, version=0, release=False):
+        """Trae del nodo la solución completa de una versión (0 = la actual)."""
+        body = self._request(MSG_FETCH, MSG_SOLUTION, FETCH_REQUEST.pack(version, release))
+        data, quality, version, payload = pickle.loads(body)
+        solution = Solution(data, quality, payload)
+        solution.version = version
+        current = self._current_solution
+        if current is not None and current.version == version:
+            solution.timestamp = current.timestamp
+        else:
+            solution.timestamp = time.monotonic()
+        return solution
+
+    def _fetch_version(self, version):
+        if self._final is not None and self._final.version == version:
+            return self._final
+        return self._fetch(version)
+
+    def _fetch_final(self):
+        """
+        Una vez terminada la ejecución, trae la solución final (una sola
+        vez) y la deja como actual; el nodo descarta la ejecución.
+        """
+        if self._final is not None or self._start_time is None or not self._connected:
+            return
+        observed = self._observed
+        if (isinstance(observed, _LazySolution) and observed._remote is not None
+                and (observed.version != self._version or self._running)):
+            observed.data
+        self._final = self._fetch(release=True)
+        self._current_solution = self._final
+
+    def _request(self, kind, reply_kind, body=b''):
+        # Errores de comandos sin respuesta (pause, stop) no deben
+        # confundirse con la respuesta a este pedido
+        while not self._replies.empty():
+            self._replies.get_nowait()
+        self.node._send(kind, self.run_id, body)
+        try:
+            reply, body = self._replies.get(timeout=self.reply_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"El nodo no respondió al mensaje {kind} (run {self.run_id})")
+        if reply != reply_kind:
+            raise RuntimeError(f"Error del nodo remoto: {body.decode(errors='replace')}")
+        return body
+
+    def _on_update(self, version, t, quality):
+        # Desde el thread lector del RemoteNode
+        if self._final is not None:
+            return
+        solution = _LazySolution(quality, self)
+        solution.version = version
+        solution.timestamp = self._start_time + t
+        with self._updated:
+            self._version = version
+            self._current_solution = solution
+            self._updated.notify_all()
+
+    def _on_finished(self, version):
+        with self._updated:
+            # version None: se perdió la conexión con el nodo
+            self._connected = version is not None
+            self._running = False
+            self._updated.notify_all()
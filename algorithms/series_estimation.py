@@ -0,0 +1,181 @@
+import functools
+import numpy as np
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+
+ACCELERATIONS = (None, 'euler', 'aitken')
+
+
+def van_der_corput(n, base=2):
+    """
+    Secuencia de van der Corput (baja discrepancia) vectorizada.
+    
+    Args:
+        n: Array de índices enteros >= 1
+        base: Base de la expansión
+        
+    Returns:
+        np.ndarray: Puntos en (0, 1)
+    """
+    n = np.asarray(n, dtype=np.int64).copy()
+    result = np.zeros(n.shape)
+    denominator = 1.0
+    while np.any(n > 0):
+        denominator *= base
+        result += (n % base) / denominator
+        n //= base
+    return result
+
+
+def _quasi_monte_carlo_term(f, a, width, n):
+    # Término n: f evaluada en el punto n+1 de van der Corput sobre [a, a+width]
+    return f(a + width * van_der_corput(n + 1))
+
+
+class SeriesEstimatorAnytime(AnytimeAlgorithm):
+    """
+    Estimador anytime de series (o integrales): cada paso suma un bloque
+    de términos nuevos, calculados de forma vectorizada, sobre una suma
+    parcial acumulada. El trabajo total es lineal en el número de términos.
+    
+    Opcionalmente acelera la convergencia sobre las últimas sumas parciales:
+    - 'euler': transformación de Euler por promedios repetidos (van
+      Wijngaarden), muy efectiva en series alternantes.
+    - 'aitken': proceso Δ² de Aitken iterado.
+    """
+    
+    def __init__(self, term, target_value=None, terms_per_step=10, max_iterations=50,
+                 scale=1.0, average=False, acceleration=None, acceleration_depth=8,
+                 initial_estimate=0.0, error_scale=1.0, step_delay=0.0):
+        """
+        Args:
+            term: Función vectorizada n -> a_n (recibe un array de índices)
+            target_value: Valor exacto, si se conoce, para medir el error
+            terms_per_step: Términos nuevos por paso
+            max_iterations: Pasos máximos
+            scale: Factor aplicado a la suma (por ejemplo 4 para π/4)
+            average: Si True, la estimación es scale · promedio de los
+                     términos (integrales por cuasi-Monte Carlo)
+            acceleration: None, 'euler' o 'aitken'
+            acceleration_depth: Sumas parciales recientes usadas al acelerar
+            initial_estimate: Estimación antes del primer paso
+            error_scale: Escala del error en la calidad 1 / (1 + error·escala)
+            step_delay: Pausa entre pasos en segundos
+        """
+        super().__init__()
+        if acceleration not in ACCELERATIONS:
+            raise ValueError(f"Aceleración desconocida: {acceleration!r} (opciones: {ACCELERATIONS})")
+        self.term = term
+        self.target_value = target_value
+        self.terms_per_step = terms_per_step
+        self.max_iterations = max_iterations
+        self.scale = scale
+        self.average = average
+        self.acceleration = acceleration
+        self.acceleration_depth = acceleration_depth
+        self.error_scale = error_scale
+        self.step_delay = step_delay
+        self.current_estimate = initial_estimate
+        self.iterations = 0
+        self.n_terms = 0
+        self.partial_sum = 0.0
+        self._recent = np.zeros(0)
+    
+    def initial_solution(self):
+        """
+        Solución inicial: la estimación previa a sumar términos.
+        """
+        return self._make_solution(self._error(self.current_estimate, None))
+    
+    def compute_step(self):
+        """
+        Suma un bloque de términos nuevos y actualiza la estimación.
+        """
+        if self.iterations >= self.max_iterations:
+            return False
+        
+        self.iterations += 1
+        
+        # Solo los términos nuevos, en un bloque vectorizado
+        n = np.arange(self.n_terms, self.n_terms + self.terms_per_step)
+        partial_sums = self.partial_sum + np.cumsum(self.term(n))
+        self.partial_sum = float(partial_sums[-1])
+        self.n_terms += self.terms_per_step
+        
+        if self.average:
+            estimates = self.scale * partial_sums / (n + 1)
+        else:
+            estimates = self.scale * partial_sums
+        keep = self.acceleration_depth + 1
+        self._recent = np.concatenate((self._recent, estimates))[-keep:]
+        
+        previous = self.current_estimate
+        self.current_estimate = self._accelerate(self._recent)
+        error = self._error(self.current_estimate, previous)
+        
+        # Sin cambios (serie convergida en precisión de máquina) no se publica
+        quality = self._quality(error)
+        current = self._current_solution
+        if current is None or self.current_estimate != previous or quality != current.quality():
+            self.update_solution(self._make_solution(error, quality))
+        
+        if self.step_delay:
+            self.clock.sleep(self.step_delay)
+        
+        return True
+    
+    def _accelerate(self, sequence):
+        """Estimación acelerada a partir de las últimas sumas parciales."""
+        if self.acceleration == 'euler':
+            s = sequence
+            while len(s) > 1:
+                s = (s[:-1] + s[1:]) / 2
+            return float(s[-1])
+        
+        if self.acceleration == 'aitken':
+            s = sequence
+            while len(s) >= 3:
+                delta = s[2:] - s[1:-1]
+                delta2 = s[2:] - 2 * s[1:-1] + s[:-2]
+                if np.any(np.abs(delta2) < 1e-300):
+                    # Secuencia ya convergida en precisión de máquina
+                    break
+                s = s[2:] - delta ** 2 / delta2
+            return float(s[-1])
+        
+        return float(sequence[-1])
+    
+    def _error(self, estimate, previous):
+        """
+        Error respecto del valor exacto o, si no se conoce, el cambio
+        respecto de la estimación anterior.
+        """
+        if self.target_value is not None:
+            return abs(estimate - self.target_value)
+        if previous is None:
+            return float('inf')
+        return abs(estimate - previous)
+    
+    def _quality(self, error):
+        return 1.0 / (1.0 + error * self.error_scale)
+    
+    def _make_solution(self, error, quality=None):
+        if quality is None:
+            quality = self._quality(error)
+        return Solution(
+            data={'estimate': self.current_estimate, 'error': error, 'terms': self.n_terms},
+            quality_value=quality
+        )
+    
+    @classmethod
+    def integral(cls, f, a, b, **kwargs):
+        """
+        Estimador anytime de la integral de f en [a, b] por cuasi-Monte
+        Carlo: promedia f sobre la secuencia de van der Corput.
+        
+        Args:
+            f: Función vectorizada
+            a, b: Extremos del intervalo
+            **kwargs: Parámetros adicionales de SeriesEstimatorAnytime
+        """
+        term = functools.partial(_quasi_monte_carlo_term, f, a, b - a)
+        return cls(term, scale=b - a, average=True, **kwargs)
@@ -1,12 +1,22 @@
+import logging
 import numpy as np
 from abc import ABC, abstractmethod
+from .stopping_policy import StoppingPolicy
+
+logger = logging.getLogger(__name__)
 
 class StoppingCondition(ABC):
     """
     Clase base para condiciones de parada.
     C(~p) en el algoritmo de Svegliato.
+    
+    time_dependent indica si la decisión puede cambiar solo porque pasa el
+    tiempo. Si es False, el meta-nivel reutiliza la decisión anterior
+    mientras no se publique una solución nueva.
     """
     
+    time_dependent = True
+    
     @abstractmethod
     def should_stop(self, predictions, current_quality, time_elapsed):
         """
@@ -21,6 +31,48 @@ class StoppingCondition(ABC):
             bool: True si debe detenerse, False en caso contrario
         """
         pass
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        """
+        Decide para un lote de trabajos (por ejemplo, la salida de
+        predict_batch). Esta versión llama a should_stop() por fila; las
+        condiciones del paquete la reemplazan por una comparación vectorizada.
+        
+        Un lote vacío (sin trabajos) se rechaza con ValueError; las
+        predicciones sí pueden tener cero pasos futuros.
+        
+        Args:
+            predictions: Array (lote, pasos futuros) de calidades predichas
+            current_quality: Array (lote,) de calidades actuales
+            time_elapsed: Tiempo transcurrido, escalar o array (lote,)
+            
+        Returns:
+            np.ndarray: Array bool (lote,), True donde debe detenerse
+        """
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        return np.array([self.should_stop(p.tolist(), q, t) for p, q, t
+                         in zip(predictions, current_quality, time_elapsed)], dtype=bool)
+
+
+def _batch_arguments(predictions, current_quality, time_elapsed):
+    """Lleva los argumentos de un lote a arrays de formas compatibles."""
+    current_quality = np.asarray(current_quality, dtype=np.float64)
+    if current_quality.ndim != 1 or len(current_quality) == 0:
+        raise ValueError("current_quality debe ser un array (lote,) con al menos un trabajo")
+    predictions = np.asarray(predictions, dtype=np.float64)
+    # Ancho explícito: reshape(lote, -1) no puede inferir cero pasos futuros
+    width = predictions.shape[-1] if predictions.ndim else 0
+    if predictions.size != len(current_quality) * width:
+        raise ValueError(f"predictions debe tener forma (lote, pasos futuros) con lote = {len(current_quality)}")
+    predictions = predictions.reshape(len(current_quality), width)
+    time_elapsed = np.broadcast_to(np.asarray(time_elapsed, dtype=np.float64), current_quality.shape)
+    return predictions, current_quality, time_elapsed
+
+
+def _log_batch(stop, message):
+    if logger.isEnabledFor(logging.INFO) and stop.any():
+        logger.info("[Stopping] %s for %d of %d jobs", message, int(stop.sum()), len(stop))
 
 
 class UtilityBasedStoppingCondition(StoppingCondition):
@@ -29,6 +81,8 @@ class UtilityBasedStoppingCondition(StoppingCondition):
     Se detiene cuando la utilidad de continuar es menor que la de detenerse.
     """
     
+    time_dependent = False
+    
     def __init__(self, time_cost=0.01, quality_weight=1.0, improvement_threshold=0.001):
         """
         Args:
@@ -60,7 +114,7 @@ class UtilityBasedStoppingCondition(StoppingCondition):
         
         # Si la mejora esperada es muy pequeña, detener
         if expected_improvement < self.improvement_threshold:
-            print(f"[Stopping] Expected improvement {expected_improvement:.6f} below threshold")
+            logger.info("[Stopping] Expected improvement %.6f below threshold", expected_improvement)
             return True
         
         # Calcular utilidad de continuar
@@ -70,9 +124,25 @@ class UtilityBasedStoppingCondition(StoppingCondition):
         should_stop = u_stop >= u_continue
         
         if should_stop:
-            print(f"[Stopping] U_stop ({u_stop:.4f}) >= U_continue ({u_continue:.4f})")
+            logger.info("[Stopping] U_stop (%.4f) >= U_continue (%.4f)", u_stop, u_continue)
         
         return should_stop
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        """Misma regla de utilidad, evaluada para todo el lote."""
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        if predictions.shape[1] == 0:
+            return np.ones(len(current_quality), dtype=bool)
+        
+        u_stop = self.quality_weight * current_quality
+        expected_future_quality = predictions[:, 0]
+        expected_improvement = expected_future_quality - current_quality
+        u_continue = self.quality_weight * expected_future_quality - self.time_cost
+        
+        stop = (expected_improvement < self.improvement_threshold) | (u_stop >= u_continue)
+        _log_batch(stop, "Expected utility of continuing too low")
+        return stop
 
 
 class DiminishingReturnsStoppingCondition(StoppingCondition):
@@ -80,6 +150,8 @@ class DiminishingReturnsStoppingCondition(StoppingCondition):
     Se detiene cuando la tasa de mejora predicha cae por debajo de un umbral.
     """
     
+    time_dependent = False
+    
     def __init__(self, min_improvement_rate=0.001):
         self.min_improvement_rate = min_improvement_rate
     
@@ -94,10 +166,20 @@ class DiminishingReturnsStoppingCondition(StoppingCondition):
         predicted_improvement = predictions[0] - current_quality
         
         if predicted_improvement < self.min_improvement_rate:
-            print(f"[Stopping] Predicted improvement rate {predicted_improvement:.6f} below threshold")
+            logger.info("[Stopping] Predicted improvement rate %.6f below threshold", predicted_improvement)
             return True
         
         return False
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        """Mejora marginal predicha de todo el lote contra el umbral."""
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        if predictions.shape[1] == 0:
+            return np.ones(len(current_quality), dtype=bool)
+        stop = predictions[:, 0] - current_quality < self.min_improvement_rate
+        _log_batch(stop, "Predicted improvement rate below threshold")
+        return stop
 
 
 class TimeoutStoppingCondition(StoppingCondition):
@@ -113,9 +195,16 @@ class TimeoutStoppingCondition(StoppingCondition):
         Detiene si se excede el tiempo máximo.
         """
         if time_elapsed >= self.max_time:
-            print(f"[Stopping] Timeout reached: {time_elapsed:.2f}s >= {self.max_time}s")
+            logger.info("[Stopping] Timeout reached: %.2fs >= %ss", time_elapsed, self.max_time)
             return True
         return False
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        stop = time_elapsed >= self.max_time
+        _log_batch(stop, "Timeout reached")
+        return stop
 
 
 class QualityThresholdStoppingCondition(StoppingCondition):
@@ -123,6 +212,8 @@ class QualityThresholdStoppingCondition(StoppingCondition):
     Se detiene cuando se alcanza una calidad suficientemente buena.
     """
     
+    time_dependent = False
+    
     def __init__(self, target_quality=0.90):
         self.target_quality = target_quality
     
@@ -131,9 +222,16 @@ class QualityThresholdStoppingCondition(StoppingCondition):
         Detiene si la calidad actual supera el umbral.
         """
         if current_quality >= self.target_quality:
-            print(f"[Stopping] Target quality {self.target_quality} reached: {current_quality:.4f}")
+            logger.info("[Stopping] Target quality %s reached: %.4f", self.target_quality, current_quality)
             return True
         return False
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        stop = current_quality >= self.target_quality
+        _log_batch(stop, "Target quality reached")
+        return stop
 
 
 class CompositeStoppingCondition(StoppingCondition):
@@ -145,6 +243,10 @@ class CompositeStoppingCondition(StoppingCondition):
     def __init__(self, conditions):
         self.conditions = conditions
     
+    @property
+    def time_dependent(self):
+        return any(getattr(c, 'time_dependent', True) for c in self.conditions)
+    
     def should_stop(self, predictions, current_quality, time_elapsed):
         """
         Detiene si cualquier condición se cumple.
@@ -152,4 +254,71 @@ class CompositeStoppingCondition(StoppingCondition):
         for condition in self.conditions:
             if condition.should_stop(predictions, current_quality, time_elapsed):
                 return True
-        return False
\ No newline at end of file
+        return False
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        """OR de las decisiones por lote de cada condición."""
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        stop = np.zeros(len(current_quality), dtype=bool)
+        for condition in self.conditions:
+            stop |= condition.should_stop_batch(predictions, current_quality, time_elapsed)
+        return stop
+
+
+class PolicyTableStoppingCondition(StoppingCondition):
+    """
+    Condición de parada que consulta una StoppingPolicy compilada offline.
+    
+    La decisión óptima ya está precalculada para cada estado (calidad,
+    tick): should_stop() es un único acceso al array, sin mirar las
+    predicciones. El tick se obtiene del tiempo transcurrido y del Δt con
+    que se grabaron las ejecuciones del perfil; pasado el horizonte de la
+    tabla, se detiene.
+    """
+    
+    def __init__(self, policy, mmap=True):
+        """
+        Args:
+            policy: StoppingPolicy o ruta de una política guardada con save()
+            mmap: Al cargar desde una ruta, mapear la tabla en memoria
+        """
+        if isinstance(policy, str):
+            policy = StoppingPolicy.load(policy, mmap=mmap)
+        self.policy = policy
+        self._table = np.asarray(policy.stop)
+        # Filas como listas de bool, convertidas recién cuando se consultan:
+        # indexarlas cuesta mucho menos que un acceso escalar a un array de
+        # NumPy, y de una tabla mapeada en memoria solo se leen las filas
+        # (calidades) que la ejecución visita
+        self._rows = [None] * len(self._table)
+        self._quality_scale = policy.quality_bins - 1
+        self._ticks_per_second = 1.0 / policy.delta_t
+        self._last_tick = policy.max_tick
+    
+    def should_stop(self, predictions, current_quality, time_elapsed):
+        """
+        Detiene si la tabla indica parar en (calidad actual, tick actual).
+        """
+        # Comparaciones en lugar de min()/max(): este es todo el costo por tick
+        row = int(current_quality * self._quality_scale + 0.5)
+        row = 0 if row < 0 else (self._quality_scale if row > self._quality_scale else row)
+        column = int(time_elapsed * self._ticks_per_second + 0.5)
+        column = 0 if column < 0 else (self._last_tick if column > self._last_tick else column)
+        decisions = self._rows[row]
+        if decisions is None:
+            decisions = self._rows[row] = self._table[row].tolist()
+        if decisions[column]:
+            logger.info("[Stopping] Policy table stops at quality %.4f, tick %d", current_quality, column)
+            return True
+        return False
+    
+    def should_stop_batch(self, predictions, current_quality, time_elapsed):
+        """Un acceso con índices vectorizados para todo el lote."""
+        predictions, current_quality, time_elapsed = _batch_arguments(
+            predictions, current_quality, time_elapsed)
+        rows = (np.clip(current_quality, 0.0, 1.0) * self._quality_scale + 0.5).astype(np.int64)
+        columns = np.clip((time_elapsed * self._ticks_per_second + 0.5).astype(np.int64), 0, self._last_tick)
+        stop = np.asarray(self._table[rows, columns], dtype=bool)
+        _log_batch(stop, "Policy table stops")
+        return stop
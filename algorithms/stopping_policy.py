@@ -0,0 +1,155 @@
+import os
+import numpy as np
+from .performance_profile import PerformanceProfile
+
+class StoppingPolicy:
+    """
+    Política de monitoreo y parada precalculada offline.
+
+    Se compila por programación dinámica (inducción hacia atrás) sobre los
+    estados discretizados (calidad, tick), a partir de un PerformanceProfile
+    y de una función de costo del tiempo. La utilidad de detenerse en el
+    estado (q, t) es U(q, t) = quality_weight·q - costo(t); la de continuar
+    es el valor esperado del estado siguiente, con la transición del perfil
+    (q → q + mejora esperada a un tick), interpolando entre las dos filas
+    vecinas de la grilla de calidad.
+
+    El resultado es una tabla densa de decisiones (quality_bins, max_tick+1):
+    en ejecución, decidir es un solo acceso al array. En el último tick de
+    la tabla (el horizonte del perfil) la política siempre se detiene.
+
+    Además guarda, para cada estado, los ticks que faltan para que la
+    política se detenga siguiendo la trayectoria esperada (ticks_to_stop):
+    el meta-nivel puede usarlos para espaciar los chequeos.
+    """
+
+    # Arrays persistidos por save()/load()
+    _ARRAYS = ('stop', 'values', 'ticks_to_stop', 'delta_t', 'name')
+
+    def __init__(self, stop, values=None, ticks_to_stop=None, delta_t=0.1, name=''):
+        """
+        Args:
+            stop: Array bool (quality_bins, max_tick+1), True donde conviene detenerse
+            values: Valor óptimo de cada estado (misma forma)
+            ticks_to_stop: Ticks esperados hasta detenerse (misma forma)
+            delta_t: Segundos por tick de las ejecuciones del perfil
+            name: Nombre del algoritmo perfilado
+        """
+        stop = np.asarray(stop)
+        if stop.ndim != 2 or stop.shape[0] < 2 or stop.shape[1] < 1:
+            raise ValueError("La tabla debe tener forma (quality_bins >= 2, ticks >= 1)")
+        if delta_t <= 0:
+            raise ValueError("delta_t debe ser positivo")
+        self.stop = stop
+        self.values = values if values is not None else np.zeros(stop.shape)
+        self.ticks_to_stop = ticks_to_stop if ticks_to_stop is not None else np.zeros(stop.shape)
+        self.delta_t = float(delta_t)
+        self.name = str(name)
+        self.quality_bins = stop.shape[0]
+        self.max_tick = stop.shape[1] - 1
+
+    @classmethod
+    def compile(cls, profile, time_cost=0.01, quality_weight=1.0, quality_bins=101,
+                horizon=None, delta_t=0.1):
+        """
+        Calcula la política óptima para un perfil de performance.
+
+        Args:
+            profile: PerformanceProfile o ruta de un perfil guardado
+            time_cost: Costo por tick (como en UtilityBasedStoppingCondition),
+                       o función costo(t) del tiempo transcurrido en segundos
+            quality_weight: Peso de la calidad en la utilidad
+            quality_bins: Filas de la grilla de calidad de la tabla
+            horizon: Último tick considerado (None = el max_tick del perfil)
+            delta_t: Segundos por tick de las ejecuciones del perfil
+
+        Returns:
+            StoppingPolicy
+        """
+        if isinstance(profile, str):
+            profile = PerformanceProfile.load(profile)
+        if quality_bins < 2:
+            raise ValueError("Se necesitan al menos 2 filas de calidad")
+        horizon = profile.max_tick if horizon is None else int(horizon)
+        if horizon < 0:
+            raise ValueError("El horizonte no puede ser negativo")
+
+        qualities = np.linspace(0.0, 1.0, quality_bins)
+        ticks = np.arange(horizon + 1)
+        if callable(time_cost):
+            cost = np.array([time_cost(tick * delta_t) for tick in ticks], dtype=np.float64)
+        else:
+            cost = time_cost * ticks.astype(np.float64)
+
+        stop = np.zeros((quality_bins, horizon + 1), dtype=bool)
+        values = np.empty((quality_bins, horizon + 1))
+        ticks_to_stop = np.zeros((quality_bins, horizon + 1))
+
+        # Horizonte: solo queda detenerse
+        values[:, horizon] = quality_weight * qualities - cost[horizon]
+        stop[:, horizon] = True
+        for tick in range(horizon - 1, -1, -1):
+            u_stop = quality_weight * qualities - cost[tick]
+            following = profile.lookup_batch(qualities, np.full(quality_bins, tick))[:, 0]
+            u_continue = np.interp(following, qualities, values[:, tick + 1])
+            stop[:, tick] = u_stop >= u_continue
+            values[:, tick] = np.where(stop[:, tick], u_stop, u_continue)
+            ticks_to_stop[:, tick] = np.where(
+                stop[:, tick], 0.0,
+                1.0 + np.interp(following, qualities, ticks_to_stop[:, tick + 1]))
+        return cls(stop, values, ticks_to_stop, delta_t, profile.name)
+
+    def index(self, quality, time_elapsed):
+        """Celda (fila, columna) de la tabla para una calidad y un tiempo en segundos."""
+        row = int(min(max(quality, 0.0), 1.0) * (self.quality_bins - 1) + 0.5)
+        column = min(max(int(time_elapsed / self.delta_t + 0.5), 0), self.max_tick)
+        return row, column
+
+    def next_check(self, quality, time_elapsed):
+        """
+        Segundos hasta el próximo chequeo útil: mientras la trayectoria
+        esperada no llegue a un estado de parada, la decisión no cambia.
+        """
+        row, column = self.index(quality, time_elapsed)
+        return max(1, int(self.ticks_to_stop[row, column])) * self.delta_t
+
+    def save(self, path):
+        """
+        Guarda la política. Si path termina en '.npz' se escribe un único
+        archivo; si no, un directorio con un .npy por array, que load()
+        puede mapear en memoria.
+        """
+        arrays = {
+            'stop': self.stop,
+            'values': self.values,
+            'ticks_to_stop': self.ticks_to_stop,
+            'delta_t': np.array(self.delta_t),
+            'name': np.array(self.name),
+        }
+        if path.endswith('.npz'):
+            np.savez(path, **arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for key, array in arrays.items():
+            np.save(os.path.join(path, f"{key}.npy"), array)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Carga una política guardada con save(). Desde un directorio, con
+        mmap=True las tablas se mapean en memoria en lugar de leerse.
+        """
+        if path.endswith('.npz'):
+            with np.load(path) as archive:
+                arrays = {key: archive[key] for key in cls._ARRAYS}
+        else:
+            arrays = {}
+            for key in cls._ARRAYS:
+                mode = 'r' if mmap and key not in ('delta_t', 'name') else None
+                arrays[key] = np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mode)
+        return cls(arrays['stop'], arrays['values'], arrays['ticks_to_stop'],
+                   float(arrays['delta_t']), str(arrays['name']))
+
+    def __repr__(self):
+        return (f"StoppingPolicy({self.name or 'anonymous'}, "
+                f"{self.quality_bins}x{self.max_tick + 1}, delta_t={self.delta_t})")
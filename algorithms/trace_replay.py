@@ -0,0 +1,55 @@
+import json
+import numpy as np
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+
+class TraceReplayAnytime(AnytimeAlgorithm):
+    """
+    Algoritmo anytime que reproduce una traza de calidad grabada o
+    sintética: un valor por paso, cada paso dura `tick` segundos del reloj.
+
+    Publica solo cuando la calidad cambia, como un algoritmo real que
+    publica sus mejoras, y termina al agotar la traza. Con un VirtualClock
+    una ejecución completa bajo el meta-nivel no espera nada: sirve para
+    ajustar predictores y condiciones de parada y para pruebas de
+    regresión de la lógica de decisión.
+    """
+
+    def __init__(self, trace=None, path=None, tick=0.1):
+        """
+        Args:
+            trace: Secuencia de calidades, una por paso
+            path: Alternativa a trace: archivo .npy o JSON con la lista
+            tick: Duración de cada paso en segundos
+        """
+        super().__init__()
+        if (trace is None) == (path is None):
+            raise ValueError("Se necesita una traza o la ruta de una, no ambas")
+        if path is not None:
+            if path.endswith('.npy'):
+                trace = np.load(path)
+            else:
+                with open(path) as f:
+                    trace = json.load(f)
+        self.trace = [float(q) for q in trace]
+        if not self.trace:
+            raise ValueError("La traza está vacía")
+        if tick <= 0:
+            raise ValueError("tick debe ser positivo")
+        self.tick = tick
+        self.position = 0
+
+    def initial_solution(self):
+        self.position = 0
+        return self._make_solution()
+
+    def compute_step(self):
+        if self.position + 1 >= len(self.trace):
+            return False
+        self.position += 1
+        if self.trace[self.position] != self._current_solution.quality():
+            self.update_solution(self._make_solution())
+        self.clock.sleep(self.tick)
+        return self.position + 1 < len(self.trace)
+
+    def _make_solution(self):
+        return Solution(data={'tick': self.position}, quality_value=self.trace[self.position])
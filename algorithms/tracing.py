@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import itertools
+import threading
+
+class Tracer:
+    """
+    Registro de eventos estructurados del loop de monitoreo.
+
+    Los eventos se guardan en un buffer circular preasignado (los más
+    viejos se sobrescriben) con timestamps monotónicos, y se exportan en
+    formato Chrome trace / Perfetto (chrome://tracing, ui.perfetto.dev).
+
+    Puntos de instrumentación:
+    - 'step' (objeto): duración de cada compute_step()
+    - 'publish' (objeto): cada update_solution(), con versión y calidad
+    - 'predict' (meta): cada evaluación de Φ(~h)
+    - 'decide' (meta): cada evaluación de C(~p), con la decisión
+
+    Desactivado, cada punto cuesta solo la lectura de `enabled`: el código
+    instrumentado hace `if tracer.enabled:` antes de cualquier otro trabajo.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self.enabled = False
+        self._listeners = []
+        self._thread_names = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self._buffer = [None] * capacity
+        # next() sobre itertools.count es atómico: cada evento recibe un
+        # índice único aunque lo registren varios threads a la vez
+        self._sequence = itertools.count()
+
+    def enable(self, capacity=None):
+        """Activa el registro (opcionalmente con un buffer de otro tamaño)."""
+        if capacity is not None and capacity != self.capacity:
+            self._allocate(capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        """Descarta los eventos registrados."""
+        self._allocate(self.capacity)
+
+    def add_listener(self, listener):
+        """
+        Registra una función que recibe cada evento (un dict en formato
+        Chrome trace) en el momento en que se registra.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    @staticmethod
+    def now():
+        """Timestamp monotónico en nanosegundos."""
+        return time.perf_counter_ns()
+
+    def complete(self, name, category, start_ns, args=None):
+        """Registra un intervalo que comenzó en start_ns y termina ahora."""
+        end = time.perf_counter_ns()
+        self._record(start_ns, 'X', name, category, args, end - start_ns)
+
+    def instant(self, name, category, args=None):
+        """Registra un evento puntual."""
+        self._record(time.perf_counter_ns(), 'i', name, category, args, None)
+
+    def _record(self, ts, phase, name, category, args, duration):
+        index = next(self._sequence)
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            # Los threads de los algoritmos pueden terminar antes de exportar
+            self._thread_names[tid] = threading.current_thread().name
+        event = (index, ts, phase, name, category, tid, args, duration)
+        self._buffer[index % self.capacity] = event
+        if self._listeners:
+            chrome_event = self._to_chrome(event, os.getpid())
+            for listener in self._listeners:
+                listener(chrome_event)
+
+    @staticmethod
+    def _to_chrome(event, pid):
+        index, ts, phase, name, category, tid, args, duration = event
+        chrome_event = {'name': name, 'cat': category, 'ph': phase,
+                        'ts': ts / 1000.0, 'pid': pid, 'tid': tid}
+        if duration is not None:
+            chrome_event['dur'] = duration / 1000.0
+        if phase == 'i':
+            chrome_event['s'] = 't'
+        if args:
+            chrome_event['args'] = args
+        return chrome_event
+
+    def events(self):
+        """
+        Eventos del buffer, del más viejo al más nuevo, en formato Chrome
+        trace (timestamps y duraciones en microsegundos).
+        """
+        recorded = sorted((event for event in self._buffer if event is not None),
+                          key=lambda event: event[0])
+        pid = os.getpid()
+        return [self._to_chrome(event, pid) for event in recorded]
+
+    def export_chrome_trace(self, path):
+        """
+        Escribe los eventos en un archivo JSON que se abre con
+        chrome://tracing o ui.perfetto.dev.
+
+        Returns:
+            int: Cantidad de eventos exportados
+        """
+        events = self.events()
+        pid = os.getpid()
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                     'args': {'name': self._thread_names.get(tid, f"thread-{tid}")}}
+                    for tid in sorted({event['tid'] for event in events})]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+# Tracer compartido por el meta-nivel y los algoritmos anytime
+tracer = Tracer()
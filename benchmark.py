@@ -0,0 +1,504 @@
+"""
+Benchmark del meta-nivel: costo por tick de predictores y condiciones de
+parada, y regret de la decisión de parada respecto del óptimo.
+
+Cada carga de trabajo es un conjunto de trazas de calidad (una calidad por
+tick), grabadas ejecutando los algoritmos anytime del paquete paso a paso o
+generadas con curvas sintéticas. Cada combinación predictor × condición se
+reproduce sobre las trazas con la misma lógica de decisión que
+svegliato_algorithm (su _Monitor: Φ solo ve soluciones nuevas), sin
+esperas, midiendo:
+- overhead por tick (p50 y p99): el chequeo completo del monitor, en
+  nanosegundos
+- latencia de decisión (p50 y p99): solo C(~p)
+- regret: utilidad del punto de parada óptimo (oráculo, calculado con la
+  traza completa) menos la utilidad del punto donde se detuvo
+
+La opción --scaling mide en cambio la escalabilidad de
+ParallelMatrixOptimizationAnytime con la cantidad de procesos de búsqueda.
+
+Uso:
+    python benchmark.py --output results.json
+    python benchmark.py --quick --compare results.json
+    python benchmark.py --scaling --workers 1,2,4,8,16,32 --output scaling.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import numpy as np
+from metalevel import MetaReasoner, _Monitor
+from algorithms.anytime_algorithm import Solution
+from algorithms.matrix_optimization import MatrixOptimizationAnytime, IterativeRefinementAnytime
+from algorithms.parallel_matrix_optimization import ParallelMatrixOptimizationAnytime
+from algorithms.series_estimation import SeriesEstimatorAnytime
+from algorithms.performance_profile import PerformanceProfile
+from algorithms.stopping_policy import StoppingPolicy
+from algorithms.performance_predictor import (
+    LinearRegressionPredictor,
+    DiminishingReturnsPredictor,
+    MovingAveragePredictor,
+    ProfilePredictor,
+    CurveFitPredictor
+)
+from algorithms.stopping_condition import (
+    UtilityBasedStoppingCondition,
+    DiminishingReturnsStoppingCondition,
+    TimeoutStoppingCondition,
+    QualityThresholdStoppingCondition,
+    CompositeStoppingCondition,
+    PolicyTableStoppingCondition
+)
+
+SYNTHETIC_SHAPES = ('exponential', 'linear', 'sigmoid', 'step')
+
+PREDICTORS = {
+    'linear_regression': LinearRegressionPredictor,
+    'diminishing_returns': DiminishingReturnsPredictor,
+    'moving_average': MovingAveragePredictor,
+    'curve_fit': CurveFitPredictor,
+}
+
+CONDITIONS = {
+    'utility': lambda: UtilityBasedStoppingCondition(),
+    'diminishing_returns': lambda: DiminishingReturnsStoppingCondition(),
+    'timeout': lambda: TimeoutStoppingCondition(max_time=5.0),
+    'quality_threshold': lambda: QualityThresholdStoppingCondition(),
+    'composite': lambda: CompositeStoppingCondition([
+        QualityThresholdStoppingCondition(target_quality=0.90),
+        TimeoutStoppingCondition(max_time=5.0)
+    ]),
+}
+
+
+def record_trace(algorithm, max_ticks=200):
+    """
+    Ejecuta un AnytimeAlgorithm en el thread actual, un paso por tick, y
+    retorna la calidad de la solución publicada después de cada paso.
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        algorithm.update_solution(algorithm.initial_solution())
+        trace = [algorithm.current_solution().quality()]
+        while len(trace) < max_ticks:
+            can_continue = algorithm.compute_step()
+            trace.append(algorithm.current_solution().quality())
+            if not can_continue:
+                break
+    return trace
+
+
+def synthetic_trace(shape, ticks=100, rate=0.05, plateau=0.95, noise=0.0, seed=None):
+    """
+    Curva de calidad sintética.
+
+    Args:
+        shape: 'exponential', 'linear', 'sigmoid' o 'step'
+        ticks: Largo de la traza
+        rate: Velocidad de mejora por tick
+        plateau: Calidad máxima alcanzable
+        noise: Desvío estándar del ruido gaussiano sobre la calidad
+        seed: Semilla del ruido
+    """
+    t = np.arange(ticks)
+    if shape == 'exponential':
+        q = plateau * (1 - np.exp(-rate * t))
+    elif shape == 'linear':
+        q = np.minimum(rate * t, plateau)
+    elif shape == 'sigmoid':
+        q = plateau / (1 + np.exp(-rate * 2 * (t - ticks / 3)))
+    elif shape == 'step':
+        # Mesetas de largo 1/rate con saltos de plateau/4
+        q = np.minimum(np.floor(rate * t) / 4, 1.0) * plateau
+    else:
+        raise ValueError(f"Forma sintética desconocida: {shape!r} (opciones: {SYNTHETIC_SHAPES})")
+    if noise:
+        q = q + np.random.default_rng(seed).normal(0.0, noise, ticks)
+    return np.clip(q, 0.0, 1.0).tolist()
+
+
+def default_workloads(seeds=3, max_ticks=200, synthetic=True):
+    """
+    Trazas de cada AnytimeAlgorithm del paquete y de las curvas sintéticas,
+    varias por carga (semillas o parámetros distintos).
+
+    Returns:
+        dict: nombre -> {'kind': 'algorithm' | 'synthetic', 'traces': [...]}
+    """
+    algorithms = {
+        'matrix_optimization': lambda s: MatrixOptimizationAnytime(
+            num_matrices=25, size=30, step_delay=0, seed=s),
+        'iterative_refinement': lambda s: IterativeRefinementAnytime(
+            terms_per_step=5 * (s + 1), step_delay=0),
+        'series_integral': lambda s: SeriesEstimatorAnytime.integral(
+            np.exp, 0.0, 1.0, target_value=np.e - 1, error_scale=100,
+            terms_per_step=16 * (s + 1), max_iterations=100),
+    }
+    workloads = {}
+    for name, make in algorithms.items():
+        traces = [record_trace(make(seed), max_ticks) for seed in range(seeds)]
+        workloads[name] = {'kind': 'algorithm', 'traces': traces}
+
+    if synthetic:
+        rng = np.random.default_rng(0)
+        for shape in SYNTHETIC_SHAPES:
+            traces = [synthetic_trace(shape, ticks=min(max_ticks, 100),
+                                      rate=0.05 * rng.uniform(0.7, 1.3),
+                                      noise=0.01, seed=seed)
+                      for seed in range(seeds)]
+            workloads[f"synthetic_{shape}"] = {'kind': 'synthetic', 'traces': traces}
+    return workloads
+
+
+class _TimedCondition:
+    """Envuelve una condición de parada y mide la latencia de cada should_stop()."""
+
+    def __init__(self, condition):
+        self.condition = condition
+        self.time_dependent = getattr(condition, 'time_dependent', True)
+        self.latencies = []
+
+    def should_stop(self, predictions, current_quality, time_elapsed):
+        start = time.perf_counter_ns()
+        stop = self.condition.should_stop(predictions, current_quality, time_elapsed)
+        self.latencies.append(time.perf_counter_ns() - start)
+        return stop
+
+
+def _published(trace, delta_t):
+    """
+    Solución publicada en cada tick de la traza: una nueva (con versión e
+    instante) solo cuando la calidad cambia, como TraceReplayAnytime.
+    """
+    solutions = []
+    current = None
+    for tick, q in enumerate(trace):
+        if current is None or q != current.quality():
+            current = Solution(data={'tick': tick}, quality_value=q)
+            current.version = solutions[-1].version + 1 if solutions else 0
+            current.timestamp = tick * delta_t
+        solutions.append(current)
+    return solutions
+
+
+def replay(trace, predictor, condition, delta_t=0.1, repeat=1):
+    """
+    Reproduce una traza con el monitor de svegliato_algorithm: una
+    observación por tick, y Φ(~h) solo cuando la calidad publicada cambia.
+
+    Returns:
+        tuple: (tick de parada, overheads en ns, latencias de decisión en ns)
+    """
+    solutions = _published(trace, delta_t)
+    overhead = []
+    decision = []
+    stop_tick = len(trace) - 1
+
+    # Las condiciones imprimen al decidir; se descarta para no medir la terminal
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # La primera pasada calienta cachés y no se mide; decide el tick de parada
+        for run in range(repeat + 1):
+            timed = _TimedCondition(condition)
+            monitor = _Monitor(predictor, timed, max(2, len(trace)), 0.0, delta_t)
+            for tick, alpha in enumerate(solutions):
+                start = time.perf_counter_ns()
+                monitor.observe(alpha, tick * delta_t)
+                end = time.perf_counter_ns()
+                if run > 0:
+                    overhead.append(end - start)
+                if monitor.decision:
+                    if run == 0:
+                        stop_tick = tick
+                    break
+            if run > 0:
+                decision.extend(timed.latencies)
+    return stop_tick, overhead, decision
+
+
+def oracle_stop(trace, time_cost=0.01):
+    """
+    Punto de parada óptimo en retrospectiva: maximiza q(t) - time_cost·t.
+
+    Returns:
+        tuple: (tick, utilidades de la traza)
+    """
+    utility = np.asarray(trace) - time_cost * np.arange(len(trace))
+    return int(np.argmax(utility)), utility
+
+
+def run_benchmark(workloads=None, predictors=None, conditions=None, delta_t=0.1,
+                  time_cost=0.01, repeat=5, profile=True):
+    """
+    Ejecuta todas las combinaciones predictor × condición sobre cada carga.
+
+    Args:
+        workloads: Resultado de default_workloads() (None = cargas por defecto)
+        predictors: dict nombre -> clase de predictor (None = PREDICTORS)
+        conditions: dict nombre -> fábrica de condición (None = CONDITIONS)
+        delta_t: Segundos por tick que ven las condiciones (Δt)
+        time_cost: Costo por tick en la utilidad usada para el regret
+        repeat: Repeticiones de cada traza para las mediciones de tiempo
+        profile: Incluir ProfilePredictor y PolicyTableStoppingCondition,
+                 ajustados con las demás trazas de la carga (leave-one-out)
+
+    Returns:
+        dict: {'meta': {...}, 'results': [una fila por combinación]}
+    """
+    workloads = workloads if workloads is not None else default_workloads()
+    predictors = predictors or PREDICTORS
+    conditions = conditions or CONDITIONS
+    meta_reasoner = MetaReasoner("benchmark")
+
+    results = []
+    for workload, spec in workloads.items():
+        traces = spec['traces']
+        oracles = [oracle_stop(trace, time_cost) for trace in traces]
+
+        # Fábricas de predictor por traza (el perfil excluye la traza evaluada)
+        factories = {name: [cls] * len(traces) for name, cls in predictors.items()}
+        condition_factories = {name: [make] * len(traces) for name, make in conditions.items()}
+        if profile and len(traces) > 1:
+            profiles = [PerformanceProfile.fit(traces[:i] + traces[i + 1:], name=workload)
+                        for i in range(len(traces))]
+            factories['profile'] = [lambda p=p: ProfilePredictor(p) for p in profiles]
+            policies = [StoppingPolicy.compile(p, time_cost, delta_t=delta_t) for p in profiles]
+            condition_factories['policy'] = [lambda p=p: PolicyTableStoppingCondition(p)
+                                             for p in policies]
+
+        for predictor_name, makers in factories.items():
+            for condition_name, condition_makers in condition_factories.items():
+                overhead, decision, regrets, stops, lags, finals = [], [], [], [], [], []
+                for trace, make_predictor, make_condition, (oracle, utility) in zip(
+                        traces, makers, condition_makers, oracles):
+                    stop, o, d = replay(trace, make_predictor(), make_condition(),
+                                        delta_t, repeat)
+                    overhead.extend(o)
+                    decision.extend(d)
+                    stops.append(stop)
+                    lags.append(stop - oracle)
+                    regrets.append(float(utility[oracle] - utility[stop]))
+                    finals.append(trace[stop])
+                results.append({
+                    'workload': workload,
+                    'kind': spec['kind'],
+                    'predictor': predictor_name,
+                    'condition': condition_name,
+                    'runs': len(traces),
+                    'ticks': len(overhead),
+                    'overhead_p50_ns': float(np.percentile(overhead, 50)),
+                    'overhead_p99_ns': float(np.percentile(overhead, 99)),
+                    'decision_p50_ns': float(np.percentile(decision, 50)),
+                    'decision_p99_ns': float(np.percentile(decision, 99)),
+                    'stop_tick_mean': float(np.mean(stops)),
+                    'oracle_tick_mean': float(np.mean([o for o, _ in oracles])),
+                    'stop_lag_mean': float(np.mean(lags)),
+                    'regret_mean': float(np.mean(regrets)),
+                    'regret_max': float(np.max(regrets)),
+                    'final_quality_mean': float(np.mean(finals)),
+                })
+
+    return {
+        'meta': {
+            'version': meta_reasoner._version,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'delta_t': delta_t,
+            'time_cost': time_cost,
+            'repeat': repeat,
+        },
+        'results': results
+    }
+
+
+def parallel_scaling(worker_counts=(1, 2, 4, 8), num_matrices=300, duration=5.0,
+                     sample_interval=0.1, seeds=1):
+    """
+    Escalabilidad de la búsqueda multi-arranque: ejecuta
+    ParallelMatrixOptimizationAnytime con cada cantidad de procesos durante
+    `duration` segundos de reloj, muestreando la solución combinada.
+
+    Por cada K reporta la calidad final y media en el tiempo (lo que ve el
+    meta-nivel), el costo final relativo al mejor costo encontrado por
+    cualquier K (la parte que mejora la búsqueda paralela), y las rotaciones
+    evaluadas por segundo con su speedup respecto de K=1. La cota inferior
+    de la calidad la avanza la PD del thread principal, que no depende de K.
+
+    Returns:
+        dict: {'meta': {...}, 'scaling': [una fila por K]}
+    """
+    rows = []
+    for workers in worker_counts:
+        qualities, costs, rates = [], [], []
+        for seed in range(seeds):
+            algorithm = ParallelMatrixOptimizationAnytime(
+                workers=workers, num_matrices=num_matrices, size=50,
+                step_delay=sample_interval / 2, seed=seed)
+            samples = []
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                algorithm.start()
+                start = time.monotonic()
+                while time.monotonic() - start < duration and algorithm.running():
+                    time.sleep(sample_interval)
+                    samples.append(algorithm.current_solution().quality())
+                algorithm.stop()
+                elapsed = time.monotonic() - start
+            qualities.append(samples or [algorithm.current_solution().quality()])
+            costs.append(algorithm.current_solution().data['cost'])
+            rates.append(algorithm.evaluated_moves() / elapsed)
+        rows.append({
+            'workers': workers,
+            'costs': costs,
+            'final_quality_mean': float(np.mean([q[-1] for q in qualities])),
+            'mean_quality': float(np.mean([np.mean(q) for q in qualities])),
+            'moves_per_second': float(np.mean(rates)),
+        })
+
+    # Costos relativos al mejor costo visto por cada semilla
+    best = np.min([row['costs'] for row in rows], axis=0)
+    for row in rows:
+        row['cost_ratio_mean'] = float(np.mean(best / np.asarray(row.pop('costs'))))
+        row['speedup'] = row['moves_per_second'] / rows[0]['moves_per_second']
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'num_matrices': num_matrices,
+            'duration': duration,
+            'seeds': seeds,
+        },
+        'scaling': rows
+    }
+
+
+def print_scaling(report):
+    """Resumen legible de parallel_scaling()."""
+    print(f"{'workers':>8} {'moves/s':>12} {'speedup':>8} {'cost ratio':>11} "
+          f"{'mean q':>8} {'final q':>8}")
+    for row in report['scaling']:
+        print(f"{row['workers']:>8} {row['moves_per_second']:>12.0f} {row['speedup']:>8.2f} "
+              f"{row['cost_ratio_mean']:>11.5f} {row['mean_quality']:>8.4f} "
+              f"{row['final_quality_mean']:>8.4f}")
+
+
+# Configuración que debe coincidir para comparar dos resultados
+COMPARABLE_SETTINGS = ('delta_t', 'time_cost', 'seeds', 'max_ticks')
+
+
+def compare(baseline, current, tolerance=0.5, regret_tolerance=0.005, min_ticks=200):
+    """
+    Compara dos resultados de run_benchmark() y lista las regresiones:
+    overhead p50 que crece más de tolerance (relativo; el doble para p99)
+    o regret medio que crece más de regret_tolerance (absoluto). Los tiempos
+    de filas con menos de min_ticks mediciones son ruido y no se comparan.
+
+    Returns:
+        list: Un string por regresión encontrada
+    """
+    for setting in COMPARABLE_SETTINGS:
+        if baseline['meta'].get(setting) != current['meta'].get(setting):
+            raise ValueError(f"Resultados no comparables: '{setting}' difiere "
+                             f"({baseline['meta'].get(setting)} vs {current['meta'].get(setting)})")
+
+    key = lambda row: (row['workload'], row['predictor'], row['condition'])
+    previous = {key(row): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        name = '/'.join(key(row))
+        for metric, limit in (('overhead_p50_ns', tolerance), ('overhead_p99_ns', 2 * tolerance)):
+            if min(row['ticks'], old['ticks']) < min_ticks:
+                break
+            if old[metric] > 0 and row[metric] > old[metric] * (1 + limit):
+                regressions.append(f"{name}: {metric} {old[metric]:.0f} -> {row[metric]:.0f}")
+        if row['regret_mean'] > old['regret_mean'] + regret_tolerance:
+            regressions.append(f"{name}: regret_mean {old['regret_mean']:.4f} -> {row['regret_mean']:.4f}")
+    return regressions
+
+
+def print_table(report):
+    """Resumen legible de los resultados."""
+    print(f"{'workload':<24} {'predictor':<20} {'condition':<20} "
+          f"{'p50 ns':>8} {'p99 ns':>8} {'dec p50':>8} {'regret':>8} {'lag':>6}")
+    for row in report['results']:
+        print(f"{row['workload']:<24} {row['predictor']:<20} {row['condition']:<20} "
+              f"{row['overhead_p50_ns']:>8.0f} {row['overhead_p99_ns']:>8.0f} "
+              f"{row['decision_p50_ns']:>8.0f} {row['regret_mean']:>8.4f} "
+              f"{row['stop_lag_mean']:>6.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CARINA meta-level benchmark")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON results file ('-' for stdout)")
+    parser.add_argument('--seeds', type=int, default=3, help="traces per workload")
+    parser.add_argument('--max-ticks', type=int, default=200, help="ticks per recorded trace")
+    parser.add_argument('--delta-t', type=float, default=0.1, help="seconds per tick")
+    parser.add_argument('--time-cost', type=float, default=0.01, help="utility cost per tick")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repetitions per trace")
+    parser.add_argument('--quick', action='store_true', help="2 traces per workload, 1 repetition")
+    parser.add_argument('--compare', metavar='BASELINE', help="fail on regressions vs a previous results file")
+    parser.add_argument('--scaling', action='store_true',
+                        help="measure parallel multi-start scaling instead")
+    parser.add_argument('--workers', default='1,2,4,8',
+                        help="comma-separated worker counts for --scaling")
+    parser.add_argument('--matrices', type=int, default=300, help="chain length for --scaling")
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help="wall-clock seconds per worker count for --scaling")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.seeds, args.repeat = 2, 1
+
+    if args.scaling:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+        report = parallel_scaling(worker_counts, args.matrices, args.duration,
+                                  seeds=1 if args.quick else args.seeds)
+        if args.output == '-':
+            json.dump(report, sys.stdout, indent=2)
+        else:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print_scaling(report)
+            print(f"\nResults written to {args.output}")
+        return 0
+
+    workloads = default_workloads(seeds=args.seeds, max_ticks=args.max_ticks)
+    report = run_benchmark(workloads, delta_t=args.delta_t, time_cost=args.time_cost,
+                           repeat=args.repeat)
+    report['meta'].update(seeds=args.seeds, max_ticks=args.max_ticks)
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_table(report)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(baseline, report)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 2
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
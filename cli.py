@@ -0,0 +1,287 @@
+"""
+Línea de comandos headless de CARINA.
+
+Ejecuta una sola configuración (algoritmo anytime, predictor Φ y condición
+de parada C) bajo el meta-nivel de Svegliato, sin decoración de consola, y
+escribe el resultado como JSON. La configuración sale de un archivo JSON
+(--config) y/o de flags; los flags tienen prioridad.
+
+Los módulos pesados (NumPy, multiprocessing, el paquete algorithms) se
+importan recién al construir la configuración elegida: el tiempo hasta el
+primer tick del algoritmo es el de esos imports y nada más.
+
+Uso:
+    python cli.py --algorithm matrix -a num_matrices=40 --condition utility -c time_cost=0.02
+    python cli.py --condition quality_threshold,timeout -c timeout.max_time=3
+    python cli.py --config run.json --output result.json
+    python cli.py --algorithm trace -a path=trace.json --clock virtual
+
+Archivo de configuración:
+    {
+        "algorithm": {"name": "matrix", "params": {"num_matrices": 40, "seed": 1}},
+        "predictor": "linear_regression",
+        "condition": {"name": "composite", "conditions": [
+            {"name": "quality_threshold", "params": {"target_quality": 0.95}},
+            {"name": "timeout", "params": {"max_time": 3}}
+        ]},
+        "delta_t": 0.1,
+        "backend": "thread",
+        "clock": "real"
+    }
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import importlib
+import contextlib
+
+_IMPORTED_AT = time.perf_counter()
+
+# Nombre en la línea de comandos -> (módulo, clase); se importan al usarse
+ALGORITHMS = {
+    'matrix': ('algorithms.matrix_optimization', 'MatrixOptimizationAnytime'),
+    'parallel_matrix': ('algorithms.parallel_matrix_optimization', 'ParallelMatrixOptimizationAnytime'),
+    'pi': ('algorithms.matrix_optimization', 'IterativeRefinementAnytime'),
+    'trace': ('algorithms.trace_replay', 'TraceReplayAnytime'),
+}
+
+PREDICTORS = {
+    'linear_regression': ('algorithms.performance_predictor', 'LinearRegressionPredictor'),
+    'diminishing_returns': ('algorithms.performance_predictor', 'DiminishingReturnsPredictor'),
+    'moving_average': ('algorithms.performance_predictor', 'MovingAveragePredictor'),
+    'curve_fit': ('algorithms.performance_predictor', 'CurveFitPredictor'),
+    'profile': ('algorithms.performance_predictor', 'ProfilePredictor'),
+}
+
+CONDITIONS = {
+    'utility': ('algorithms.stopping_condition', 'UtilityBasedStoppingCondition'),
+    'diminishing_returns': ('algorithms.stopping_condition', 'DiminishingReturnsStoppingCondition'),
+    'timeout': ('algorithms.stopping_condition', 'TimeoutStoppingCondition'),
+    'quality_threshold': ('algorithms.stopping_condition', 'QualityThresholdStoppingCondition'),
+    'policy': ('algorithms.stopping_condition', 'PolicyTableStoppingCondition'),
+}
+
+BACKENDS = ('thread', 'process')
+CLOCKS = ('real', 'virtual')
+
+DEFAULTS = {
+    'algorithm': {'name': 'matrix', 'params': {}},
+    'predictor': {'name': 'linear_regression', 'params': {}},
+    'condition': {'name': 'utility', 'params': {}},
+    'delta_t': 0.1,
+    'backend': 'thread',
+    'clock': 'real',
+}
+
+
+def _load_class(registry, kind, name):
+    if name not in registry:
+        raise ValueError(f"{kind} desconocido: {name!r} (opciones: {', '.join(sorted(registry))})")
+    module, attribute = registry[name]
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _construct(cls, params):
+    try:
+        return cls(**params)
+    except TypeError as exc:
+        # Parámetros mal escritos: error de configuración, no un fallo interno
+        raise ValueError(f"{cls.__name__}: {exc}") from exc
+
+
+def _parse_value(text):
+    """Valor de un parámetro key=value: JSON si se puede, si no el texto."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_params(items):
+    params = {}
+    for item in items or ():
+        key, sep, value = item.partition('=')
+        if not sep or not key:
+            raise ValueError(f"Parámetro inválido {item!r}: se espera clave=valor")
+        params[key] = _parse_value(value)
+    return params
+
+
+def _normalize(spec):
+    """Acepta 'nombre' o {'name': ..., 'params': {...}} (y 'conditions' en compuestas)."""
+    if isinstance(spec, str):
+        return {'name': spec, 'params': {}}
+    spec = dict(spec)
+    spec.setdefault('params', {})
+    if 'conditions' in spec:
+        spec['name'] = 'composite'
+        spec['conditions'] = [_normalize(c) for c in spec['conditions']]
+    return spec
+
+
+def _merge(config, name, params):
+    """Aplica a una entrada de la configuración el nombre y los parámetros de los flags."""
+    if name is not None:
+        if ',' in name:
+            config = {'name': 'composite', 'params': {},
+                      'conditions': [_normalize(n) for n in name.split(',')]}
+        elif name != config['name']:
+            config = {'name': name, 'params': {}}
+    if config.get('conditions'):
+        # En compuestas, 'timeout.max_time=3' va a la subcondición 'timeout'
+        for key, value in params.items():
+            target, sep, key = key.rpartition('.')
+            matches = [c for c in config['conditions'] if not sep or c['name'] == target]
+            if not matches:
+                raise ValueError(f"Ninguna subcondición se llama {target!r}")
+            for condition in matches:
+                condition['params'][key] = value
+    else:
+        config['params'].update(params)
+    return config
+
+
+def resolve_config(args):
+    """Configuración final: valores por defecto < archivo --config < flags."""
+    config = json.loads(json.dumps(DEFAULTS))
+    if args.config:
+        with open(args.config) as f:
+            loaded = json.load(f)
+        unknown = set(loaded) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Claves desconocidas en {args.config}: {', '.join(sorted(unknown))}")
+        for key, value in loaded.items():
+            config[key] = _normalize(value) if key in ('algorithm', 'predictor', 'condition') else value
+
+    config['algorithm'] = _merge(config['algorithm'], args.algorithm, _parse_params(args.algorithm_param))
+    config['predictor'] = _merge(config['predictor'], args.predictor, _parse_params(args.predictor_param))
+    config['condition'] = _merge(config['condition'], args.condition, _parse_params(args.condition_param))
+    if args.delta_t is not None:
+        config['delta_t'] = args.delta_t
+    if args.backend is not None:
+        config['backend'] = args.backend
+    if args.clock is not None:
+        config['clock'] = args.clock
+    if config['clock'] not in CLOCKS:
+        raise ValueError(f"Reloj desconocido: {config['clock']!r} (opciones: {', '.join(CLOCKS)})")
+    if config['backend'] not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {config['backend']!r} (opciones: {', '.join(BACKENDS)})")
+    if config['delta_t'] <= 0:
+        raise ValueError("delta_t debe ser positivo")
+    return config
+
+
+def build_algorithm(config):
+    spec = config['algorithm']
+    algorithm = _construct(_load_class(ALGORITHMS, 'Algoritmo', spec['name']), spec['params'])
+    if config['backend'] == 'process':
+        from algorithms.process_anytime import ProcessAnytimeAlgorithm
+        algorithm = ProcessAnytimeAlgorithm(algorithm)
+    return algorithm
+
+
+def build_predictor(config):
+    spec = config['predictor']
+    return _construct(_load_class(PREDICTORS, 'Predictor', spec['name']), spec['params'])
+
+
+def build_condition(spec):
+    if spec['name'] == 'composite':
+        from algorithms.stopping_condition import CompositeStoppingCondition
+        if not spec.get('conditions'):
+            raise ValueError("Una condición compuesta necesita 'conditions'")
+        return CompositeStoppingCondition([build_condition(c) for c in spec['conditions']])
+    return _construct(_load_class(CONDITIONS, 'Condición', spec['name']), spec['params'])
+
+
+def _jsonable(value):
+    # Escalares y arrays de NumPy sin importar NumPy
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def run(config):
+    """
+    Ejecuta una configuración y retorna el resultado como diccionario.
+    Toda la salida por consola del meta-nivel y del algoritmo se descarta.
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        from metalevel import MetaReasoner
+        algorithm = build_algorithm(config)
+        predictor = build_predictor(config)
+        condition = build_condition(config['condition'])
+        clock = None
+        if config['clock'] == 'virtual':
+            from algorithms.clock import VirtualClock
+            clock = VirtualClock()
+        reasoner = MetaReasoner("cli")
+        setup = time.perf_counter()
+        solution = reasoner.svegliato_algorithm(algorithm, predictor, condition,
+                                                delta_t=config['delta_t'], clock=clock)
+    wall_end = time.perf_counter()
+
+    result = {
+        'config': config,
+        'quality': solution.quality() if solution is not None else None,
+        'version': getattr(solution, 'version', None),
+        'data': solution.data if solution is not None else None,
+        'stop': reasoner.last_run,
+        'wall_time': wall_end - wall_start,
+        'cpu_time': time.process_time() - cpu_start,
+        'setup_ms': (setup - _IMPORTED_AT) * 1000.0,
+    }
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run one CARINA meta-level configuration and print a JSON result")
+    parser.add_argument('--config', metavar='FILE', help="JSON configuration file (flags override it)")
+    parser.add_argument('--algorithm', help=f"one of: {', '.join(ALGORITHMS)}")
+    parser.add_argument('--predictor', help=f"one of: {', '.join(PREDICTORS)}")
+    parser.add_argument('--condition',
+                        help=f"one of: {', '.join(CONDITIONS)}; a comma list builds a composite")
+    parser.add_argument('-a', '--algorithm-param', action='append', metavar='KEY=VALUE',
+                        help="algorithm constructor argument (JSON value), repeatable")
+    parser.add_argument('-p', '--predictor-param', action='append', metavar='KEY=VALUE',
+                        help="predictor constructor argument, repeatable")
+    parser.add_argument('-c', '--condition-param', action='append', metavar='KEY=VALUE',
+                        help="condition argument; use NAME.KEY=VALUE inside a composite")
+    parser.add_argument('--delta-t', type=float, help="meta-level check interval in seconds")
+    parser.add_argument('--backend', choices=BACKENDS, help="run the algorithm in a thread or a process")
+    parser.add_argument('--clock', choices=CLOCKS,
+                        help="real time, or a virtual clock that skips every wait")
+    parser.add_argument('--output', metavar='FILE', help="write the JSON result to FILE instead of stdout")
+    parser.add_argument('--indent', type=int, default=None, help="JSON indentation (default: one line)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Sin decoración: solo advertencias y errores, por stderr
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(message)s', stream=sys.stderr)
+    try:
+        config = resolve_config(args)
+        result = run(config)
+    except (ValueError, OSError) as exc:
+        parser.exit(2, f"{parser.prog}: error: {exc}\n")
+
+    text = json.dumps(result, default=_jsonable, indent=args.indent)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
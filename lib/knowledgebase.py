@@ -0,0 +1,256 @@
+import os
+import json
+import math
+import bisect
+import numpy as np
+
+class _NumericColumn:
+    """
+    Índice ordenado de un atributo numérico: valores y ids de hechos en
+    arrays ordenados por valor. Las inserciones se acumulan y se fusionan
+    en bloque en la siguiente consulta.
+    """
+
+    def __init__(self, values=None, ids=None):
+        self.values = values if values is not None else np.zeros(0)
+        self.ids = ids if ids is not None else np.zeros(0, dtype=np.int64)
+        self._pending_values = []
+        self._pending_ids = []
+
+    def add(self, value, fact_id):
+        self._pending_values.append(value)
+        self._pending_ids.append(fact_id)
+
+    def _merge(self):
+        if not self._pending_values:
+            return
+        values = np.concatenate((self.values, self._pending_values))
+        ids = np.concatenate((self.ids, np.asarray(self._pending_ids, dtype=np.int64)))
+        order = np.argsort(values, kind='stable')
+        self.values = values[order]
+        self.ids = ids[order]
+        self._pending_values = []
+        self._pending_ids = []
+
+    def range_ids(self, low, high):
+        """Ids con low <= valor < high (None = sin límite)."""
+        self._merge()
+        start = 0 if low is None else np.searchsorted(self.values, low, side='left')
+        end = len(self.values) if high is None else np.searchsorted(self.values, high, side='left')
+        return self.ids[start:end]
+
+
+class KnowledgeBase:
+    """
+    Base de conocimiento indexada.
+
+    Los hechos son strings como 'matrix_optimization_cost_123.45': lo que
+    sigue al último '_' es el valor y lo anterior el predicado. Si el valor
+    es numérico se guarda tipado en un índice ordenado, para consultas por
+    rango. Además mantiene:
+    - búsqueda exacta por hash (O(1)),
+    - índice por predicado,
+    - índice de prefijos (lista ordenada, construida al consultar).
+
+    Conserva la interfaz de lista que usaba el Reasoner (append, in, len,
+    iteración en orden de inserción): append() agrega siempre, como una
+    lista, incluso un hecho repetido; add() solo agrega hechos nuevos.
+    """
+
+    def __init__(self, facts=None):
+        self._facts = []
+        self._ids = {}
+        self._predicates = []
+        self._predicate_codes = {}
+        self._fact_predicates = []
+        self._values = []
+        self._by_predicate = {}
+        self._numeric = {}
+        self._sorted_facts = None
+        if facts:
+            self.add_many(facts)
+
+    @staticmethod
+    def parse(fact):
+        """
+        Separa un hecho en (predicado, valor).
+
+        Returns:
+            tuple: (predicate, value) con value float, o None si no es
+                   numérico ('nan' e 'inf' no cuentan como números)
+        """
+        predicate, sep, tail = fact.rpartition('_')
+        if not sep:
+            return fact, None
+        try:
+            value = float(tail)
+        except ValueError:
+            return predicate, None
+        return predicate, value if math.isfinite(value) else None
+
+    def add(self, fact):
+        """
+        Agrega un hecho. Retorna True si era nuevo.
+        """
+        if fact in self._ids:
+            return False
+        self.append(fact)
+        return True
+
+    def append(self, fact):
+        """
+        Agrega un hecho al final, como list.append: un hecho repetido
+        vuelve a agregarse (y a indexarse).
+        """
+        if not fact or '\n' in fact:
+            raise ValueError("Un hecho debe ser un string no vacío y sin saltos de línea")
+
+        fact_id = len(self._facts)
+        predicate, value = self.parse(fact)
+        code = self._predicate_code(predicate)
+
+        self._facts.append(fact)
+        self._ids.setdefault(fact, fact_id)
+        self._fact_predicates.append(code)
+        self._values.append(value)
+        self._by_predicate.setdefault(code, []).append(fact_id)
+        if value is not None:
+            self._numeric.setdefault(code, _NumericColumn()).add(value, fact_id)
+        self._sorted_facts = None
+
+    def add_many(self, facts):
+        """
+        Inserción en bloque: los índices ordenados se reconstruyen una sola
+        vez, en la siguiente consulta.
+
+        Returns:
+            int: Cantidad de hechos nuevos
+        """
+        added = 0
+        for fact in facts:
+            added += self.add(fact)
+        return added
+
+    def __contains__(self, fact):
+        return fact in self._ids
+
+    def __len__(self):
+        return len(self._facts)
+
+    def __iter__(self):
+        return iter(self._facts)
+
+    def __getitem__(self, index):
+        return self._facts[index]
+
+    def __repr__(self):
+        return f"KnowledgeBase({len(self._facts)} facts)"
+
+    def with_predicate(self, predicate):
+        """Hechos con el predicado dado, en orden de inserción."""
+        code = self._predicate_codes.get(predicate)
+        if code is None:
+            return []
+        return [self._facts[i] for i in self._by_predicate.get(code, [])]
+
+    def with_prefix(self, prefix):
+        """Hechos que comienzan con el prefijo dado, en orden alfabético."""
+        if self._sorted_facts is None:
+            self._sorted_facts = sorted(self._facts)
+        start = bisect.bisect_left(self._sorted_facts, prefix)
+        result = []
+        for fact in self._sorted_facts[start:]:
+            if not fact.startswith(prefix):
+                break
+            result.append(fact)
+        return result
+
+    def value(self, fact):
+        """Valor numérico de un hecho (None si no es numérico o no existe)."""
+        fact_id = self._ids.get(fact)
+        return None if fact_id is None else self._values[fact_id]
+
+    def range_query(self, predicate, low=None, high=None):
+        """
+        Hechos del predicado con low <= valor < high, ordenados por valor.
+        Por ejemplo range_query('matrix_optimization_cost', high=500).
+        """
+        code = self._predicate_codes.get(predicate)
+        if code is None or code not in self._numeric:
+            return []
+        return [self._facts[i] for i in self._numeric[code].range_ids(low, high)]
+
+    def save(self, directory):
+        """
+        Guarda la base en un directorio:
+        - facts.txt: hechos en UTF-8, uno por línea
+        - predicates.json: nombres de predicados
+        - fact_predicates.npy, values.npy: columnas por hecho
+        - numeric_*.npy: índices numéricos ya ordenados por (predicado, valor)
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'facts.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self._facts))
+        with open(os.path.join(directory, 'predicates.json'), 'w', encoding='utf-8') as f:
+            json.dump(self._predicates, f)
+
+        codes = np.asarray(self._fact_predicates, dtype=np.int64)
+        values = np.array([np.nan if v is None else v for v in self._values], dtype=np.float64)
+        np.save(os.path.join(directory, 'fact_predicates.npy'), codes)
+        np.save(os.path.join(directory, 'values.npy'), values)
+
+        numeric = np.flatnonzero(~np.isnan(values))
+        order = numeric[np.lexsort((values[numeric], codes[numeric]))]
+        offsets = np.searchsorted(codes[order], np.arange(len(self._predicates) + 1))
+        np.save(os.path.join(directory, 'numeric_ids.npy'), order)
+        np.save(os.path.join(directory, 'numeric_values.npy'), values[order])
+        np.save(os.path.join(directory, 'numeric_offsets.npy'), offsets)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Carga una base guardada con save(). Los hechos se leen en bloque y
+        los índices numéricos se usan directamente desde los archivos
+        (mapeados en memoria con mmap=True), sin reinsertar hecho por hecho.
+        """
+        mode = 'r' if mmap else None
+        kb = cls()
+        with open(os.path.join(directory, 'facts.txt'), encoding='utf-8') as f:
+            text = f.read()
+        with open(os.path.join(directory, 'predicates.json'), encoding='utf-8') as f:
+            kb._predicates = json.load(f)
+
+        kb._facts = text.split('\n') if text else []
+        # Con hechos repetidos (append) gana el primer id, como en append():
+        # recorrer al revés deja la primera aparición como última asignación
+        kb._ids = dict(zip(reversed(kb._facts), range(len(kb._facts) - 1, -1, -1)))
+        kb._predicate_codes = {name: code for code, name in enumerate(kb._predicates)}
+
+        codes = np.load(os.path.join(directory, 'fact_predicates.npy'))
+        values = np.load(os.path.join(directory, 'values.npy'), mmap_mode=mode)
+        kb._fact_predicates = codes.tolist()
+        kb._values = [None if v != v else v for v in values.tolist()]
+
+        # Índice por predicado: agrupar ids por código en un solo paso
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(kb._predicates) + 1))
+        for code in range(len(kb._predicates)):
+            if bounds[code] < bounds[code + 1]:
+                kb._by_predicate[code] = order[bounds[code]:bounds[code + 1]].tolist()
+
+        numeric_ids = np.load(os.path.join(directory, 'numeric_ids.npy'), mmap_mode=mode)
+        numeric_values = np.load(os.path.join(directory, 'numeric_values.npy'), mmap_mode=mode)
+        offsets = np.load(os.path.join(directory, 'numeric_offsets.npy'))
+        for code in range(len(kb._predicates)):
+            start, end = offsets[code], offsets[code + 1]
+            if start < end:
+                kb._numeric[code] = _NumericColumn(numeric_values[start:end], numeric_ids[start:end])
+        return kb
+
+    def _predicate_code(self, predicate):
+        code = self._predicate_codes.get(predicate)
+        if code is None:
+            code = len(self._predicates)
+            self._predicates.append(predicate)
+            self._predicate_codes[predicate] = code
+        return code
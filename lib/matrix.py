@@ -1,17 +1,59 @@
-import random
+import numpy as np
 
 class Matrix:
     def __init__(self, rows, cols):
         self.rows = rows
         self.cols = cols
-        self.data = [[0 for _ in range(cols)] for _ in range(rows)]
+        # Almacenamiento contiguo en float64 (o un memmap, ver open_memmap)
+        self._array = np.zeros((rows, cols))
+
+    @property
+    def data(self):
+        return self._array
+
+    @data.setter
+    def data(self, values):
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        if array.shape != (self.rows, self.cols):
+            raise ValueError(f"Se esperaban datos de {self.rows}x{self.cols}, se recibió {array.shape}")
+        self._array = array
+
+    @classmethod
+    def from_array(cls, array):
+        """Crea una matriz a partir de un array 2-D (sin copiar si ya es float64 contiguo)."""
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        if array.ndim != 2:
+            raise ValueError("Se esperaba un array de 2 dimensiones")
+        matrix = cls.__new__(cls)
+        matrix.rows, matrix.cols = array.shape
+        matrix._array = array
+        return matrix
+
+    @classmethod
+    def open_memmap(cls, path, rows=None, cols=None, mode='r'):
+        """
+        Abre (o crea, con mode='w+') una matriz en disco en formato .npy,
+        mapeada en memoria: solo se leen las páginas que se usan.
+        """
+        if mode == 'w+':
+            array = np.lib.format.open_memmap(path, mode=mode, dtype=np.float64, shape=(rows, cols))
+        else:
+            array = np.load(path, mmap_mode=mode)
+        matrix = cls.__new__(cls)
+        matrix.rows, matrix.cols = array.shape
+        matrix._array = array
+        return matrix
+
+    def save(self, path):
+        """Guarda la matriz en formato .npy."""
+        np.save(path, self._array)
 
     def randomize(self):
-        self.data = [[random.random() for _ in range(self.cols)] for _ in range(self.rows)]
+        self._array = np.random.random((self.rows, self.cols))
 
     def print(self):
         # A simple print format, not as neat as console.table
-        for row in self.data:
+        for row in self._array:
             print(" ".join(f"{x:.4f}" for x in row))
         print()
 
@@ -19,12 +61,71 @@ class Matrix:
     def multiply(a, b):
         if a.cols != b.rows:
             raise ValueError("Las columnas de A deben coincidir con las filas de B")
-        
-        result = Matrix(a.rows, b.cols)
-        for i in range(result.rows):
-            for j in range(result.cols):
-                sum_val = 0
-                for k in range(a.cols):
-                    sum_val += a.data[i][k] * b.data[k][j]
-                result.data[i][j] = sum_val
-        return result
+
+        # Producto vía BLAS
+        return Matrix.from_array(a._array @ b._array)
+
+    @staticmethod
+    def chain_multiply(matrices, parenthesization=None):
+        """
+        Multiplica una cadena de matrices en el orden indicado.
+
+        Args:
+            matrices: Lista de Matrix [A0, A1, ..., An-1]
+            parenthesization: Tuplas anidadas de índices, por ejemplo
+                ((0, 1), 2) para (A0·A1)·A2 (como la que retorna
+                MatrixOptimizationAnytime.parenthesization()).
+                None = de izquierda a derecha.
+        """
+        if not matrices:
+            raise ValueError("La cadena de matrices está vacía")
+        if parenthesization is None:
+            result = matrices[0]
+            for matrix in matrices[1:]:
+                result = Matrix.multiply(result, matrix)
+            return result
+
+        def evaluate(node):
+            if isinstance(node, (int, np.integer)):
+                return matrices[node]
+            left, right = node
+            return Matrix.multiply(evaluate(left), evaluate(right))
+
+        return evaluate(parenthesization)
+
+    @staticmethod
+    def blocked_multiply(a, b, out=None, block_size=1024):
+        """
+        Multiplicación por bloques para matrices que no caben en RAM.
+
+        Con a y b abiertas con open_memmap, solo se mantienen en memoria
+        los bloques en uso: un bloque de salida y un par de bloques de
+        entrada a la vez.
+
+        Args:
+            a, b: Matrices de entrada (normalmente mapeadas en disco)
+            out: Matrix de salida de a.rows x b.cols (por ejemplo, creada con
+                 open_memmap(path, rows, cols, mode='w+')); None = en memoria
+            block_size: Lado de los bloques
+        """
+        if a.cols != b.rows:
+            raise ValueError("Las columnas de A deben coincidir con las filas de B")
+        if out is None:
+            out = Matrix(a.rows, b.cols)
+        elif (out.rows, out.cols) != (a.rows, b.cols):
+            raise ValueError("La matriz de salida no tiene las dimensiones del producto")
+
+        A, B, C = a._array, b._array, out._array
+        for i in range(0, a.rows, block_size):
+            i_end = min(i + block_size, a.rows)
+            for j in range(0, b.cols, block_size):
+                j_end = min(j + block_size, b.cols)
+                block = np.zeros((i_end - i, j_end - j))
+                for k in range(0, a.cols, block_size):
+                    k_end = min(k + block_size, a.cols)
+                    block += A[i:i_end, k:k_end] @ B[k:k_end, j:j_end]
+                C[i:i_end, j:j_end] = block
+
+        if isinstance(C, np.memmap):
+            C.flush()
+        return out
@@ -1,17 +1,72 @@
-import math
+import os
+import numpy as np
 
 class NeuralNetwork:
-    def __init__(self, input_nodes, hidden_nodes, output_nodes):
+    # Parámetros persistidos por save()/load(), uno por archivo .npy
+    _PARAMETERS = ('weights_ih', 'bias_h', 'weights_ho', 'bias_o')
+
+    def __init__(self, input_nodes, hidden_nodes, output_nodes, seed=None):
         self.input_nodes = input_nodes
         self.hidden_nodes = hidden_nodes
         self.output_nodes = output_nodes
 
+        # Pesos con inicialización de Glorot (uniforme); se multiplican como
+        # entradas @ pesos, de modo que cada fila es una muestra
+        rng = np.random.default_rng(seed)
+        limit_h = np.sqrt(6.0 / (input_nodes + hidden_nodes))
+        limit_o = np.sqrt(6.0 / (hidden_nodes + output_nodes))
+        self.weights_ih = rng.uniform(-limit_h, limit_h, (input_nodes, hidden_nodes))
+        self.bias_h = np.zeros(hidden_nodes)
+        self.weights_ho = rng.uniform(-limit_o, limit_o, (hidden_nodes, output_nodes))
+        self.bias_o = np.zeros(output_nodes)
+
     # función de activación
     def sigmoid(self, x):
-        return 1 / (1 + math.exp(-x))
+        # forma estable: exp() solo recibe valores <= 0, sin overflow
+        e = np.exp(-np.abs(x))
+        return np.where(x >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
 
     def feed_forward(self, inputs):
-        # aquí hacemos un cálculo muy simplificado
-        hidden = [self.sigmoid(v) for v in inputs]
-        output = sum(hidden) / len(hidden)
-        return [output] # salida como lista
+        """
+        Propaga entradas por la red.
+
+        Args:
+            inputs: Una muestra (lista de input_nodes valores) o un lote
+                    2-D de forma (muestras, input_nodes)
+
+        Returns:
+            Lista de output_nodes valores para una muestra, o un array de
+            forma (muestras, output_nodes) para un lote
+        """
+        x = np.asarray(inputs, dtype=np.float64)
+        single = x.ndim == 1
+        if single:
+            x = x[np.newaxis, :]
+        if x.ndim != 2 or x.shape[1] != self.input_nodes:
+            raise ValueError(f"Se esperaban entradas con {self.input_nodes} valores por muestra")
+
+        # un producto matricial por capa para todo el lote
+        hidden = self.sigmoid(x @ self.weights_ih + self.bias_h)
+        output = self.sigmoid(hidden @ self.weights_ho + self.bias_o)
+        return output[0].tolist() if single else output
+
+    def save(self, directory):
+        """Guarda los pesos en un directorio, un archivo .npy por parámetro."""
+        os.makedirs(directory, exist_ok=True)
+        for name in self._PARAMETERS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Carga pesos guardados con save(). Con mmap=True los archivos se
+        mapean en memoria en lugar de leerse, así que los modelos grandes
+        quedan listos sin copiar sus pesos.
+        """
+        network = cls.__new__(cls)
+        for name in cls._PARAMETERS:
+            path = os.path.join(directory, f"{name}.npy")
+            setattr(network, name, np.load(path, mmap_mode='r' if mmap else None))
+        network.input_nodes, network.hidden_nodes = network.weights_ih.shape
+        network.output_nodes = network.weights_ho.shape[1]
+        return network
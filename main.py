@@ -1,4 +1,6 @@
-from objectlevel import Reasoner
+import os
+import sys
+import logging
 
 def main():
     """
@@ -6,7 +8,27 @@ def main():
     
     Ahora incluye demostraciones del Algoritmo 1 de Svegliato para
     meta-level control de algoritmos anytime con predicción de performance online.
+    
+    Con argumentos, ejecuta una sola configuración sin decoración y escribe
+    el resultado como JSON (ver cli.py).
     """
+    if len(sys.argv) > 1:
+        import cli
+        return cli.main(sys.argv[1:])
+    
+    # El nivel de objeto importa todo el paquete: solo para la demo
+    from objectlevel import Reasoner
+    from algorithms.tracing import tracer
+    
+    # Los mensajes por iteración usan logging: subir el nivel a WARNING
+    # los silencia sin costo de formateo
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
+    # CARINA_TRACE=archivo.json registra la ejecución en formato Chrome trace
+    trace_path = os.environ.get('CARINA_TRACE')
+    if trace_path:
+        tracer.enable()
+    
     print("\n")
     print("╔════════════════════════════════════════════════════════════╗")
     print("║                                                            ║")
@@ -23,6 +45,10 @@ def main():
     r = Reasoner("svegliato_demo")
     r.run()
     
+    if trace_path:
+        count = tracer.export_chrome_trace(trace_path)
+        print(f"Trace: {count} events written to {trace_path}")
+    
     print("\n")
     print("╔════════════════════════════════════════════════════════════╗")
     print("║                                                            ║")
@@ -32,4 +58,4 @@ def main():
     print("\n")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,4 +1,148 @@
+import os
 import time
+import logging
+import contextlib
+from algorithms.tracing import tracer
+from algorithms.quality_history import QualityHistory
+from algorithms.clock import real_clock, VirtualClock
+
+logger = logging.getLogger(__name__)
+
+class _Monitor:
+    """
+    Estado del meta-nivel sobre un algoritmo: el historial ~h, Φ y C.
+    
+    Solo registra (t, q) cuando llega una solución nueva (otra versión);
+    mientras tanto reutiliza la última predicción y la última decisión, y
+    solo reevalúa C si la condición depende del tiempo.
+    """
+    
+    def __init__(self, performance_predictor, stopping_condition, history_capacity, start_time,
+                 delta_t=None):
+        self.predictor = performance_predictor
+        self.stopping_condition = stopping_condition
+        self.history = QualityHistory(history_capacity)
+        self.start_time = start_time
+        # Los predictores incrementales (update/predict) evitan recalcular
+        # sobre todo el historial en cada tick
+        self.streaming = hasattr(performance_predictor, 'update')
+        if self.streaming:
+            # Las muestras llegan espaciadas: Φ las ubica en ticks de Δt
+            # según su instante
+            performance_predictor.delta_t = delta_t
+            performance_predictor.reset()
+        self.time_dependent = getattr(stopping_condition, 'time_dependent', True)
+        self.solution = None
+        self.version = None
+        self.q = None
+        self.predictions = None
+        self.decision = False
+    
+    def observe(self, alpha, t):
+        """
+        Incorpora la solución observada en el instante t.
+        
+        Returns:
+            bool: True si era una solución nueva
+        """
+        version = getattr(alpha, 'version', None)
+        if alpha is self.solution or (version is not None and version == self.version):
+            if self.time_dependent:
+                self.decision = MetaReasoner._decide(self.stopping_condition, self.predictions, self.q, t)
+            return False
+        
+        self.solution = alpha
+        self.version = version
+        self.q = alpha.quality()
+        # El instante de publicación, si la solución lo trae, es más preciso
+        # que el del chequeo
+        timestamp = getattr(alpha, 'timestamp', None)
+        sample_time = t if timestamp is None else timestamp - self.start_time
+        self.history.append(self.q, sample_time)
+        self.predictions = MetaReasoner._predict(self.predictor, self.history, self.q,
+                                                 self.streaming, sample_time)
+        self.decision = MetaReasoner._decide(self.stopping_condition, self.predictions, self.q, t)
+        return True
+
+
+class PortfolioJob:
+    """
+    Un algoritmo anytime dentro de un portafolio, con su predictor y su
+    condición de parada, y el estado que el meta-nivel lleva sobre él.
+    """
+    
+    def __init__(self, name, anytime_algorithm, performance_predictor, stopping_condition):
+        self.name = name
+        self.algorithm = anytime_algorithm
+        self.predictor = performance_predictor
+        self.stopping_condition = stopping_condition
+        self.reset()
+    
+    def reset(self):
+        self.history = QualityHistory()
+        self.cpu_time = 0.0
+        self.solution = None
+        self.seen_version = None
+        # Checkpoint de un trabajo suspendido (sin thread) por el portafolio
+        self.checkpoint = None
+        self.predictions = None
+        # Sin observaciones suficientes la utilidad marginal es optimista,
+        # para que cada trabajo reciba al menos un intervalo
+        self.marginal_utility = float('inf')
+        if hasattr(self.predictor, 'update'):
+            self.predictor.reset()
+    
+    def observe(self, slice_cost):
+        """
+        Incorpora la solución actual si cambió, actualiza la utilidad
+        marginal estimada y evalúa la condición de parada.
+        
+        Args:
+            slice_cost: Costo de asignar otro intervalo Δt
+            
+        Returns:
+            bool: True si la condición de parada se cumple
+        """
+        time_dependent = getattr(self.stopping_condition, 'time_dependent', True)
+        version = self.algorithm.solution_version()
+        if version == self.seen_version:
+            # Sin solución nueva se reutilizan las predicciones; solo una
+            # condición que depende del tiempo puede cambiar de decisión
+            # (también si el trabajo quedó estancado en su primera solución)
+            if self.predictions is None or not time_dependent:
+                return False
+            return MetaReasoner._decide(self.stopping_condition, self.predictions,
+                                        self.solution.quality(), self.cpu_time)
+        self.seen_version = version
+        
+        alpha = self.algorithm.current_solution()
+        if alpha is None:
+            return False
+        self.solution = alpha
+        q = alpha.quality()
+        self.history.append(q, self.cpu_time)
+        
+        predictions = MetaReasoner._predict(self.predictor, self.history, q,
+                                            hasattr(self.predictor, 'update'), self.cpu_time)
+        self.predictions = predictions
+        
+        # Con una sola observación el trabajo aún no avanzó: la utilidad
+        # marginal no tiene información, y la decisión solo se pide a una
+        # condición que depende del tiempo, igual que sin solución nueva
+        if len(self.history) < 2:
+            if not time_dependent:
+                return False
+        elif predictions:
+            self.marginal_utility = predictions[0] - q - slice_cost
+        
+        return MetaReasoner._decide(self.stopping_condition, predictions, q, self.cpu_time)
+    
+    def finish(self, solution, reason):
+        self.solution = solution
+        quality = solution.quality() if solution else 0.0
+        print(f"[Portfolio] {self.name}: {reason} "
+              f"(quality={quality:.4f}, cpu={self.cpu_time:.2f}s)")
+
 
 class MetaReasoner:
     def __init__(self, mode):
@@ -10,14 +154,17 @@ class MetaReasoner:
         """
         self._version = "CARINA meta-reasoner version 0.3 (Python - Svegliato Algorithm)"
         self._mode = mode
-
+        # Resumen de la última ejecución de svegliato_algorithm (o su variante async)
+        self.last_run = None
+    
     def knowledge_test(self, fact_to_check, knowledge_base):
         """
         Realiza la tarea de razonamiento fundamental: verificar si un hecho existe en la base de conocimiento.
         
         Args:
             fact_to_check (str): El hecho que se quiere verificar.
-            knowledge_base (list): La base de conocimiento (una lista de strings) del Nivel de Objeto.
+            knowledge_base (KnowledgeBase): La base de conocimiento del Nivel de Objeto
+                (búsqueda exacta O(1); también acepta una lista de strings).
             
         Returns:
             bool: True si el hecho se encuentra, False en caso contrario.
@@ -30,9 +177,10 @@ class MetaReasoner:
         else:
             print(f"Meta-level: -> FAILURE: Fact '{fact_to_check}' not found in knowledge base.")
             return False
-
+    
     def svegliato_algorithm(self, anytime_algorithm, performance_predictor, 
-                           stopping_condition, delta_t=0.1):
+                           stopping_condition, delta_t=0.1, history_capacity=1024,
+                           clock=None):
         """
         Implementación del Algoritmo 1 de Svegliato:
         "Meta-Level Control of Anytime Algorithms with Online Performance Prediction"
@@ -42,6 +190,10 @@ class MetaReasoner:
             performance_predictor: Instancia de PerformancePredictor (Φ)
             stopping_condition: Instancia de StoppingCondition (C)
             delta_t: Duración entre chequeos (Δt)
+            history_capacity: Calidades recientes guardadas completas en ~h
+            clock: Reloj del meta-nivel y del algoritmo (None = el del
+                   algoritmo). Con un VirtualClock la ejecución es de
+                   eventos discretos: misma lógica de decisión, sin esperas
             
         Returns:
             Solution: La solución final
@@ -50,68 +202,334 @@ class MetaReasoner:
         print(f"META-LEVEL: Starting Svegliato Algorithm 1")
         print(f"{'='*60}")
         
+        if clock is not None:
+            anytime_algorithm.set_clock(clock)
+        clock = getattr(anytime_algorithm, 'clock', real_clock)
+        
         # Línea 1: t ← 0
         t = 0.0
-        start_time = time.time()
+        start_time = clock.now()
         
-        # Línea 2: ~h ← [ ]
-        history = []
+        # Línea 2: ~h ← [ ] (acotado: las muestras viejas se resumen)
+        monitor = _Monitor(performance_predictor, stopping_condition, history_capacity, start_time,
+                           delta_t)
         
         # Línea 3: A.Start()
         anytime_algorithm.start()
         print(f"[t={t:.2f}s] Object-level algorithm started")
         
+        # Si el algoritmo notifica sus publicaciones, el meta-nivel despierta
+        # en cuanto cambia la solución; Δt queda como espera máxima
+        event_driven = hasattr(anytime_algorithm, 'wait_for_update')
+        seen_version = None
+        
         # Línea 4: while A.Running() do
         iteration = 0
         while anytime_algorithm.running():
             iteration += 1
             
             # Línea 5: α ← A.CurrentSolution()
+            if event_driven:
+                seen_version = anytime_algorithm.solution_version()
             alpha = anytime_algorithm.current_solution()
             
             if alpha is None:
-                time.sleep(delta_t)
-                t = time.time() - start_time
+                self._wait(anytime_algorithm, seen_version, delta_t, event_driven, clock)
+                t = clock.now() - start_time
                 continue
             
             # Línea 6: q ← α.Quality()
-            q = alpha.quality()
-            
-            # Línea 7: ~h ← ~h ∥ q
-            history.append(q)
-            
-            print(f"\n[Iteration {iteration}] t={t:.2f}s, Quality={q:.4f}")
-            
+            # Línea 7: ~h ← ~h ∥ q (solo si α es nueva)
             # Línea 8: ~p = Φ(~h)
-            predictions = performance_predictor.predict(history)
-            print(f"  Predictions: {[f'{p:.4f}' for p in predictions[:3]]}")
+            if monitor.observe(alpha, t):
+                self._log_iteration(iteration, t, monitor.q, monitor.predictions)
             
             # Línea 9: if C(~p) then
-            if stopping_condition.should_stop(predictions, q, t):
+            if monitor.decision:
                 # Línea 10: A.Stop()
                 anytime_algorithm.stop()
-                print(f"\n{'='*60}")
-                print(f"META-LEVEL: Stopping condition met at t={t:.2f}s")
-                print(f"Final Quality: {q:.4f}")
-                print(f"Total Iterations: {iteration}")
-                print(f"Quality History: {[f'{h:.4f}' for h in history]}")
-                print(f"{'='*60}\n")
+                self._report_stop(t, monitor.q, iteration, monitor.history)
                 # Línea 11: return α
                 return alpha
             
             # Línea 12: t ← t + Δt
-            # Línea 13: Sleep(Δt)
-            time.sleep(delta_t)
-            t = time.time() - start_time
+            # Línea 13: Sleep(Δt) (o hasta que se publique una nueva solución)
+            self._wait(anytime_algorithm, seen_version, delta_t, event_driven, clock)
+            t = clock.now() - start_time
         
         # Línea 14: return α (si el algoritmo terminó naturalmente)
         alpha = anytime_algorithm.current_solution()
+        # Un algoritmo que falló (por ejemplo, su proceso de trabajo murió)
+        # no se reporta como completado
+        self._report_completion(t, alpha, iteration,
+                                failed=getattr(anytime_algorithm, 'failed', False))
+        return alpha
+    
+    def replay_traces(self, traces, predictor_factory, condition_factory, delta_t=0.1,
+                      tick=None, quiet=True):
+        """
+        Ejecuta svegliato_algorithm sobre trazas de calidad, cada una como
+        un episodio en un VirtualClock propio: la misma lógica de decisión
+        que en tiempo real, sin esperas.
+        
+        Args:
+            traces: Trazas de calidad (una calidad por tick)
+            predictor_factory: Función sin argumentos que crea un predictor nuevo
+            condition_factory: Función sin argumentos que crea una condición nueva
+            delta_t: Duración entre chequeos (Δt)
+            tick: Segundos por valor de la traza (None = delta_t)
+            quiet: Descartar la salida por consola de los episodios
+            
+        Returns:
+            list: Por episodio, last_run más 'quality' (calidad final) y
+                  'tick' (posición de la traza al detenerse)
+        """
+        from algorithms.trace_replay import TraceReplayAnytime
+        tick = delta_t if tick is None else tick
+        results = []
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                devnull = stack.enter_context(open(os.devnull, 'w'))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            for trace in traces:
+                algorithm = TraceReplayAnytime(trace, tick=tick)
+                solution = self.svegliato_algorithm(algorithm, predictor_factory(),
+                                                    condition_factory(), delta_t=delta_t,
+                                                    clock=VirtualClock())
+                results.append(dict(self.last_run, quality=solution.quality(),
+                                    tick=algorithm.position))
+        return results
+    
+    async def svegliato_algorithm_async(self, anytime_algorithm, performance_predictor,
+                                        stopping_condition, delta_t=0.1, history_capacity=1024):
+        """
+        Variante asyncio del Algoritmo 1 de Svegliato para un
+        AsyncAnytimeAlgorithm. Misma lógica de decisión que
+        svegliato_algorithm, pero las esperas son awaits: miles de
+        algoritmos monitoreados pueden compartir un solo event loop.
+        
+        Args:
+            anytime_algorithm: Instancia de AsyncAnytimeAlgorithm
+            performance_predictor: Instancia de PerformancePredictor (Φ)
+            stopping_condition: Instancia de StoppingCondition (C)
+            delta_t: Espera máxima entre chequeos (Δt)
+            history_capacity: Calidades recientes guardadas completas en ~h
+            
+        Returns:
+            Solution: La solución final
+        """
         print(f"\n{'='*60}")
-        print(f"META-LEVEL: Algorithm completed naturally at t={t:.2f}s")
-        print(f"Final Quality: {alpha.quality() if alpha else 'N/A':.4f}")
-        print(f"{'='*60}\n")
+        print(f"META-LEVEL: Starting Svegliato Algorithm 1 (asyncio)")
+        print(f"{'='*60}")
+        
+        t = 0.0
+        start_time = time.monotonic()
+        monitor = _Monitor(performance_predictor, stopping_condition, history_capacity, start_time,
+                           delta_t)
+        
+        anytime_algorithm.start()
+        print(f"[t={t:.2f}s] Object-level algorithm started")
+        
+        iteration = 0
+        while anytime_algorithm.running():
+            iteration += 1
+            
+            seen_version = anytime_algorithm.solution_version()
+            alpha = anytime_algorithm.current_solution()
+            
+            if alpha is None:
+                await anytime_algorithm.wait_for_update(seen_version, timeout=delta_t)
+                t = time.monotonic() - start_time
+                continue
+            
+            if monitor.observe(alpha, t):
+                self._log_iteration(iteration, t, monitor.q, monitor.predictions)
+            
+            if monitor.decision:
+                await anytime_algorithm.stop()
+                self._report_stop(t, monitor.q, iteration, monitor.history)
+                return alpha
+            
+            await anytime_algorithm.wait_for_update(seen_version, timeout=delta_t)
+            t = time.monotonic() - start_time
+        
+        alpha = anytime_algorithm.current_solution()
+        self._report_completion(t, alpha, iteration,
+                                failed=getattr(anytime_algorithm, 'failed', False))
         return alpha
-
+    
+    def portfolio_algorithm(self, jobs, cores=None, delta_t=0.1, time_cost=0.0,
+                            release_paused=False, clock=None):
+        """
+        Meta-nivel de portafolio: controla N algoritmos anytime a la vez
+        repartiendo un número fijo de núcleos.
+        
+        En cada tick se estima, con el predictor de cada trabajo, la utilidad
+        marginal de darle otro intervalo Δt (mejora predicha menos el costo
+        del tiempo). Los `cores` trabajos con mayor utilidad marginal se
+        reanudan y el resto se pausa. Cada trabajo se detiene cuando su
+        propia condición de parada se cumple, evaluada con el tiempo de CPU
+        que lleva asignado.
+        
+        Args:
+            jobs: Lista de PortfolioJob
+            cores: Núcleos disponibles (None = os.cpu_count())
+            delta_t: Duración de cada intervalo de asignación (Δt)
+            time_cost: Costo por segundo de CPU asignado
+            release_paused: Suspender los trabajos que se quedan sin núcleo
+                            (suspend(): libera su thread y guarda un
+                            checkpoint) en lugar de pausarlos; al recuperar
+                            un núcleo continúan desde el checkpoint
+            clock: Reloj compartido por el meta-nivel y todos los trabajos
+                   (None = el de los algoritmos, que debe ser el mismo)
+            
+        Returns:
+            dict: Soluciones por nombre de trabajo y métricas agregadas
+                  ('utility', 'cpu_seconds', 'throughput', 'wall_time')
+        """
+        cores = cores or os.cpu_count() or 1
+        if clock is not None:
+            for job in jobs:
+                job.algorithm.set_clock(clock)
+        clocks = {getattr(job.algorithm, 'clock', real_clock) for job in jobs}
+        if len(clocks) > 1:
+            raise ValueError("Los trabajos del portafolio deben compartir el mismo reloj")
+        clock = clocks.pop() if clocks else real_clock
+        print(f"\n{'='*60}")
+        print(f"META-LEVEL: Portfolio of {len(jobs)} algorithms on {cores} cores")
+        print(f"{'='*60}")
+        
+        # Todos arrancan pausados: el primer reparto decide quién avanza
+        for job in jobs:
+            if hasattr(job.predictor, 'update'):
+                # Cada intervalo asignado es un tick de Δt de CPU del trabajo
+                job.predictor.delta_t = delta_t
+            job.reset()
+            job.algorithm.pause()
+            job.algorithm.start()
+        
+        start_time = clock.now()
+        last_tick = start_time
+        pending = list(jobs)
+        while pending:
+            now = clock.now()
+            for job in pending:
+                if job.checkpoint is None and not job.algorithm.paused():
+                    job.cpu_time += now - last_tick
+            last_tick = now
+            
+            for job in list(pending):
+                if job.checkpoint is not None:
+                    continue
+                if not job.algorithm.running():
+                    reason = "failed" if getattr(job.algorithm, 'failed', False) else "completed naturally"
+                    job.finish(job.algorithm.current_solution(), reason)
+                    pending.remove(job)
+                elif job.observe(time_cost * delta_t):
+                    job.algorithm.stop()
+                    job.finish(job.solution, "stopping condition met")
+                    pending.remove(job)
+            
+            # Reparto de núcleos por utilidad marginal esperada
+            ranked = sorted(pending, key=lambda job: job.marginal_utility, reverse=True)
+            for rank, job in enumerate(ranked):
+                if rank < cores:
+                    if job.checkpoint is not None:
+                        # El algoritmo ya restauró el checkpoint al suspenderse
+                        job.checkpoint = None
+                        job.algorithm.start()
+                    job.algorithm.resume()
+                elif not release_paused:
+                    job.algorithm.pause()
+                elif job.checkpoint is None:
+                    job.checkpoint = job.algorithm.suspend()
+            
+            if pending:
+                clock.sleep(delta_t)
+        
+        wall_time = clock.now() - start_time
+        utility = sum(job.solution.quality() for job in jobs if job.solution)
+        cpu_seconds = sum(job.cpu_time for job in jobs)
+        throughput = utility / cpu_seconds if cpu_seconds > 0 else 0.0
+        
+        print(f"\n{'='*60}")
+        print(f"META-LEVEL: Portfolio completed in {wall_time:.2f}s")
+        print(f"Aggregate Utility: {utility:.4f}")
+        print(f"CPU-seconds Allocated: {cpu_seconds:.2f}")
+        print(f"Throughput: {throughput:.4f} utility/CPU-second")
+        print(f"{'='*60}\n")
+        
+        return {
+            'solutions': {job.name: job.solution for job in jobs},
+            'utility': utility,
+            'cpu_seconds': cpu_seconds,
+            'throughput': throughput,
+            'wall_time': wall_time
+        }
+    
+    @staticmethod
+    def _predict(performance_predictor, history, q, streaming, t=None):
+        """Φ(~h): usa la ruta incremental si el predictor la ofrece (q observada en t)."""
+        start = tracer.now() if tracer.enabled else 0
+        if streaming:
+            performance_predictor.update(q, t)
+            predictions = performance_predictor.predict()
+        else:
+            predictions = performance_predictor.predict(history)
+        if start:
+            tracer.complete('predict', 'meta', start, {'quality': q})
+        return predictions
+    
+    @staticmethod
+    def _decide(stopping_condition, predictions, q, t):
+        """C(~p), registrada en el tracer con su resultado."""
+        if not tracer.enabled:
+            return stopping_condition.should_stop(predictions, q, t)
+        start = tracer.now()
+        stop = stopping_condition.should_stop(predictions, q, t)
+        tracer.complete('decide', 'meta', start, {'stop': bool(stop), 'time': t})
+        return stop
+    
+    @staticmethod
+    def _log_iteration(iteration, t, q, predictions):
+        # El formateo solo se paga si el nivel INFO está habilitado
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n[Iteration %d] t=%.2fs, Quality=%.4f\n  Predictions: %s",
+                        iteration, t, q, [f'{p:.4f}' for p in predictions[:3]])
+    
+    def _report_stop(self, t, q, iteration, history):
+        self.last_run = {'reason': 'stopping_condition', 'time': t,
+                         'iterations': iteration, 'samples': history.count}
+        print(f"\n{'='*60}")
+        print(f"META-LEVEL: Stopping condition met at t={t:.2f}s")
+        print(f"Final Quality: {q:.4f}")
+        print(f"Total Iterations: {iteration}")
+        recent = history.window(20)
+        omitted = f" (last {len(recent)} of {history.count})" if history.count > len(recent) else ""
+        print(f"Quality History{omitted}: {[f'{h:.4f}' for h in recent]}")
+        print(f"{'='*60}\n")
+    
+    def _report_completion(self, t, alpha, iteration, failed=False):
+        self.last_run = {'reason': 'failed' if failed else 'completed', 'time': t,
+                         'iterations': iteration}
+        print(f"\n{'='*60}")
+        if failed:
+            print(f"META-LEVEL: Algorithm failed at t={t:.2f}s")
+        else:
+            print(f"META-LEVEL: Algorithm completed naturally at t={t:.2f}s")
+        print(f"Final Quality: {f'{alpha.quality():.4f}' if alpha else 'N/A'}")
+        print(f"{'='*60}\n")
+    
+    def _wait(self, anytime_algorithm, seen_version, delta_t, event_driven, clock=real_clock):
+        """
+        Espera hasta el próximo chequeo: como máximo Δt, o menos si el
+        algoritmo publica una solución nueva o termina.
+        """
+        if event_driven:
+            anytime_algorithm.wait_for_update(seen_version, timeout=delta_t)
+        else:
+            clock.sleep(delta_t)
+    
     def run(self):
         """
         Método de ejecución original. Ya no se utiliza en el flujo principal,
@@ -1,6 +1,7 @@
-from metalevel import MetaReasoner
+from metalevel import MetaReasoner, PortfolioJob
 from lib.matrix import Matrix
 from lib.neuralnetwork import NeuralNetwork
+from lib.knowledgebase import KnowledgeBase
 from algorithms.matrix_optimization import MatrixOptimizationAnytime, IterativeRefinementAnytime
 from algorithms.performance_predictor import (
     LinearRegressionPredictor, 
@@ -25,7 +26,7 @@ class Reasoner:
         """
         self._version = "CARINA version 4.0 (Python - Svegliato Integration)"
         self._mode = mode
-        self.knowledge_base = []
+        self.knowledge_base = KnowledgeBase()
 
     def neuralnetwork_test(self):
         """
@@ -106,12 +107,12 @@ class Reasoner:
         print("#"*60 + "\n")
         
         # Crear componentes con diferentes configuraciones
-        anytime_algo = MatrixOptimizationAnytime(num_matrices=4, size=8)
+        anytime_algo = MatrixOptimizationAnytime(num_matrices=40, size=50)
         predictor = LinearRegressionPredictor(future_steps=5)
         
-        # Condición compuesta: detener si calidad > 0.7 O timeout > 8s
+        # Condición compuesta: detener si calidad > 0.9 O timeout > 8s
         stopping_cond = CompositeStoppingCondition([
-            QualityThresholdStoppingCondition(target_quality=0.70),
+            QualityThresholdStoppingCondition(target_quality=0.90),
             TimeoutStoppingCondition(max_time=8.0),
             DiminishingReturnsStoppingCondition(min_improvement_rate=0.0001)
         ])
@@ -127,7 +128,7 @@ class Reasoner:
         
         if solution:
             print(f"✓ Best Matrix Order: {solution.data['order']}")
-            print(f"✓ Best Cost: {solution.data['cost']:.2f}")
+            print(f"✓ Best Cost: {solution.data['cost']:.2f} (lower bound: {solution.data['lower_bound']:.2f})")
             print(f"✓ Final Quality: {solution.quality():.6f}\n")
             
             # Agregar a base de conocimiento
@@ -168,6 +169,42 @@ class Reasoner:
             if solution:
                 print(f"  → {name}: Quality = {solution.quality():.6f}\n")
 
+    def demo_portfolio(self):
+        """
+        Demuestra el meta-nivel de portafolio: varios algoritmos anytime
+        compitiendo por un número fijo de núcleos.
+        """
+        print("\n" + "#"*60)
+        print("# DEMO 4: Portfolio of Anytime Algorithms")
+        print("#"*60 + "\n")
+        
+        jobs = []
+        for i in range(3):
+            jobs.append(PortfolioJob(
+                f"refinement-{i}",
+                IterativeRefinementAnytime(max_iterations=20 + 10 * i),
+                DiminishingReturnsPredictor(future_steps=5, saturation_point=0.98),
+                UtilityBasedStoppingCondition(time_cost=0.02, improvement_threshold=0.0005)
+            ))
+        for i in range(2):
+            jobs.append(PortfolioJob(
+                f"matrix-{i}",
+                MatrixOptimizationAnytime(num_matrices=30, size=40),
+                LinearRegressionPredictor(future_steps=5),
+                CompositeStoppingCondition([
+                    QualityThresholdStoppingCondition(target_quality=0.85),
+                    TimeoutStoppingCondition(max_time=2.0)
+                ])
+            ))
+        
+        metareasoner = MetaReasoner("portfolio")
+        result = metareasoner.portfolio_algorithm(jobs, cores=2, delta_t=0.15)
+        
+        for name, solution in result['solutions'].items():
+            if solution:
+                print(f"  → {name}: Quality = {solution.quality():.6f}")
+        print(f"✓ Throughput: {result['throughput']:.4f} utility/CPU-second\n")
+
     def run(self):
         """
         El ciclo de ejecución principal del Nivel de Objeto.
@@ -205,6 +242,9 @@ class Reasoner:
         # Demo 3: Comparación de predictores
         self.demo_comparison()
         
+        # Demo 4: Portafolio de algoritmos
+        self.demo_portfolio()
+        
         # Resumen final
         print("\n" + "█"*60)
         print("█  FINAL KNOWLEDGE BASE")
@@ -0,0 +1,283 @@
+"""
+Barrido de configuraciones del meta-nivel.
+
+Recorre una grilla de predictores Φ, condiciones de parada C, sus
+parámetros y Δt sobre un algoritmo anytime, con varias semillas por celda.
+Las corridas son independientes y se reparten en un pool de procesos; cada
+una ejecuta cli.run() (la misma ejecución headless de la línea de
+comandos) y aporta una fila a una tabla CSV con la calidad final, el
+instante y el motivo de parada y el CPU usado.
+
+Cada fila se escribe en cuanto su corrida termina y lleva una clave
+derivada de la configuración y la semilla: al relanzar el barrido con el
+mismo archivo de salida, las corridas ya terminadas sin error se saltean.
+
+Grilla (JSON); en "params", una lista de valores es un eje de la grilla:
+    {
+        "algorithm": {"name": "pi", "params": {"max_iterations": 30}},
+        "predictors": ["linear_regression",
+                       {"name": "moving_average", "params": {"window_size": [3, 5]}}],
+        "conditions": [{"name": "utility", "params": {"time_cost": [0.01, 0.03]}},
+                       {"conditions": ["quality_threshold", "timeout"]}],
+        "delta_t": [0.05, 0.15],
+        "seeds": 3,
+        "clock": "virtual"
+    }
+
+Con "clock": "virtual" cada corrida es de eventos discretos (ver
+VirtualClock): las pausas del algoritmo y los Δt no se esperan.
+
+Uso:
+    python sweep.py --output sweep.csv
+    python sweep.py --grid grid.json --jobs 8 --output sweep.csv
+"""
+
+import os
+import sys
+import csv
+import json
+import hashlib
+import inspect
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cli
+
+# Grilla por defecto: la comparación de predictores de Reasoner.demo_comparison
+DEFAULT_GRID = {
+    'algorithm': {'name': 'pi', 'params': {'max_iterations': 30}},
+    'predictors': [
+        {'name': 'linear_regression', 'params': {'future_steps': 5}},
+        {'name': 'diminishing_returns', 'params': {'future_steps': 5}},
+        {'name': 'moving_average', 'params': {'window_size': 3, 'future_steps': 5}},
+    ],
+    'conditions': [
+        {'name': 'utility', 'params': {'time_cost': [0.01, 0.03], 'improvement_threshold': 0.001}},
+    ],
+    'delta_t': [0.05, 0.15],
+    'seeds': 3,
+    'backend': 'thread',
+    'clock': 'real',
+}
+
+COLUMNS = ('key', 'predictor', 'predictor_params', 'condition', 'condition_params',
+           'delta_t', 'seed', 'quality', 'stop_reason', 'stop_time', 'iterations',
+           'wall_time', 'cpu_time', 'error')
+
+
+def _expand(spec):
+    """Todas las variantes de un componente: producto de los parámetros con lista de valores."""
+    spec = cli._normalize(spec)
+    if spec.get('conditions'):
+        # Compuesta: producto de las variantes de cada subcondición
+        for parts in itertools.product(*(_expand(c) for c in spec['conditions'])):
+            yield {'name': 'composite', 'params': {}, 'conditions': list(parts)}
+        return
+    names = list(spec['params'])
+    axes = [value if isinstance(value, list) else [value] for value in spec['params'].values()]
+    for values in itertools.product(*axes):
+        yield {'name': spec['name'], 'params': dict(zip(names, values))}
+
+
+def _label(spec):
+    if spec['name'] == 'composite':
+        return '+'.join(c['name'] for c in spec['conditions'])
+    return spec['name']
+
+
+def _params(spec):
+    if spec['name'] == 'composite':
+        spec = {c['name']: c['params'] for c in spec['conditions']}
+        return json.dumps(spec, sort_keys=True)
+    return json.dumps(spec['params'], sort_keys=True)
+
+
+def cell_key(config, seed):
+    """Clave estable de una corrida: hash de la configuración canónica y la semilla."""
+    canonical = json.dumps({'config': config, 'seed': seed}, sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+def expand_grid(grid):
+    """
+    Corridas del barrido, en orden determinístico.
+
+    Returns:
+        list: (clave, configuración de cli.run, semilla)
+    """
+    unknown = set(grid) - set(DEFAULT_GRID)
+    if unknown:
+        raise ValueError(f"Claves desconocidas en la grilla: {', '.join(sorted(unknown))}")
+    grid = {**DEFAULT_GRID, **grid}
+    seeds = grid['seeds']
+    seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+    if not seeds:
+        raise ValueError("Se necesita al menos una semilla")
+    delta_ts = grid['delta_t'] if isinstance(grid['delta_t'], list) else [grid['delta_t']]
+    if any(d <= 0 for d in delta_ts):
+        raise ValueError("delta_t debe ser positivo")
+    if grid['backend'] not in cli.BACKENDS:
+        raise ValueError(f"Backend desconocido: {grid['backend']!r}")
+    if grid['clock'] not in cli.CLOCKS:
+        raise ValueError(f"Reloj desconocido: {grid['clock']!r}")
+    algorithm = cli._normalize(grid['algorithm'])
+    predictors = [p for spec in grid['predictors'] for p in _expand(spec)]
+    conditions = [c for spec in grid['conditions'] for c in _expand(spec)]
+
+    runs = []
+    for predictor, condition, delta_t, seed in itertools.product(
+            predictors, conditions, delta_ts, seeds):
+        config = {'algorithm': algorithm, 'predictor': predictor, 'condition': condition,
+                  'delta_t': delta_t, 'backend': grid['backend'], 'clock': grid['clock']}
+        runs.append((cell_key(config, seed), config, seed))
+    return runs
+
+
+def _accepts_seed(cls):
+    """True si el constructor recibe seed, directamente o por **kwargs hacia una clase base."""
+    for klass in cls.__mro__:
+        init = klass.__dict__.get('__init__')
+        if init is None:
+            continue
+        parameters = inspect.signature(init).parameters
+        if 'seed' in parameters:
+            return True
+        if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+            return False
+    return False
+
+
+def _seeded(config, seed):
+    """Pasa la semilla al algoritmo si su constructor la acepta; si no, es una repetición."""
+    spec = config['algorithm']
+    cls = cli._load_class(cli.ALGORITHMS, 'Algoritmo', spec['name'])
+    if _accepts_seed(cls):
+        spec = {'name': spec['name'], 'params': {**spec['params'], 'seed': seed}}
+        config = {**config, 'algorithm': spec}
+    return config
+
+
+def run_cell(key, config, seed):
+    """Ejecuta una corrida (en un proceso del pool) y retorna su fila de la tabla."""
+    row = {
+        'key': key,
+        'predictor': _label(config['predictor']),
+        'predictor_params': _params(config['predictor']),
+        'condition': _label(config['condition']),
+        'condition_params': _params(config['condition']),
+        'delta_t': config['delta_t'],
+        'seed': seed,
+    }
+    try:
+        result = cli.run(_seeded(config, seed))
+    except Exception as error:
+        row['error'] = f"{type(error).__name__}: {error}"
+        return row
+    if result['quality'] is None:
+        row['error'] = "no solution published"
+        return row
+    stop = result['stop'] or {}
+    row.update(quality=result['quality'], stop_reason=stop.get('reason'),
+               stop_time=stop.get('time'), iterations=stop.get('iterations'),
+               wall_time=result['wall_time'], cpu_time=result['cpu_time'], error='')
+    return row
+
+
+def completed_keys(path):
+    """Claves de las corridas ya terminadas sin error en una tabla existente."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as f:
+        return {row['key'] for row in csv.DictReader(f) if not row.get('error')}
+
+
+def run_sweep(runs, output, jobs=None, resume=True):
+    """
+    Ejecuta las corridas pendientes en un pool de procesos y agrega cada
+    fila a output apenas termina.
+
+    Returns:
+        tuple: (corridas ejecutadas, corridas salteadas por estar terminadas)
+    """
+    done = completed_keys(output) if resume else set()
+    pending = [run for run in runs if run[0] not in done]
+    fresh = not resume or not os.path.exists(output)
+    with open(output, 'w' if fresh else 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if fresh:
+            writer.writeheader()
+        if not pending:
+            return 0, len(runs)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_cell, *run) for run in pending]
+            for count, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                writer.writerow(row)
+                f.flush()
+                status = row['error'] or f"q={row['quality']:.4f} t={row['stop_time']:.2f}s"
+                print(f"[{count}/{len(pending)}] {row['predictor']} / {row['condition']} "
+                      f"dt={row['delta_t']} seed={row['seed']}: {status}", file=sys.stderr)
+    return len(pending), len(runs) - len(pending)
+
+
+def summarize(output, keys=None):
+    """Promedios por celda (todo menos la semilla) de las filas sin error."""
+    cells = {}
+    with open(output, newline='') as f:
+        for row in csv.DictReader(f):
+            if row['error'] or (keys is not None and row['key'] not in keys):
+                continue
+            cell = (row['predictor'], row['predictor_params'], row['condition'],
+                    row['condition_params'], float(row['delta_t']))
+            cells.setdefault(cell, []).append(row)
+    summary = []
+    for cell, rows in cells.items():
+        mean = lambda column: sum(float(r[column]) for r in rows) / len(rows)
+        summary.append({
+            'predictor': cell[0], 'predictor_params': cell[1],
+            'condition': cell[2], 'condition_params': cell[3], 'delta_t': cell[4],
+            'runs': len(rows), 'quality': mean('quality'),
+            'stop_time': mean('stop_time'), 'cpu_time': mean('cpu_time'),
+        })
+    summary.sort(key=lambda s: -s['quality'])
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'predictor':<20} {'condition':<28} {'dt':>6} {'runs':>5} "
+          f"{'quality':>8} {'stop s':>7} {'cpu s':>7}  params")
+    for s in summary:
+        params = f"{s['predictor_params']} {s['condition_params']}"
+        print(f"{s['predictor']:<20} {s['condition']:<28} {s['delta_t']:>6.3f} {s['runs']:>5} "
+              f"{s['quality']:>8.4f} {s['stop_time']:>7.2f} {s['cpu_time']:>7.3f}  {params}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CARINA meta-level configuration sweep")
+    parser.add_argument('--grid', metavar='FILE', help="JSON grid (default: the demo comparison)")
+    parser.add_argument('--output', default='sweep_results.csv', help="CSV results table")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--seeds', type=int, default=None, help="override the grid's seed count")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="start over instead of skipping finished runs")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = {}
+        if args.grid:
+            with open(args.grid) as f:
+                grid = json.load(f)
+        if args.seeds is not None:
+            grid['seeds'] = args.seeds
+        runs = expand_grid(grid)
+    except (ValueError, OSError) as error:
+        parser.exit(2, f"{parser.prog}: error: {error}\n")
+
+    executed, skipped = run_sweep(runs, args.output, jobs=args.jobs, resume=not args.no_resume)
+    print_summary(summarize(args.output, {run[0] for run in runs}))
+    print(f"\n{executed} runs executed, {skipped} already finished; results in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
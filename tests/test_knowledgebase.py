@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.knowledgebase import KnowledgeBase
+
+
+def test_load_keeps_first_id_of_duplicate_facts(tmp_path):
+    kb = KnowledgeBase()
+    for fact in ["temp_3.5", "label_a", "temp_3.5", "label_a", "temp_7"]:
+        kb.append(fact)
+    kb.save(str(tmp_path))
+    loaded = KnowledgeBase.load(str(tmp_path))
+
+    assert kb._ids == {"temp_3.5": 0, "label_a": 1, "temp_7": 4}
+    assert loaded._ids == kb._ids
+    assert list(loaded) == list(kb)
+    assert loaded.value("temp_3.5") == 3.5
+    assert loaded.range_query("temp") == kb.range_query("temp")
+    assert not loaded.add("temp_3.5")
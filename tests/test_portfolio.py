@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metalevel import MetaReasoner, PortfolioJob
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+from algorithms.clock import VirtualClock
+from algorithms.performance_predictor import LinearRegressionPredictor
+from algorithms.stopping_condition import TimeoutStoppingCondition
+
+
+class StalledAnytime(AnytimeAlgorithm):
+    """Publica su solución inicial y después nunca mejora."""
+
+    def initial_solution(self):
+        return Solution(data={}, quality_value=0.2)
+
+    def compute_step(self):
+        self.clock.sleep(0.01)
+        return True
+
+
+def test_timeout_stops_job_stalled_on_first_solution():
+    job = PortfolioJob("stalled", StalledAnytime(), LinearRegressionPredictor(),
+                       TimeoutStoppingCondition(max_time=0.5))
+    clock = VirtualClock()
+    result = MetaReasoner("test").portfolio_algorithm([job], cores=1, delta_t=0.1, clock=clock)
+
+    assert len(job.history) == 1
+    assert not job.algorithm.running()
+    assert 0.5 <= job.cpu_time < 0.8
+    assert result['solutions']['stalled'].quality() == 0.2
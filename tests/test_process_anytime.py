@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metalevel import MetaReasoner
+from algorithms.anytime_algorithm import AnytimeAlgorithm, Solution
+from algorithms.performance_predictor import LinearRegressionPredictor
+from algorithms.process_anytime import ProcessAnytimeAlgorithm
+from algorithms.stopping_condition import TimeoutStoppingCondition
+
+
+class FailingAnytime(AnytimeAlgorithm):
+    """Mejora su solución y falla en el paso fail_at (None = nunca)."""
+
+    def __init__(self, fail_at=None, steps=5):
+        super().__init__()
+        self.fail_at = fail_at
+        self.steps = steps
+        self.step = 0
+
+    def initial_solution(self):
+        return Solution(data={'step': 0}, quality_value=0.1)
+
+    def compute_step(self):
+        time.sleep(0.01)
+        self.step += 1
+        if self.step == self.fail_at:
+            raise ValueError("paso fallido")
+        self.update_solution(Solution(data={'step': self.step},
+                                      quality_value=0.1 + self.step / 100))
+        return self.step < self.steps
+
+
+def run(algorithm):
+    reasoner = MetaReasoner("test")
+    solution = reasoner.svegliato_algorithm(algorithm, LinearRegressionPredictor(),
+                                            TimeoutStoppingCondition(max_time=10.0),
+                                            delta_t=0.05)
+    return reasoner.last_run['reason'], solution
+
+
+def test_worker_completion_is_not_a_failure():
+    algorithm = ProcessAnytimeAlgorithm(FailingAnytime())
+    reason, solution = run(algorithm)
+
+    assert reason == 'completed'
+    assert not algorithm.failed
+    assert solution.data == {'step': 5}
+
+
+def test_worker_exception_is_reported_as_failure():
+    algorithm = ProcessAnytimeAlgorithm(FailingAnytime(fail_at=3))
+    reason, solution = run(algorithm)
+
+    assert reason == 'failed'
+    assert algorithm.failed
+    # Se conserva la última solución publicada antes del error
+    assert solution.data == {'step': 2}